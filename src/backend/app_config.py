@@ -31,6 +31,109 @@ class AppConfig:
         self.COSMOSDB_ENDPOINT = self._get_optional("COSMOSDB_ENDPOINT")
         self.COSMOSDB_DATABASE = self._get_optional("COSMOSDB_DATABASE")
         self.COSMOSDB_CONTAINER = self._get_optional("COSMOSDB_CONTAINER")
+        self.COSMOSDB_MAX_CONNECTIONS = self._get_int("COSMOSDB_MAX_CONNECTIONS", 100)
+        self.COSMOSDB_MAX_CONNECTIONS_PER_HOST = self._get_int(
+            "COSMOSDB_MAX_CONNECTIONS_PER_HOST", 0
+        )
+        self.COSMOSDB_WRITE_BEHIND = self._get_bool("COSMOSDB_WRITE_BEHIND")
+        self.COSMOSDB_WRITE_BEHIND_MAX_BATCH = self._get_int(
+            "COSMOSDB_WRITE_BEHIND_MAX_BATCH", 100
+        )
+        self.COSMOSDB_WRITE_BEHIND_FLUSH_MS = self._get_int(
+            "COSMOSDB_WRITE_BEHIND_FLUSH_MS", 200
+        )
+        self.COSMOSDB_QUERY_PAGE_SIZE = self._get_int("COSMOSDB_QUERY_PAGE_SIZE", 100)
+        self.COSMOSDB_BULK_DELETE_CONCURRENCY = self._get_int(
+            "COSMOSDB_BULK_DELETE_CONCURRENCY", 8
+        )
+        self.COSMOSDB_BATCH_CONCURRENCY = self._get_int("COSMOSDB_BATCH_CONCURRENCY", 8)
+        self.COSMOSDB_READ_CACHE_SIZE = self._get_int("COSMOSDB_READ_CACHE_SIZE", 1024)
+        self.COSMOSDB_READ_CACHE_TTL_SECONDS = self._get_int(
+            "COSMOSDB_READ_CACHE_TTL_SECONDS", 30
+        )
+
+        # Bounded cache of per-session agent graphs
+        self.AGENT_CACHE_MAX_SESSIONS = self._get_int("AGENT_CACHE_MAX_SESSIONS", 256)
+        self.AGENT_CACHE_TTL_SECONDS = self._get_int("AGENT_CACHE_TTL_SECONDS", 3600)
+
+        # Build every specialist agent up front instead of on first use
+        self.AGENT_EAGER_CREATE = self._get_bool("AGENT_EAGER_CREATE")
+
+        # Maximum number of specialist agents built concurrently for a session,
+        # up front in eager mode or ahead of an approved plan's steps otherwise
+        self.AGENT_CREATE_CONCURRENCY = self._get_int("AGENT_CREATE_CONCURRENCY", 8)
+
+        # Background execution of step approvals. Durability is opt-in: by
+        # default jobs are kept in memory and lost on restart. Set
+        # STEP_JOB_DB_PATH to a SQLite file on storage that outlives the
+        # container to keep queued and running jobs across restarts
+        self.STEP_JOB_DB_PATH = self._get_optional("STEP_JOB_DB_PATH", "")
+        self.STEP_JOB_WORKERS = self._get_int("STEP_JOB_WORKERS", 4)
+        self.STEP_JOB_MAX_ATTEMPTS = self._get_int("STEP_JOB_MAX_ATTEMPTS", 3)
+        self.STEP_JOB_RETRY_DELAY_SECONDS = self._get_int(
+            "STEP_JOB_RETRY_DELAY_SECONDS", 5
+        )
+        self.STEP_JOB_RETENTION_SECONDS = self._get_int(
+            "STEP_JOB_RETENTION_SECONDS", 86400
+        )
+
+        # Per-session event streams pushed to browsers
+        self.EVENT_STREAM_QUEUE_SIZE = self._get_int("EVENT_STREAM_QUEUE_SIZE", 256)
+        self.EVENT_STREAM_HEARTBEAT_SECONDS = self._get_int(
+            "EVENT_STREAM_HEARTBEAT_SECONDS", 15
+        )
+
+        # Stream agent replies to the session's event stream as they are generated
+        self.AGENT_REPLY_STREAMING = self._get_bool("AGENT_REPLY_STREAMING")
+
+        # Conversation history of previous steps passed to the agent of each step
+        self.CONVERSATION_HISTORY_TOKEN_BUDGET = self._get_int(
+            "CONVERSATION_HISTORY_TOKEN_BUDGET", 8000
+        )
+        self.CONVERSATION_HISTORY_SUMMARY_CHARS = self._get_int(
+            "CONVERSATION_HISTORY_SUMMARY_CHARS", 300
+        )
+        self.CONVERSATION_HISTORY_MAX_PLANS = self._get_int(
+            "CONVERSATION_HISTORY_MAX_PLANS", 512
+        )
+        self.CONVERSATION_HISTORY_TTL_SECONDS = self._get_int(
+            "CONVERSATION_HISTORY_TTL_SECONDS", 3600
+        )
+
+        # Maximum number of independent plan steps executed concurrently per session
+        self.GROUP_CHAT_STEP_CONCURRENCY = self._get_int(
+            "GROUP_CHAT_STEP_CONCURRENCY", 4
+        )
+
+        # Seconds between background refreshes of cached Azure AI agent definitions
+        self.AGENT_DEFINITION_REFRESH_SECONDS = self._get_int(
+            "AGENT_DEFINITION_REFRESH_SECONDS", 600
+        )
+
+        # Warm kernel and memory context pairs kept per session
+        self.SESSION_REGISTRY_MAX_SESSIONS = self._get_int(
+            "SESSION_REGISTRY_MAX_SESSIONS", 256
+        )
+        self.SESSION_REGISTRY_IDLE_SECONDS = self._get_int(
+            "SESSION_REGISTRY_IDLE_SECONDS", 900
+        )
+
+        # Process-wide buffer of recent chat messages per session
+        self.MESSAGE_BUFFER_MAX_SESSIONS = self._get_int(
+            "MESSAGE_BUFFER_MAX_SESSIONS", 1024
+        )
+        self.MESSAGE_BUFFER_TTL_SECONDS = self._get_int(
+            "MESSAGE_BUFFER_TTL_SECONDS", 1800
+        )
+
+        # Memory vector search settings
+        self.COSMOSDB_VECTOR_SEARCH = self._get_bool("COSMOSDB_VECTOR_SEARCH")
+        self.MEMORY_VECTOR_INDEX_TTL_SECONDS = self._get_int(
+            "MEMORY_VECTOR_INDEX_TTL_SECONDS", 300
+        )
+        self.MEMORY_EMBEDDING_ENCODING = self._get_optional(
+            "MEMORY_EMBEDDING_ENCODING", "float32"
+        )
 
         # Azure OpenAI settings
         self.AZURE_OPENAI_DEPLOYMENT_NAME = self._get_required(
@@ -112,6 +215,28 @@ class AppConfig:
         """
         return name in os.environ and os.environ[name].lower() in ["true", "1"]
 
+    def _get_int(self, name: str, default: int) -> int:
+        """Get an integer configuration value from environment variables.
+
+        Args:
+            name: The name of the environment variable
+            default: Default value if not found or not a valid integer
+
+        Returns:
+            The integer value of the environment variable or the default value
+        """
+        value = self._get_optional(name)
+        if not value:
+            return default
+        try:
+            return int(value)
+        except ValueError:
+            logging.warning(
+                "Environment variable %s is not a valid integer, using default value",
+                name,
+            )
+            return default
+
     def get_azure_credentials(self):
         """Get Azure credentials using DefaultAzureCredential.
 
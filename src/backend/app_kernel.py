@@ -5,7 +5,8 @@ import logging
 import os
 import re
 import uuid
-from typing import Any, Dict, List, Optional
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 # Semantic Kernel imports
 import semantic_kernel as sk
@@ -13,15 +14,35 @@ from app_config import config
 from auth.auth_utils import get_authenticated_user_details
 
 # Azure monitoring
+from azure.cosmos.exceptions import CosmosHttpResponseError
 from azure.monitor.opentelemetry import configure_azure_monitor
 from config_kernel import Config
-from context.cosmos_memory_kernel import CosmosMemoryContext
+from context.bulk_delete import BulkDeleteJob, bulk_delete_jobs
+from context.cosmos_client_pool import cosmos_client_pool
+from context.cosmos_memory_kernel import CosmosMemoryContext, FlushError
+from context.event_bus import format_sse, session_events
+from context.message_buffer import message_buffers
+from context.plan_cache import plan_cache
+from context.session_registry import session_contexts
+from context.step_jobs import (
+    FINISHED_STATUSES,
+    RETRYABLE_STATUSES,
+    StepJob,
+    step_jobs,
+)
+from context.vector_index import vector_indexes
 from event_utils import track_event_if_configured
 
 # FastAPI imports
 from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from kernel_agents.agent_definition_registry import agent_definitions
 from kernel_agents.agent_factory import AgentFactory
+from kernel_agents.conversation_history import conversation_histories
+from kernel_agents.reply_stream import reply_metrics
+from kernel_tools.tools_catalog import get_tools_catalog
 
 # Local imports
 from middleware.health_check import HealthCheckMiddleware
@@ -39,6 +60,7 @@ from models.messages_kernel import (
 )
 
 # Updated import for KernelArguments
+from pydantic import BaseModel
 from semantic_kernel.functions.kernel_arguments import KernelArguments
 from utils_kernel import get_agents, initialize_runtime_and_context, rai_success
 
@@ -70,8 +92,130 @@ logging.getLogger("azure.monitor.opentelemetry.exporter.export._base").setLevel(
     logging.WARNING
 )
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Manage process-wide resources for the lifetime of the app."""
+    sweeper = asyncio.create_task(_evict_idle_sessions())
+    # List the AI project's agents once so new sessions need no listing calls
+    await agent_definitions.refresh()
+    agent_definitions.start_refresh(config.AGENT_DEFINITION_REFRESH_SECONDS)
+    # Run step approvals in the background, resuming jobs left from a restart
+    await step_jobs.start(_run_step_job)
+    yield
+    sweeper.cancel()
+    await step_jobs.stop()
+    await agent_definitions.stop_refresh()
+    # Flush and release warm session contexts, and any evicted context that was
+    # written to again, then close the shared Cosmos DB clients
+    await session_contexts.close()
+    await CosmosMemoryContext.close_all()
+    await cosmos_client_pool.close()
+
+
+async def _evict_idle_sessions(interval_seconds: float = 60) -> None:
+    """Periodically evict idle sessions so their contexts and threads are closed."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            evicted = session_contexts.expire()
+            if evicted:
+                logging.info(f"Evicted {evicted} idle session contexts")
+            evicted = AgentFactory.expire_cache()
+            if evicted:
+                logging.info(f"Evicted agents of {evicted} idle sessions")
+        except Exception as e:
+            logging.exception(f"Failed to evict idle session contexts: {e}")
+
+
+async def _run_step_job(job: StepJob) -> None:
+    """Send a queued step approval to the session's group chat manager."""
+    human_feedback = job.feedback
+    # Evicting the session meanwhile must not close its memory context or
+    # delete its agents' thread while the job still uses them
+    async with session_contexts.pinned(
+        job.user_id, human_feedback.session_id
+    ) as (kernel, memory_store), AgentFactory.pin_session(human_feedback.session_id):
+        client = None
+        try:
+            client = config.get_ai_project_client()
+        except Exception as client_exc:
+            logging.error(f"Error creating AIProjectClient: {client_exc}")
+        try:
+            agents = await AgentFactory.create_all_agents(
+                session_id=human_feedback.session_id,
+                user_id=job.user_id,
+                memory_store=memory_store,
+                client=client,
+            )
+
+            # Send the approval to the group chat manager
+            group_chat_manager = agents[AgentType.GROUP_CHAT_MANAGER.value]
+
+            await group_chat_manager.handle_human_feedback(human_feedback)
+        finally:
+            # A flush error fails the attempt so the job is retried; steps that
+            # already ran are skipped then
+            await memory_store.flush()
+            if client:
+                try:
+                    client.close()
+                except Exception as e:
+                    logging.error(f"Error sending to AIProjectClient: {e}")
+
+    if human_feedback.step_id:
+        track_event_if_configured(
+            "Completed Human clarification with step_id",
+            {
+                "status": f"Step {human_feedback.step_id} - Approval:{human_feedback.approved}."
+            },
+        )
+    else:
+        track_event_if_configured(
+            "Completed Human clarification without step_id",
+            {"status": "All steps approved"},
+        )
+
+
 # Initialize the FastAPI app
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
+
+# Response header carrying the cursor for the next page of a paginated listing
+CONTINUATION_HEADER = "x-continuation-token"
+MAX_PAGE_SIZE = 1000
+
+
+async def _stream_json_array(items: AsyncIterator[Any]) -> AsyncIterator[str]:
+    """Serialize items into a JSON array one element at a time."""
+    yield "["
+    first = True
+    async for item in items:
+        if isinstance(item, BaseModel):
+            payload = item.model_dump_json()
+        else:
+            payload = json.dumps(jsonable_encoder(item))
+        yield payload if first else "," + payload
+        first = False
+    yield "]"
+
+
+async def _flush_after_work(memory_store: CosmosMemoryContext) -> None:
+    """Flush a session's buffered writes once a request's work has been done.
+
+    The work (e.g. an agent's reply) cannot be undone and repeating the request
+    would do it twice, so a flush error is logged rather than failing the request.
+    The failed writes stay buffered and are retried in the background.
+    """
+    try:
+        await memory_store.flush()
+    except FlushError as e:
+        logging.error(f"Buffered writes of a completed request are not saved yet: {e}")
+
+
+def _page_response(items: List[Any], continuation: Optional[str]) -> JSONResponse:
+    """Return a page of items with the next-page cursor in a response header."""
+    headers = {CONTINUATION_HEADER: continuation} if continuation else None
+    return JSONResponse(content=jsonable_encoder(items), headers=headers)
 
 frontend_url = Config.FRONTEND_SITE_NAME
 
@@ -82,6 +226,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[CONTINUATION_HEADER, "ETag"],
 )
 
 # Configure health check
@@ -148,6 +293,9 @@ async def input_task_endpoint(input_task: InputTask, request: Request):
 
         # Use the planner to handle the task
         result = await group_chat_manager.handle_input_task(input_task)
+        # Persist any buffered writes before the response is returned; the plan it
+        # points to may not exist otherwise, so a flush error fails the request
+        await memory_store.flush()
 
         print(f"Result: {result}")
         # Get plan from memory store
@@ -185,6 +333,19 @@ async def input_task_endpoint(input_task: InputTask, request: Request):
             "description": input_task.description,
         }
 
+    except FlushError as e:
+        logging.exception(f"Error saving the plan of input task: {e}")
+        track_event_if_configured(
+            "InputTaskError",
+            {
+                "session_id": input_task.session_id,
+                "description": input_task.description,
+                "error": str(e),
+            },
+        )
+        raise HTTPException(
+            status_code=503, detail="The plan could not be saved, please try again"
+        )
     except Exception as e:
         logging.exception(f"Error handling input task: {e}")
         track_event_if_configured(
@@ -293,6 +454,7 @@ async def human_feedback_endpoint(human_feedback: HumanFeedback, request: Reques
 
     # Use the human agent to handle the feedback
     await human_agent.handle_human_feedback(human_feedback=human_feedback)
+    await _flush_after_work(memory_store)
 
     track_event_if_configured(
         "Completed Feedback received",
@@ -401,6 +563,7 @@ async def human_clarification_endpoint(
     await human_agent.handle_human_clarification(
         human_clarification=human_clarification
     )
+    await _flush_after_work(memory_store)
 
     track_event_if_configured(
         "Completed Human clarification on the plan",
@@ -420,13 +583,16 @@ async def human_clarification_endpoint(
     }
 
 
-@app.post("/api/approve_step_or_steps")
+@app.post("/api/approve_step_or_steps", status_code=202)
 async def approve_step_endpoint(
     human_feedback: HumanFeedback, request: Request
 ) -> Dict[str, str]:
     """
     Approve a step or multiple steps in a plan.
 
+    The approved steps run as a background job; poll /api/step_jobs/{job_id} for
+    its progress.
+
     ---
     tags:
       - Approval
@@ -464,15 +630,20 @@ async def approve_step_endpoint(
               type: string
               description: The user ID providing the approval
     responses:
-      200:
-        description: Approval status returned
+      202:
+        description: Approval queued
         schema:
           type: object
           properties:
             status:
               type: string
+            job_id:
+              type: string
+              description: ID of the background step job
       400:
         description: Missing or invalid user information
+      503:
+        description: The step job queue is not running
     """
     authenticated_user = get_authenticated_user_details(request_headers=request.headers)
     user_id = authenticated_user["user_principal_id"]
@@ -482,51 +653,147 @@ async def approve_step_endpoint(
         )
         raise HTTPException(status_code=400, detail="no user")
 
-    # Get the agents for this session
-    kernel, memory_store = await initialize_runtime_and_context(
-        human_feedback.session_id, user_id
-    )
-    client = None
+    # Queue the approval; a worker sends it to the group chat manager
     try:
-        client = config.get_ai_project_client()
-    except Exception as client_exc:
-        logging.error(f"Error creating AIProjectClient: {client_exc}")
-    agents = await AgentFactory.create_all_agents(
-        session_id=human_feedback.session_id,
-        user_id=user_id,
-        memory_store=memory_store,
-        client=client,
+        job = await step_jobs.submit(user_id, human_feedback)
+    except RuntimeError as e:
+        logging.error(f"Failed to queue approval: {e}")
+        raise HTTPException(status_code=503, detail=str(e))
+
+    # Return a status message
+    if human_feedback.step_id:
+        status = f"Step {human_feedback.step_id} - Approval:{human_feedback.approved}."
+    else:
+        status = "All steps approved"
+    track_event_if_configured(
+        "Queued human approval",
+        {"status": status, "job_id": job.id, "session_id": human_feedback.session_id},
     )
+    return {"status": status, "job_id": job.id}
 
-    # Send the approval to the group chat manager
-    group_chat_manager = agents[AgentType.GROUP_CHAT_MANAGER.value]
 
-    await group_chat_manager.handle_human_feedback(human_feedback)
+def _step_job_user(request: Request) -> str:
+    """Return the authenticated user ID for the step job endpoints."""
+    authenticated_user = get_authenticated_user_details(request_headers=request.headers)
+    user_id = authenticated_user["user_principal_id"]
+    if not user_id:
+        raise HTTPException(status_code=400, detail="no user")
+    return user_id
 
-    if client:
-        try:
-            client.close()
-        except Exception as e:
-            logging.error(f"Error sending to AIProjectClient: {e}")
-    # Return a status message
-    if human_feedback.step_id:
-        track_event_if_configured(
-            "Completed Human clarification with step_id",
-            {
-                "status": f"Step {human_feedback.step_id} - Approval:{human_feedback.approved}."
-            },
-        )
 
-        return {
-            "status": f"Step {human_feedback.step_id} - Approval:{human_feedback.approved}."
-        }
-    else:
-        track_event_if_configured(
-            "Completed Human clarification without step_id",
-            {"status": "All steps approved"},
-        )
+@app.get("/api/step_jobs/{job_id}", response_model=StepJob)
+async def get_step_job(job_id: str, request: Request) -> StepJob:
+    """
+    Retrieve the progress of a background step job.
+
+    ---
+    tags:
+      - Approval
+    parameters:
+      - name: job_id
+        in: path
+        type: string
+        required: true
+        description: The ID returned by POST /api/approve_step_or_steps
+    responses:
+      200:
+        description: Progress of the step job
+        schema:
+          type: object
+          properties:
+            status:
+              type: string
+              description: queued, running, completed, failed or cancelled
+            attempts:
+              type: integer
+              description: Number of times the job has started
+            error:
+              type: string
+              description: Error of the last failed attempt
+      400:
+        description: Missing or invalid user information
+      404:
+        description: Job not found
+    """
+    user_id = _step_job_user(request)
+    job = await step_jobs.get(job_id, user_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@app.post("/api/step_jobs/{job_id}/cancel", response_model=StepJob)
+async def cancel_step_job(job_id: str, request: Request) -> StepJob:
+    """
+    Cancel a queued or running step job.
+
+    Steps already completed by a running job are not rolled back.
+
+    ---
+    tags:
+      - Approval
+    parameters:
+      - name: job_id
+        in: path
+        type: string
+        required: true
+        description: The ID of the job to cancel
+    responses:
+      200:
+        description: The cancelled job
+      400:
+        description: Missing or invalid user information
+      404:
+        description: Job not found
+      409:
+        description: Job has already finished
+    """
+    user_id = _step_job_user(request)
+    job = await step_jobs.get(job_id, user_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status in FINISHED_STATUSES:
+        raise HTTPException(status_code=409, detail=f"Job is already {job.status}")
+    return await step_jobs.cancel(job_id, user_id)
 
-        return {"status": "All steps approved"}
+
+@app.post("/api/step_jobs/{job_id}/retry", response_model=StepJob)
+async def retry_step_job(job_id: str, request: Request) -> StepJob:
+    """
+    Queue a failed or cancelled step job again.
+
+    ---
+    tags:
+      - Approval
+    parameters:
+      - name: job_id
+        in: path
+        type: string
+        required: true
+        description: The ID of the job to retry
+    responses:
+      200:
+        description: The queued job
+      400:
+        description: Missing or invalid user information
+      404:
+        description: Job not found
+      409:
+        description: Job is not failed or cancelled
+      503:
+        description: The step job queue is not running
+    """
+    user_id = _step_job_user(request)
+    job = await step_jobs.get(job_id, user_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status not in RETRYABLE_STATUSES:
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    try:
+        return await step_jobs.retry(job_id, user_id)
+    except RuntimeError as e:
+        logging.error(f"Failed to retry step job {job_id}: {e}")
+        raise HTTPException(status_code=503, detail=str(e))
 
 
 @app.get("/api/plans", response_model=List[PlanWithSteps])
@@ -536,6 +803,10 @@ async def get_plans(
     """
     Retrieve plans for the current user.
 
+    With a session_id the plan is returned with its full steps. Without one, the
+    most recent plans are returned as summaries: step counts are filled in but
+    ``steps`` is empty and detail fields such as ``summary`` are omitted.
+
     ---
     tags:
       - Plans
@@ -613,21 +884,23 @@ async def get_plans(
             raise HTTPException(status_code=404, detail="Plan not found")
 
         # Use get_steps_by_plan to match the original implementation
-        steps = await memory_store.get_steps_by_plan(plan_id=plan.id)
+        steps = await memory_store.get_steps_by_plan(
+            plan_id=plan.id, session_id=plan.session_id
+        )
         plan_with_steps = PlanWithSteps(**plan.model_dump(), steps=steps)
         plan_with_steps.update_step_counts()
         return [plan_with_steps]
 
-    all_plans = await memory_store.get_all_plans()
-    # Fetch steps for all plans concurrently
-    steps_for_all_plans = await asyncio.gather(
-        *[memory_store.get_steps_by_plan(plan_id=plan.id) for plan in all_plans]
-    )
+    # The list view only needs plan headlines and step counts, so fetch projections
+    # instead of full documents with every step's reply payload
+    all_plans = await memory_store.get_all_plan_summaries()
+    # Count the steps of every plan by status in one aggregate query
+    status_counts = await memory_store.get_step_status_counts(all_plans)
     # Create list of PlanWithSteps and update step counts
     list_of_plans_with_steps = []
-    for plan, steps in zip(all_plans, steps_for_all_plans):
-        plan_with_steps = PlanWithSteps(**plan.model_dump(), steps=steps)
-        plan_with_steps.update_step_counts()
+    for plan in all_plans:
+        plan_with_steps = PlanWithSteps(**plan.model_dump())
+        plan_with_steps.apply_step_status_counts(status_counts[plan.id])
         list_of_plans_with_steps.append(plan_with_steps)
 
     return list_of_plans_with_steps
@@ -699,10 +972,19 @@ async def get_steps_by_plan(plan_id: str, request: Request) -> List[Step]:
 
 
 @app.get("/api/agent_messages/{session_id}", response_model=List[AgentMessage])
-async def get_agent_messages(session_id: str, request: Request) -> List[AgentMessage]:
+async def get_agent_messages(
+    session_id: str,
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    continuation: Optional[str] = Query(None),
+):
     """
     Retrieve agent messages for a specific session.
 
+    Without ``limit`` the whole list is streamed as a JSON array. With ``limit`` a
+    single page is returned and the cursor for the next page, if any, is sent in
+    the ``x-continuation-token`` response header.
+
     ---
     tags:
       - Agent Messages
@@ -715,6 +997,16 @@ async def get_agent_messages(session_id: str, request: Request) -> List[AgentMes
         type: string
         required: true
         description: The ID of the session to retrieve agent messages for
+      - name: limit
+        in: query
+        type: integer
+        required: false
+        description: Page size; enables cursor-based pagination
+      - name: continuation
+        in: query
+        type: string
+        required: false
+        description: Cursor from the previous page's x-continuation-token header
     responses:
       200:
         description: List of agent messages associated with the specified session
@@ -762,27 +1054,94 @@ async def get_agent_messages(session_id: str, request: Request) -> List[AgentMes
     kernel, memory_store = await initialize_runtime_and_context(
         session_id or "", user_id
     )
-    agent_messages = await memory_store.get_data_by_type("agent_message")
-    return agent_messages
+    if limit is None:
+        return StreamingResponse(
+            _stream_json_array(memory_store.iter_data_by_type("agent_message")),
+            media_type="application/json",
+        )
+
+    try:
+        agent_messages, next_page = await memory_store.get_data_by_type_page(
+            "agent_message", limit=limit, continuation=continuation
+        )
+    except CosmosHttpResponseError as e:
+        if continuation and e.status_code == 400:
+            raise HTTPException(status_code=400, detail="Invalid continuation token")
+        raise
+    return _page_response(agent_messages, next_page)
+
+
+@app.get("/api/events/{session_id}")
+async def stream_session_events(session_id: str, request: Request) -> StreamingResponse:
+    """
+    Stream changes to a session's plan, steps, agent messages and step jobs.
+
+    Sends Server-Sent Events as documents are written: ``plan``, ``step`` and
+    ``agent_message`` carry the written document, ``step_job`` the job. A
+    ``resync`` event means events were missed and the view should be reloaded.
+    Comments are sent periodically to keep the connection open.
+
+    ---
+    tags:
+      - Events
+    parameters:
+      - name: session_id
+        in: path
+        type: string
+        required: true
+        description: The ID of the session to follow
+    responses:
+      200:
+        description: A text/event-stream of session events
+      400:
+        description: Missing or invalid user information
+    """
+    authenticated_user = get_authenticated_user_details(request_headers=request.headers)
+    user_id = authenticated_user["user_principal_id"]
+    if not user_id:
+        raise HTTPException(status_code=400, detail="no user")
+
+    subscription = session_events.subscribe(user_id, session_id)
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            yield format_sse({"type": "ready", "data": {"session_id": session_id}})
+            while not await request.is_disconnected():
+                event = await subscription.next(config.EVENT_STREAM_HEARTBEAT_SECONDS)
+                yield format_sse(event) if event is not None else ": keep-alive\n\n"
+        finally:
+            session_events.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
-@app.delete("/api/messages")
+@app.delete("/api/messages", status_code=202)
 async def delete_all_messages(request: Request) -> Dict[str, str]:
     """
     Delete all messages across sessions.
 
+    The deletion runs as a background job; poll /api/delete_jobs/{job_id} for its
+    progress.
+
     ---
     tags:
       - Messages
     responses:
-      200:
-        description: Confirmation of deletion
+      202:
+        description: Deletion started
         schema:
           type: object
           properties:
             status:
               type: string
-              description: Status message indicating all messages were deleted
+              description: Status message indicating the deletion was started
+            job_id:
+              type: string
+              description: ID of the background deletion job
       400:
         description: Missing or invalid user information
     """
@@ -794,29 +1153,101 @@ async def delete_all_messages(request: Request) -> Dict[str, str]:
     # Initialize memory context
     kernel, memory_store = await initialize_runtime_and_context("", user_id)
 
-    logging.info("Deleting all plans")
-    await memory_store.delete_all_items("plan")
-    logging.info("Deleting all sessions")
-    await memory_store.delete_all_items("session")
-    logging.info("Deleting all steps")
-    await memory_store.delete_all_items("step")
-    logging.info("Deleting all agent_messages")
-    await memory_store.delete_all_items("agent_message")
+    data_types = [
+        "plan",
+        memory_store.PLAN_INDEX_DATA_TYPE,
+        "session",
+        "step",
+        "agent_message",
+    ]
+    logging.info(f"Starting bulk delete of {', '.join(data_types)}")
+    job = bulk_delete_jobs.start(
+        user_id,
+        data_types,
+        lambda job: memory_store.delete_items_of_types(data_types, job),
+    )
 
     # Clear the agent factory cache
     AgentFactory.clear_cache()
 
-    return {"status": "All messages deleted"}
+    return {"status": "Deletion started", "job_id": job.id}
+
+
+@app.get("/api/delete_jobs/{job_id}", response_model=BulkDeleteJob)
+async def get_delete_job(job_id: str, request: Request) -> BulkDeleteJob:
+    """
+    Retrieve the progress of a background deletion job.
+
+    ---
+    tags:
+      - Messages
+    parameters:
+      - name: job_id
+        in: path
+        type: string
+        required: true
+        description: The ID returned by DELETE /api/messages
+    responses:
+      200:
+        description: Progress of the deletion job
+        schema:
+          type: object
+          properties:
+            status:
+              type: string
+              description: pending, running, completed or failed
+            found:
+              type: integer
+              description: Number of documents found so far
+            deleted:
+              type: integer
+              description: Number of documents deleted so far
+            failed:
+              type: integer
+              description: Number of documents that could not be deleted
+      400:
+        description: Missing or invalid user information
+      404:
+        description: Job not found
+    """
+    authenticated_user = get_authenticated_user_details(request_headers=request.headers)
+    user_id = authenticated_user["user_principal_id"]
+    if not user_id:
+        raise HTTPException(status_code=400, detail="no user")
+
+    job = bulk_delete_jobs.get(job_id, user_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
 
 
 @app.get("/api/messages")
-async def get_all_messages(request: Request):
+async def get_all_messages(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    continuation: Optional[str] = Query(None),
+):
     """
     Retrieve all messages across sessions.
 
+    Without ``limit`` the first 100 documents are streamed as a JSON array.
+    With ``limit`` a single page is returned and the cursor for the next page, if
+    any, is sent in the ``x-continuation-token`` response header.
+
     ---
     tags:
       - Messages
+    parameters:
+      - name: limit
+        in: query
+        type: integer
+        required: false
+        description: Page size; enables cursor-based pagination
+      - name: continuation
+        in: query
+        type: string
+        required: false
+        description: Cursor from the previous page's x-continuation-token header
     responses:
       200:
         description: List of all messages across sessions
@@ -854,19 +1285,43 @@ async def get_all_messages(request: Request):
 
     # Initialize memory context
     kernel, memory_store = await initialize_runtime_and_context("", user_id)
-    message_list = await memory_store.get_all_items()
-    return message_list
+    if limit is None:
+        return StreamingResponse(
+            _stream_json_array(memory_store.iter_all_messages(max_items=100)),
+            media_type="application/json",
+        )
+
+    try:
+        message_list, next_page = await memory_store.get_all_messages_page(
+            limit=limit, continuation=continuation
+        )
+    except CosmosHttpResponseError as e:
+        if continuation and e.status_code == 400:
+            raise HTTPException(status_code=400, detail="Invalid continuation token")
+        raise
+    return _page_response(message_list, next_page)
 
 
 @app.get("/api/agent-tools")
-async def get_agent_tools():
+async def get_agent_tools(request: Request) -> Response:
     """
     Retrieve all available agent tools.
 
+    The catalog is built once per process. Its ETag changes only when the tools
+    change, so clients can revalidate with If-None-Match.
+
     ---
     tags:
       - Agent Tools
+    parameters:
+      - name: If-None-Match
+        in: header
+        type: string
+        required: false
+        description: ETag of a previously fetched catalog
     responses:
+      304:
+        description: The catalog has not changed since the given ETag
       200:
         description: List of all available agent tools and their descriptions
         schema:
@@ -887,7 +1342,92 @@ async def get_agent_tools():
                 type: string
                 description: Arguments required by the tool function
     """
-    return []
+    catalog = get_tools_catalog()
+    headers = {"ETag": catalog.etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match", "")
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    if catalog.etag in tags or "*" in tags:
+        return Response(status_code=304, headers=headers)
+    return Response(
+        content=catalog.tools_json, media_type="application/json", headers=headers
+    )
+
+
+@app.get("/api/metrics")
+async def get_metrics(request: Request) -> Dict[str, Any]:
+    """
+    Retrieve in-process cache and connection pool counters.
+
+    ---
+    tags:
+      - Metrics
+    responses:
+      200:
+        description: Counters of the process-wide caches and pools
+        schema:
+          type: object
+          properties:
+            cosmos_client_pool:
+              type: object
+              description: Pooled Cosmos DB clients and container handles
+            plan_cache:
+              type: object
+              description: Size and hit/miss counters of the plan and step cache
+            vector_indexes:
+              type: object
+              description: Loaded memory vector indexes and their vector count
+            message_buffers:
+              type: object
+              description: Buffered sessions and their message count
+            session_contexts:
+              type: object
+              description: Live warm sessions and their eviction counters
+            agent_definitions:
+              type: object
+              description: Cached Azure AI agent definitions and lookup counters
+            agent_construction:
+              type: object
+              description: Agent construction times in milliseconds by agent type
+            agent_cache:
+              type: object
+              description: Cached and pinned session agent graphs, evictions and bytes
+            step_jobs:
+              type: object
+              description: Queued and running step jobs and their outcome counters
+            session_events:
+              type: object
+              description: Event stream subscribers and published event counters
+            agent_replies:
+              type: object
+              description: Agent reply time to first token and total time by agent
+            conversation_histories:
+              type: object
+              description: Cached plan histories and how often they were shortened
+      400:
+        description: Missing or invalid user information
+    """
+    authenticated_user = get_authenticated_user_details(request_headers=request.headers)
+    user_id = authenticated_user["user_principal_id"]
+    if not user_id:
+        track_event_if_configured(
+            "UserIdNotFound", {"status_code": 400, "detail": "no user"}
+        )
+        raise HTTPException(status_code=400, detail="no user")
+
+    return {
+        "cosmos_client_pool": cosmos_client_pool.stats(),
+        "plan_cache": plan_cache.stats(),
+        "vector_indexes": vector_indexes.stats(),
+        "message_buffers": message_buffers.stats(),
+        "session_contexts": session_contexts.stats(),
+        "agent_definitions": agent_definitions.stats(),
+        "agent_construction": AgentFactory.construction_stats(),
+        "agent_cache": AgentFactory.cache_stats(),
+        "step_jobs": step_jobs.stats(),
+        "session_events": session_events.stats(),
+        "agent_replies": reply_metrics.stats(),
+        "conversation_histories": conversation_histories.stats(),
+    }
 
 
 # Run the app
@@ -0,0 +1,136 @@
+# cache_utils.py
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional, Tuple
+
+
+class LRUTTLCache:
+    """A bounded least-recently-used cache whose entries also expire after a TTL.
+
+    Entries are evicted when the cache grows beyond ``max_entries`` (oldest use first)
+    or when they are read more than ``ttl_seconds`` after they were stored. An optional
+    ``on_evict`` callback receives ``(key, value)`` for entries removed by size or age,
+    but not for explicit ``pop``/``invalidate`` calls.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 0,
+        on_evict: Optional[Callable[[Hashable, Any], None]] = None,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of entries kept (0 disables the cache)
+            ttl_seconds: Seconds an entry stays valid after it is stored (0 = no expiry)
+            on_evict: Optional callback for entries evicted by size or age
+        """
+        self._max_entries = max(0, max_entries)
+        self._ttl_seconds = ttl_seconds
+        self._on_evict = on_evict
+        # key -> (expires_at, value); ordered from least to most recently used
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Return True if the cache stores anything at all."""
+        return self._max_entries > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and not self._is_expired(entry)
+
+    def _is_expired(self, entry: Tuple[float, Any]) -> bool:
+        return self._ttl_seconds > 0 and entry[0] <= time.monotonic()
+
+    def _evict(self, key: Hashable) -> None:
+        _, value = self._entries.pop(key)
+        self.evictions += 1
+        if self._on_evict is not None:
+            self._on_evict(key, value)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for a key and mark it as recently used."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        if self._is_expired(entry):
+            self._evict(key)
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """Return a live value without touching recency or the hit/miss counters."""
+        entry = self._entries.get(key)
+        if entry is None or self._is_expired(entry):
+            return default
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entries if needed."""
+        if not self.enabled:
+            return
+
+        expires_at = time.monotonic() + self._ttl_seconds
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._evict(next(iter(self._entries)))
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove a key without calling ``on_evict`` and return its value."""
+        entry = self._entries.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def invalidate(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Remove every key matching the predicate and return how many were removed."""
+        keys = [key for key in self._entries if predicate(key)]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def items(self) -> Iterator[Tuple[Hashable, Any]]:
+        """Iterate over live (key, value) pairs without affecting recency."""
+        for key, (expires_at, value) in list(self._entries.items()):
+            if not self._is_expired((expires_at, value)):
+                yield key, value
+
+    def expire(self) -> int:
+        """Evict every expired entry and return how many were removed."""
+        expired = [
+            key for key, entry in self._entries.items() if self._is_expired(entry)
+        ]
+        for key in expired:
+            self._evict(key)
+        return len(expired)
+
+    def clear(self) -> None:
+        """Remove every entry without calling ``on_evict``."""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return size and hit/miss counters."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self._max_entries,
+            "ttl_seconds": self._ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
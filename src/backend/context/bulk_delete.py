@@ -0,0 +1,199 @@
+# bulk_delete.py
+
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timezone
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from azure.cosmos.aio import ContainerProxy
+from azure.cosmos.exceptions import CosmosResourceNotFoundError
+from semantic_kernel.kernel_pydantic import Field, KernelBaseModel
+
+from cache_utils import LRUTTLCache
+from context.write_behind import MAX_BATCH_OPERATIONS
+
+
+class BulkDeleteJob(KernelBaseModel):
+    """Progress of a background bulk delete."""
+
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    user_id: str
+    data_types: List[str]
+    status: str = "pending"  # pending, running, completed, failed
+    found: int = 0
+    deleted: int = 0
+    failed: int = 0
+    error: Optional[str] = None
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    finished_at: Optional[datetime] = None
+
+
+async def bulk_delete_documents(
+    container: ContainerProxy,
+    documents: AsyncIterator[Dict[str, Any]],
+    max_concurrency: int = 8,
+    job: Optional[BulkDeleteJob] = None,
+    partition_key_field: str = "session_id",
+) -> int:
+    """Delete documents with transactional batches grouped by partition.
+
+    Ids are grouped per partition key as they stream in; every full group of 100 is
+    sent as one delete batch, and at most ``max_concurrency`` batches are in flight.
+    A batch that fails (for example because a document was already deleted) is
+    retried one document at a time.
+
+    Args:
+        container: The container holding the documents
+        documents: Documents with at least ``id`` and the partition key field
+        max_concurrency: Maximum number of concurrent batch requests
+        job: Optional job whose counters are updated as batches complete
+        partition_key_field: Document field holding the partition key value
+
+    Returns:
+        The number of deleted documents
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    pending: Dict[Any, List[str]] = {}
+    tasks: Set[asyncio.Task] = set()
+    deleted = 0
+
+    async def delete_chunk(partition_key: Any, ids: List[str]) -> None:
+        nonlocal deleted
+        async with semaphore:
+            try:
+                await container.execute_item_batch(
+                    batch_operations=[("delete", (item_id,)) for item_id in ids],
+                    partition_key=partition_key,
+                )
+                count, failures = len(ids), 0
+            except Exception as e:
+                logging.warning(
+                    f"Delete batch for partition {partition_key} failed, deleting one by one: {e}"
+                )
+                count, failures = await _delete_individually(
+                    container, partition_key, ids
+                )
+        deleted += count
+        if job is not None:
+            job.deleted += count
+            job.failed += failures
+
+    def dispatch(partition_key: Any, ids: List[str]) -> None:
+        task = asyncio.create_task(delete_chunk(partition_key, ids))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    try:
+        async for document in documents:
+            if job is not None:
+                job.found += 1
+            partition_key = document.get(partition_key_field)
+            ids = pending.setdefault(partition_key, [])
+            ids.append(document["id"])
+            if len(ids) >= MAX_BATCH_OPERATIONS:
+                dispatch(partition_key, pending.pop(partition_key))
+
+        for partition_key, ids in pending.items():
+            dispatch(partition_key, ids)
+        pending.clear()
+
+        if tasks:
+            await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+    return deleted
+
+
+async def _delete_individually(
+    container: ContainerProxy, partition_key: Any, ids: List[str]
+) -> Tuple[int, int]:
+    """Delete documents one at a time, treating already deleted ones as done."""
+    deleted = failed = 0
+    for item_id in ids:
+        try:
+            await container.delete_item(item=item_id, partition_key=partition_key)
+            deleted += 1
+        except CosmosResourceNotFoundError:
+            deleted += 1
+        except Exception as e:
+            logging.exception(f"Failed to delete item {item_id} from Cosmos DB: {e}")
+            failed += 1
+    return deleted, failed
+
+
+class BulkDeleteJobs:
+    """Runs bulk deletes as background tasks and keeps their progress for polling."""
+
+    def __init__(self, max_jobs: int = 256, retention_seconds: float = 3600) -> None:
+        """Initialize the registry.
+
+        Args:
+            max_jobs: Maximum number of jobs whose progress is kept
+            retention_seconds: Seconds a job's progress stays available
+        """
+        self._jobs = LRUTTLCache(max_entries=max_jobs, ttl_seconds=retention_seconds)
+        self._tasks: Set[asyncio.Task] = set()
+
+    def start(
+        self,
+        user_id: str,
+        data_types: List[str],
+        run: Callable[[BulkDeleteJob], Awaitable[Any]],
+    ) -> BulkDeleteJob:
+        """Start a bulk delete in the background and return its job.
+
+        Args:
+            user_id: The user whose documents are deleted
+            data_types: The data types being deleted
+            run: Coroutine function performing the delete and updating the job
+        """
+        job = BulkDeleteJob(user_id=user_id, data_types=data_types)
+        self._jobs.set(job.id, job)
+
+        task = asyncio.create_task(self._run(job, run))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    async def _run(
+        self, job: BulkDeleteJob, run: Callable[[BulkDeleteJob], Awaitable[Any]]
+    ) -> None:
+        job.status = "running"
+        try:
+            await run(job)
+            job.status = "completed" if job.failed == 0 else "failed"
+            logging.info(
+                f"Bulk delete {job.id} finished: {job.deleted} deleted, {job.failed} failed"
+            )
+        except Exception as e:
+            logging.exception(f"Bulk delete {job.id} failed: {e}")
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            job.finished_at = datetime.now(timezone.utc)
+
+    def get(self, job_id: str, user_id: str) -> Optional[BulkDeleteJob]:
+        """Return a job if it exists and belongs to the user."""
+        job = self._jobs.peek(job_id)
+        if job is None or job.user_id != user_id:
+            return None
+        return job
+
+
+# Process-wide registry of background bulk deletes
+bulk_delete_jobs = BulkDeleteJobs()
+
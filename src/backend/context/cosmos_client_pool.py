@@ -0,0 +1,180 @@
+# cosmos_client_pool.py
+
+import asyncio
+import logging
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import aiohttp
+from azure.core.pipeline.transport import AioHttpTransport
+from azure.cosmos.aio import ContainerProxy, CosmosClient
+from azure.cosmos.partition_key import PartitionKey
+
+# Import the AppConfig instance
+from app_config import config
+
+
+class CosmosClientPool:
+    """Process-wide registry of Cosmos DB clients and container handles.
+
+    One CosmosClient (with its own bounded HTTP connection pool) is kept per endpoint,
+    and container handles are resolved once per (endpoint, database, container).
+    Memory contexts borrow from the pool instead of opening a client per request;
+    the pool is closed once, on application shutdown.
+    """
+
+    def __init__(
+        self,
+        credential_provider: Callable[[], Any],
+        max_connections: int = 100,
+        max_connections_per_host: int = 0,
+    ) -> None:
+        """Initialize the pool.
+
+        Args:
+            credential_provider: Callable returning the credential for new clients
+            max_connections: Maximum number of open connections per client (0 = unlimited)
+            max_connections_per_host: Maximum connections per host (0 = unlimited)
+        """
+        self._credential_provider = credential_provider
+        self._max_connections = max_connections
+        self._max_connections_per_host = max_connections_per_host
+
+        self._clients: Dict[str, CosmosClient] = {}
+        self._sessions: Dict[str, aiohttp.ClientSession] = {}
+        self._containers: Dict[Tuple[str, str, str], ContainerProxy] = {}
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def _bind_to_running_loop(self) -> None:
+        """Replace handles created on a different event loop.
+
+        aiohttp sessions cannot be shared across event loops, so if the pool is used
+        from a new loop (e.g. a test runner creating one loop per test) the stale
+        handles are closed best-effort and rebuilt lazily. They are closed on their
+        own loop when it still runs in another thread, and on this one otherwise.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        stale_loop = self._loop
+        clients, sessions = dict(self._clients), dict(self._sessions)
+        self._clients.clear()
+        self._sessions.clear()
+        self._containers.clear()
+        self._lock = asyncio.Lock()
+        self._loop = loop
+        if stale_loop is None or not (clients or sessions):
+            return
+
+        logging.warning(
+            "CosmosClientPool used from a new event loop; closing stale clients"
+        )
+        if stale_loop.is_running() and not stale_loop.is_closed():
+            asyncio.run_coroutine_threadsafe(
+                self._close_handles(clients, sessions), stale_loop
+            )
+        else:
+            await self._close_handles(clients, sessions)
+
+    @staticmethod
+    async def _close_handles(
+        clients: Dict[str, CosmosClient], sessions: Dict[str, aiohttp.ClientSession]
+    ) -> None:
+        """Close clients and their HTTP sessions, logging instead of raising."""
+        for endpoint, client in clients.items():
+            try:
+                await client.close()
+            except Exception as e:
+                logging.warning(f"Error closing CosmosClient for {endpoint}: {e}")
+        for endpoint, session in sessions.items():
+            try:
+                await session.close()
+            except Exception as e:
+                logging.warning(f"Error closing HTTP session for {endpoint}: {e}")
+
+    def _get_client(self, endpoint: str) -> CosmosClient:
+        """Get or create the shared client for an endpoint."""
+        client = self._clients.get(endpoint)
+        if client is not None:
+            return client
+
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=self._max_connections,
+                limit_per_host=self._max_connections_per_host,
+            )
+        )
+        client = CosmosClient(
+            endpoint,
+            credential=self._credential_provider(),
+            transport=AioHttpTransport(session=session, session_owner=False),
+        )
+        self._sessions[endpoint] = session
+        self._clients[endpoint] = client
+        logging.info(f"Created shared CosmosClient for {endpoint}")
+        return client
+
+    async def get_container(
+        self,
+        endpoint: str,
+        database: str,
+        container: str,
+        partition_key_path: str = "/session_id",
+    ) -> ContainerProxy:
+        """Get a container handle, creating the container on first use only.
+
+        Args:
+            endpoint: The Cosmos DB account endpoint
+            database: The database name
+            container: The container name
+            partition_key_path: Partition key path used if the container is created
+
+        Returns:
+            A ContainerProxy shared by every caller in this process
+        """
+        await self._bind_to_running_loop()
+        key = (endpoint, database, container)
+        handle = self._containers.get(key)
+        if handle is not None:
+            return handle
+
+        async with self._lock:
+            # Another coroutine may have resolved the handle while we waited
+            handle = self._containers.get(key)
+            if handle is not None:
+                return handle
+
+            client = self._get_client(endpoint)
+            database_client = client.get_database_client(database)
+            handle = await database_client.create_container_if_not_exists(
+                id=container,
+                partition_key=PartitionKey(path=partition_key_path),
+            )
+            self._containers[key] = handle
+            return handle
+
+    async def close(self) -> None:
+        """Close every pooled client and its connection pool."""
+        self._containers.clear()
+        await self._close_handles(dict(self._clients), dict(self._sessions))
+        self._clients.clear()
+        self._sessions.clear()
+        self._loop = None
+        self._lock = None
+        logging.info("Closed shared Cosmos DB clients")
+
+    def stats(self) -> Dict[str, int]:
+        """Return the number of pooled clients and container handles."""
+        return {
+            "clients": len(self._clients),
+            "containers": len(self._containers),
+            "max_connections": self._max_connections,
+        }
+
+
+# Process-wide pool shared by every CosmosMemoryContext
+cosmos_client_pool = CosmosClientPool(
+    credential_provider=config.get_azure_credentials,
+    max_connections=config.COSMOSDB_MAX_CONNECTIONS,
+    max_connections_per_host=config.COSMOSDB_MAX_CONNECTIONS_PER_HOST,
+)
@@ -5,19 +5,42 @@ import logging
 import uuid
 import json
 import datetime
-from typing import Any, Dict, List, Optional, Type, Tuple
+import re
+import weakref
+from typing import Any, AsyncIterator, Dict, List, Optional, Type, Tuple
 import numpy as np
 
-from azure.cosmos.partition_key import PartitionKey
-from azure.cosmos.aio import CosmosClient
-from azure.identity import DefaultAzureCredential
+from azure.cosmos.exceptions import CosmosResourceNotFoundError
+
 from semantic_kernel.memory.memory_record import MemoryRecord
 from semantic_kernel.memory.memory_store_base import MemoryStoreBase
 from semantic_kernel.contents import ChatMessageContent, ChatHistory, AuthorRole
 
 # Import the AppConfig instance
 from app_config import config
-from models.messages_kernel import BaseDataModel, Plan, Session, Step, AgentMessage
+from context.bulk_delete import BulkDeleteJob, bulk_delete_documents
+from context.cosmos_client_pool import cosmos_client_pool
+from context.embedding_codec import (
+    EMBEDDING_ENCODINGS,
+    decode_embedding,
+    encode_embedding,
+    is_encoded_as,
+)
+from context.event_bus import session_events
+from context.message_buffer import SessionMessageBuffer, message_buffers
+from context.plan_cache import plan_cache
+from context.vector_index import vector_indexes
+from context.write_behind import MAX_BATCH_OPERATIONS, WriteBehindBuffer
+from models.messages_kernel import (
+    AgentMessage,
+    BaseDataModel,
+    Plan,
+    PlanSummary,
+    Session,
+    Step,
+    StepStatus,
+    StepSummary,
+)
 
 
 # Add custom JSON encoder class for datetime objects
@@ -30,6 +53,40 @@ class DateTimeEncoder(json.JSONEncoder):
         return super().default(obj)
 
 
+class BatchWriteError(Exception):
+    """Some transactional batches of a write failed while others were committed.
+
+    Attributes:
+        failed_ids: IDs of the documents in the failed batches, none of them written
+        written_ids: IDs of the documents in the committed batches
+    """
+
+    def __init__(self, message: str, failed_ids: List[str], written_ids: List[str]):
+        super().__init__(message)
+        self.failed_ids = failed_ids
+        self.written_ids = written_ids
+
+
+class FlushError(Exception):
+    """Buffered writes of one or more contexts could not be flushed.
+
+    The failed writes stay buffered and are retried in the background, except the
+    ones the write-behind buffer dropped as non-retryable.
+
+    Attributes:
+        errors: The error of every buffer whose flush failed
+    """
+
+    def __init__(self, message: str, errors: List[Exception]):
+        super().__init__(message)
+        self.errors = errors
+
+
+# Queries that can be rewritten into a field projection
+_SELECT_ALL_PATTERN = re.compile(r"\s*SELECT\s+\*\s+FROM\s+c\b", re.IGNORECASE)
+_FIELD_NAME_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
 class CosmosMemoryContext(MemoryStoreBase):
     """A buffered chat completion context that saves messages and data models to Cosmos DB."""
 
@@ -41,6 +98,13 @@ class CosmosMemoryContext(MemoryStoreBase):
         # Messages are handled separately
     }
 
+    # Per-session document pointing at the session's plan, for point reads
+    PLAN_INDEX_DATA_TYPE = "plan_index"
+
+    # Live contexts with write-behind buffers, so a request can flush writes made
+    # through any context of its session (e.g. by cached agents)
+    _buffered_contexts: "weakref.WeakSet[CosmosMemoryContext]" = weakref.WeakSet()
+
     def __init__(
         self,
         session_id: str,
@@ -50,39 +114,51 @@ class CosmosMemoryContext(MemoryStoreBase):
         cosmos_database: str = None,
         buffer_size: int = 100,
         initial_messages: Optional[List[ChatMessageContent]] = None,
+        write_behind: Optional[bool] = None,
     ) -> None:
         self._buffer_size = buffer_size
-        self._messages = initial_messages or []
 
         # Use values from AppConfig instance if not provided
         self._cosmos_container = cosmos_container or config.COSMOSDB_CONTAINER
         self._cosmos_endpoint = cosmos_endpoint or config.COSMOSDB_ENDPOINT
         self._cosmos_database = cosmos_database or config.COSMOSDB_DATABASE
 
-        self._database = None
         self._container = None
         self.session_id = session_id
         self.user_id = user_id
+        # The buffer is shared by every context of the session, so messages passed
+        # in only seed it while it holds none yet
+        if initial_messages and not (self._messages.seeded and len(self._messages)):
+            self._messages.seed(initial_messages)
         self._initialized = asyncio.Event()
         # Skip auto-initialize in constructor to avoid requiring a running event loop
         self._initialized.set()
 
+        # Opt-in write-behind buffering of add_item / update_item
+        if write_behind is None:
+            write_behind = config.COSMOSDB_WRITE_BEHIND
+        self._write_buffer: Optional[WriteBehindBuffer] = None
+        if write_behind:
+            self._write_buffer = WriteBehindBuffer(
+                container_provider=self._get_container,
+                max_batch_size=config.COSMOSDB_WRITE_BEHIND_MAX_BATCH,
+                flush_interval=config.COSMOSDB_WRITE_BEHIND_FLUSH_MS / 1000,
+            )
+            CosmosMemoryContext._buffered_contexts.add(self)
+
+    @property
+    def _messages(self) -> SessionMessageBuffer:
+        """Return the session's message buffer, shared across requests."""
+        return message_buffers.get_or_create(
+            self.user_id, self.session_id, self._buffer_size
+        )
+
     async def initialize(self):
         """Initialize the memory context using CosmosDB."""
         try:
-            if not self._database:
-                # Create Cosmos client
-                cosmos_client = CosmosClient(
-                    self._cosmos_endpoint, credential=DefaultAzureCredential()
-                )
-                self._database = cosmos_client.get_database_client(
-                    self._cosmos_database
-                )
-
-            # Set up CosmosDB container
-            self._container = await self._database.create_container_if_not_exists(
-                id=self._cosmos_container,
-                partition_key=PartitionKey(path="/session_id"),
+            # Borrow the shared client and container handle from the process-wide pool
+            self._container = await cosmos_client_pool.get_container(
+                self._cosmos_endpoint, self._cosmos_database, self._cosmos_container
             )
             logging.info("Successfully connected to CosmosDB")
         except Exception as e:
@@ -115,51 +191,151 @@ class CosmosMemoryContext(MemoryStoreBase):
                     "CosmosDB container is not available. Initialization failed."
                 )
 
-    async def add_item(self, item: BaseDataModel) -> None:
-        """Add a data model item to Cosmos DB."""
+    async def _get_container(self):
+        """Return the initialized container (used by the write-behind buffer)."""
         await self.ensure_initialized()
+        return self._container
+
+    async def _flush_pending_writes(self) -> None:
+        """Flush buffered writes so later queries and direct writes observe them."""
+        if self._write_buffer is not None and self._write_buffer.has_pending():
+            await self._write_buffer.flush()
+
+    async def flush(self) -> None:
+        """Flush buffered writes for this context's session to Cosmos DB.
 
+        Endpoints await this before returning so buffered writes never outlive the
+        request. Buffers of other live contexts for the same user and session are
+        flushed too, each one even when another fails. It is a no-op when
+        write-behind buffering is disabled.
+
+        Raises:
+            FlushError: One or more buffers failed to flush
+        """
+        contexts = [
+            context
+            for context in list(CosmosMemoryContext._buffered_contexts)
+            if context is self
+            or (
+                context.session_id == self.session_id
+                and context.user_id == self.user_id
+            )
+        ]
+        results = await asyncio.gather(
+            *(context._write_buffer.flush() for context in contexts),
+            return_exceptions=True,
+        )
+        errors = [result for result in results if isinstance(result, Exception)]
+        for error in errors:
+            logging.error(
+                f"Failed to flush buffered writes of session {self.session_id}: {error}"
+            )
+        if errors:
+            raise FlushError(
+                f"{len(errors)} of {len(contexts)} write buffers of session "
+                f"{self.session_id} failed to flush",
+                errors,
+            )
+
+    async def close(self) -> None:
+        """Flush buffered writes and release the borrowed container handle.
+
+        The underlying client is shared by the process-wide pool and is closed when
+        the application shuts down, not per context. A closed context that is
+        written to again (e.g. by a cached agent still holding it) registers its
+        buffer again, so later flushes and ``close_all`` still see the writes.
+        """
         try:
-            # Convert the model to a dict
-            document = item.model_dump()
+            if self._write_buffer is not None:
+                await self._write_buffer.close()
+        finally:
+            CosmosMemoryContext._buffered_contexts.discard(self)
+            self._container = None
 
-            # Handle datetime objects by converting them to ISO format strings
-            for key, value in list(document.items()):
-                if isinstance(value, datetime.datetime):
-                    document[key] = value.isoformat()
+    @classmethod
+    async def close_all(cls) -> None:
+        """Close every context that still has a write-behind buffer registered."""
+        for context in list(cls._buffered_contexts):
+            try:
+                await context.close()
+            except Exception as e:
+                logging.exception(
+                    f"Failed to close memory context of session {context.session_id}: {e}"
+                )
 
-            # Now create the item with the serialized datetime values
-            await self._container.create_item(body=document)
-            logging.info(f"Item added to Cosmos DB - {document['id']}")
+    async def _buffer_write(self, operation: str, document: Dict[str, Any]) -> None:
+        """Add a write to the write-behind buffer and register it for flushing."""
+        CosmosMemoryContext._buffered_contexts.add(self)
+        await self._write_buffer.add(operation, document)
+
+    @staticmethod
+    def _serialize_item(item: BaseDataModel) -> Dict[str, Any]:
+        """Convert a model to a Cosmos DB document with ISO formatted datetimes."""
+        document = item.model_dump()
+        for key, value in list(document.items()):
+            if isinstance(value, datetime.datetime):
+                document[key] = value.isoformat()
+        return document
+
+    async def add_item(self, item: BaseDataModel) -> None:
+        """Add a data model item to Cosmos DB."""
+        await self.ensure_initialized()
+
+        try:
+            document = self._serialize_item(item)
+            if isinstance(item, (Plan, Step)):
+                # A new plan or step changes what cached step lists should contain
+                plan_cache.invalidate_session(item.user_id, item.session_id)
+
+            if self._write_buffer is not None:
+                await self._buffer_write("create", document)
+            else:
+                # Now create the item with the serialized datetime values
+                await self._container.create_item(body=document)
+                logging.info(f"Item added to Cosmos DB - {document['id']}")
         except Exception as e:
             logging.exception(f"Failed to add item to Cosmos DB: {e}")
             raise  # Propagate the error instead of silently failing
 
+        if isinstance(item, (Plan, Step, AgentMessage)):
+            session_events.publish_item(item)
+
     async def update_item(self, item: BaseDataModel) -> None:
         """Update an existing item in Cosmos DB."""
         await self.ensure_initialized()
 
         try:
-            # Convert the model to a dict
-            document = item.model_dump()
-
-            # Handle datetime objects by converting them to ISO format strings
-            for key, value in list(document.items()):
-                if isinstance(value, datetime.datetime):
-                    document[key] = value.isoformat()
+            document = self._serialize_item(item)
 
-            # Now upsert the item with the serialized datetime values
-            await self._container.upsert_item(body=document)
+            if self._write_buffer is not None:
+                await self._buffer_write("upsert", document)
+            else:
+                # Now upsert the item with the serialized datetime values
+                await self._container.upsert_item(body=document)
         except Exception as e:
+            if isinstance(item, (Plan, Step)):
+                plan_cache.invalidate_session(item.user_id, item.session_id)
             logging.exception(f"Failed to update item in Cosmos DB: {e}")
             raise  # Propagate the error instead of silently failing
 
+        if isinstance(item, Step):
+            plan_cache.update_step(item.user_id, item)
+        elif isinstance(item, Plan):
+            plan_cache.set_plan(item.user_id, item)
+        if isinstance(item, (Plan, Step, AgentMessage)):
+            session_events.publish_item(item)
+
     async def get_item_by_id(
         self, item_id: str, partition_key: str, model_class: Type[BaseDataModel]
     ) -> Optional[BaseDataModel]:
         """Retrieve an item by its ID and partition key."""
         await self.ensure_initialized()
 
+        if self._write_buffer is not None:
+            pending = self._write_buffer.get_pending(item_id, partition_key)
+            if pending is not None:
+                return model_class.model_validate(pending)
+
         try:
             item = await self._container.read_item(
                 item=item_id, partition_key=partition_key
@@ -169,32 +345,205 @@ class CosmosMemoryContext(MemoryStoreBase):
             logging.exception(f"Failed to retrieve item from Cosmos DB: {e}")
             return None
 
+    async def _read_document(
+        self, item_id: str, partition_key: str
+    ) -> Optional[Dict[str, Any]]:
+        """Point read a raw document, returning None if it does not exist."""
+        await self.ensure_initialized()
+
+        if self._write_buffer is not None:
+            pending = self._write_buffer.get_pending(item_id, partition_key)
+            if pending is not None:
+                return pending
+
+        try:
+            return await self._container.read_item(
+                item=item_id, partition_key=partition_key
+            )
+        except CosmosResourceNotFoundError:
+            return None
+
     async def query_items(
         self,
         query: str,
         parameters: List[Dict[str, Any]],
         model_class: Type[BaseDataModel],
+        partition_key: Optional[str] = None,
+        fields: Optional[List[str]] = None,
     ) -> List[BaseDataModel]:
-        """Query items from Cosmos DB and return a list of model instances."""
+        """Query items from Cosmos DB and return a list of model instances.
+
+        Args:
+            query: The SQL query
+            parameters: The query parameters
+            model_class: The model to validate each document into
+            partition_key: Optional partition key (session_id) to scope the query to a
+                single partition instead of fanning out across all of them
+            fields: Optional top-level fields to fetch instead of whole documents;
+                the query must start with ``SELECT * FROM c``
+        """
+        return [
+            item
+            async for item in self.iter_items(
+                query,
+                parameters,
+                model_class,
+                partition_key=partition_key,
+                fields=fields,
+            )
+        ]
+
+    @staticmethod
+    def _project(query: str, fields: Optional[List[str]]) -> str:
+        """Rewrite ``SELECT * FROM c`` into a projection of the given fields.
+
+        Raises:
+            ValueError: If the query cannot be projected or a field name is invalid
+        """
+        if not fields:
+            return query
+
+        match = _SELECT_ALL_PATTERN.match(query)
+        if match is None:
+            raise ValueError("Only 'SELECT * FROM c' queries can be projected")
+        for field in fields:
+            if not _FIELD_NAME_PATTERN.match(field):
+                raise ValueError(f"Invalid field name for projection: {field!r}")
+
+        # _ts is always needed to populate the model's ts
+        projected = list(dict.fromkeys([*fields, "_ts"]))
+        columns = ", ".join(f"c.{field}" for field in projected)
+        return f"SELECT {columns} FROM c{query[match.end():]}"
+
+    @staticmethod
+    def _to_model(
+        item: Dict[str, Any], model_class: Optional[Type[BaseDataModel]]
+    ) -> Any:
+        """Validate a raw document into a model, or return it as-is without one."""
+        if model_class is None:
+            return item
+        item["ts"] = item["_ts"]
+        return model_class.model_validate(item)
+
+    async def iter_items(
+        self,
+        query: str,
+        parameters: List[Dict[str, Any]],
+        model_class: Optional[Type[BaseDataModel]] = None,
+        partition_key: Optional[str] = None,
+        page_size: Optional[int] = None,
+        max_items: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+    ) -> AsyncIterator[Any]:
+        """Stream query results page by page instead of materializing a full list.
+
+        Args:
+            query: The SQL query
+            parameters: The query parameters
+            model_class: Model to validate each document into; raw dicts if None
+            partition_key: Optional partition key to scope the query
+            page_size: Documents fetched per round trip (defaults to config)
+            max_items: Stop after yielding this many items
+            fields: Optional top-level fields to fetch instead of whole documents
+
+        Yields:
+            Model instances (or raw documents) in query order
+        """
         await self.ensure_initialized()
+        await self._flush_pending_writes()
 
+        query = self._project(query, fields)
+        count = 0
         try:
-            items = self._container.query_items(query=query, parameters=parameters)
-            result_list = []
+            items = self._container.query_items(
+                query=query,
+                parameters=parameters,
+                partition_key=partition_key,
+                max_item_count=page_size or config.COSMOSDB_QUERY_PAGE_SIZE,
+            )
             async for item in items:
-                item["ts"] = item["_ts"]
-                result_list.append(model_class.model_validate(item))
-            return result_list
+                yield self._to_model(item, model_class)
+                count += 1
+                if max_items is not None and count >= max_items:
+                    return
         except Exception as e:
             logging.exception(f"Failed to query items from Cosmos DB: {e}")
-            return []
+
+    async def query_page(
+        self,
+        query: str,
+        parameters: List[Dict[str, Any]],
+        model_class: Optional[Type[BaseDataModel]] = None,
+        partition_key: Optional[str] = None,
+        page_size: Optional[int] = None,
+        continuation: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Tuple[List[Any], Optional[str]]:
+        """Fetch one page of query results.
+
+        Args:
+            query: The SQL query
+            parameters: The query parameters
+            model_class: Model to validate each document into; raw dicts if None
+            partition_key: Optional partition key to scope the query
+            page_size: Maximum documents in the page (defaults to config)
+            continuation: Token returned with the previous page, None for the first
+            fields: Optional top-level fields to fetch instead of whole documents
+
+        Returns:
+            The page of items and the continuation token for the next page, which is
+            None once the results are exhausted
+        """
+        await self.ensure_initialized()
+        await self._flush_pending_writes()
+
+        query = self._project(query, fields)
+        try:
+            pager = self._container.query_items(
+                query=query,
+                parameters=parameters,
+                partition_key=partition_key,
+                max_item_count=page_size or config.COSMOSDB_QUERY_PAGE_SIZE,
+            ).by_page(continuation)
+            async for page in pager:
+                items = [self._to_model(item, model_class) async for item in page]
+                return items, pager.continuation_token
+            return [], None
+        except Exception as e:
+            logging.exception(f"Failed to query page from Cosmos DB: {e}")
+            raise
 
     async def add_session(self, session: Session) -> None:
-        """Add a session to Cosmos DB."""
-        await self.add_item(session)
+        """Add a session to Cosmos DB.
+
+        The session is stored in its own partition (session_id == id) so it can be
+        retrieved with a point read.
+        """
+        await self.ensure_initialized()
+
+        try:
+            document = self._serialize_item(session)
+            document["session_id"] = session.id
+
+            if self._write_buffer is not None:
+                await self._buffer_write("create", document)
+                return
+
+            await self._container.create_item(body=document)
+        except Exception as e:
+            logging.exception(f"Failed to add session to Cosmos DB: {e}")
+            raise
 
     async def get_session(self, session_id: str) -> Optional[Session]:
         """Retrieve a session by session_id."""
+        try:
+            document = await self._read_document(session_id, session_id)
+            if document is not None and document.get("data_type") == "session":
+                return Session.model_validate(document)
+        except Exception as e:
+            logging.warning(f"Point read of session {session_id} failed: {e}")
+
+        # Sessions written before they carried a partition key need a query
         query = "SELECT * FROM c WHERE c.id=@id AND c.data_type=@data_type"
         parameters = [
             {"name": "@id", "value": session_id},
@@ -212,24 +561,154 @@ class CosmosMemoryContext(MemoryStoreBase):
         sessions = await self.query_items(query, parameters, Session)
         return sessions
 
+    @staticmethod
+    def _plan_index_id(session_id: str) -> str:
+        """Return the id of the session's plan index document."""
+        return f"plan_index:{session_id}"
+
+    def _plan_index_document(self, plan_document: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the session -> plan index document embedding the plan snapshot."""
+        return {
+            "id": self._plan_index_id(plan_document["session_id"]),
+            "session_id": plan_document["session_id"],
+            "user_id": plan_document["user_id"],
+            "data_type": self.PLAN_INDEX_DATA_TYPE,
+            "plan_id": plan_document["id"],
+            "plan": plan_document,
+        }
+
+    async def _write_plan(self, plan: Plan, operation: str) -> None:
+        """Write a plan together with its session index in one batch."""
+        await self.ensure_initialized()
+
+        plan_document = self._serialize_item(plan)
+        index_document = self._plan_index_document(plan_document)
+
+        if self._write_buffer is not None:
+            await self._buffer_write(operation, plan_document)
+            await self._buffer_write("upsert", index_document)
+            return
+
+        await self._container.execute_item_batch(
+            batch_operations=[
+                (operation, (plan_document,)),
+                ("upsert", (index_document,)),
+            ],
+            partition_key=plan.session_id,
+        )
+
     async def add_plan(self, plan: Plan) -> None:
         """Add a plan to Cosmos DB."""
-        await self.add_item(plan)
+        try:
+            await self._write_plan(plan, "create")
+        except Exception as e:
+            plan_cache.invalidate_session(plan.user_id, plan.session_id)
+            logging.exception(f"Failed to add plan to Cosmos DB: {e}")
+            raise
+        plan_cache.set_plan(plan.user_id, plan)
+        session_events.publish_item(plan)
+
+    async def add_plan_with_steps(self, plan: Plan, steps: List[Step]) -> None:
+        """Add a plan and its steps to Cosmos DB in a single transactional batch.
+
+        Plan and steps share the session_id partition, so they are committed
+        atomically and a partially written plan is never visible to readers. A plan
+        with more steps than fit in one batch is not atomic: the plan, its index
+        and the first steps are committed together, and the remaining steps follow
+        in further batches, which may fail after the plan became visible.
+
+        Args:
+            plan: The plan to add
+            steps: The steps belonging to the plan
+        """
+        await self.ensure_initialized()
+        # Keep ordering with respect to writes buffered earlier in this session
+        await self._flush_pending_writes()
+
+        plan_document = self._serialize_item(plan)
+        step_operations = [
+            ("create", (self._serialize_item(step),)) for step in steps
+        ]
+        # The plan and its index always share the first batch
+        first_steps = MAX_BATCH_OPERATIONS - 2
+        batches = [
+            step_operations[:first_steps]
+            + [
+                ("create", (plan_document,)),
+                ("upsert", (self._plan_index_document(plan_document),)),
+            ]
+        ]
+        for start in range(first_steps, len(step_operations), MAX_BATCH_OPERATIONS):
+            batches.append(step_operations[start : start + MAX_BATCH_OPERATIONS])
+
+        plan_cache.invalidate_session(plan.user_id, plan.session_id)
+        try:
+            if len(batches) > 1:
+                logging.warning(
+                    f"Plan {plan.id} has {len(steps)} steps; writing it in "
+                    f"{len(batches)} batches, which are not atomic together"
+                )
+            for batch in batches:
+                await self._container.execute_item_batch(
+                    batch_operations=batch, partition_key=plan.session_id
+                )
+            logging.info(f"Plan {plan.id} added to Cosmos DB with {len(steps)} steps")
+        except Exception as e:
+            logging.exception(f"Failed to add plan with steps to Cosmos DB: {e}")
+            raise
+        for item in (*steps, plan):
+            session_events.publish_item(item)
 
     async def update_plan(self, plan: Plan) -> None:
         """Update an existing plan in Cosmos DB."""
-        await self.update_item(plan)
+        try:
+            await self._write_plan(plan, "upsert")
+        except Exception as e:
+            plan_cache.invalidate_session(plan.user_id, plan.session_id)
+            logging.exception(f"Failed to update plan in Cosmos DB: {e}")
+            raise
+        plan_cache.set_plan(plan.user_id, plan)
+        session_events.publish_item(plan)
 
     async def get_plan_by_session(self, session_id: str) -> Optional[Plan]:
-        """Retrieve a plan associated with a session."""
+        """Retrieve a plan associated with a session.
+
+        Uses a single point read of the session's plan index document. Sessions
+        created before the index existed fall back to a partition-scoped query and
+        get their index backfilled. Results are served from the process-wide plan
+        cache when possible.
+        """
+        cached = plan_cache.get_plan(self.user_id, session_id)
+        if cached is not None:
+            return cached
+
+        try:
+            index = await self._read_document(self._plan_index_id(session_id), session_id)
+            if index is not None and index.get("user_id") == self.user_id:
+                plan = Plan.model_validate(index["plan"])
+                plan_cache.set_plan(self.user_id, plan)
+                return plan
+        except Exception as e:
+            logging.warning(f"Point read of plan index for {session_id} failed: {e}")
+
         query = "SELECT * FROM c WHERE c.session_id=@session_id AND c.user_id=@user_id AND c.data_type=@data_type"
         parameters = [
             {"name": "@session_id", "value": session_id},
             {"name": "@data_type", "value": "plan"},
             {"name": "@user_id", "value": self.user_id},
         ]
-        plans = await self.query_items(query, parameters, Plan)
-        return plans[0] if plans else None
+        plans = await self.query_items(query, parameters, Plan, partition_key=session_id)
+        if not plans:
+            return None
+
+        try:
+            await self._container.upsert_item(
+                body=self._plan_index_document(self._serialize_item(plans[0]))
+            )
+        except Exception as e:
+            logging.warning(f"Failed to backfill plan index for {session_id}: {e}")
+        plan_cache.set_plan(self.user_id, plans[0])
+        return plans[0]
 
     async def get_thread_by_session(self, session_id: str) -> Optional[Any]:
         """Retrieve a plan associated with a session."""
@@ -239,7 +718,9 @@ class CosmosMemoryContext(MemoryStoreBase):
             {"name": "@data_type", "value": "thread"},
             {"name": "@user_id", "value": self.user_id},
         ]
-        threads = await self.query_items(query, parameters, Plan)
+        threads = await self.query_items(
+            query, parameters, Plan, partition_key=session_id
+        )
         return threads[0] if threads else None
 
     async def get_plan(self, plan_id: str) -> Optional[Plan]:
@@ -266,6 +747,96 @@ class CosmosMemoryContext(MemoryStoreBase):
         plans = await self.query_items(query, parameters, Plan)
         return plans
 
+    async def get_all_plan_summaries(self) -> List[PlanSummary]:
+        """Retrieve lightweight summaries of the user's most recent plans."""
+        query = "SELECT * FROM c WHERE c.user_id=@user_id AND c.data_type=@data_type ORDER BY c._ts DESC OFFSET 0 LIMIT 5"
+        parameters = [
+            {"name": "@data_type", "value": "plan"},
+            {"name": "@user_id", "value": self.user_id},
+        ]
+        return await self.query_items(
+            query, parameters, PlanSummary, fields=list(PlanSummary.model_fields)
+        )
+
+    async def get_step_summaries_by_plan(
+        self, plan_id: str, session_id: Optional[str] = None
+    ) -> List[StepSummary]:
+        """Retrieve id and status of each step of a plan, without reply payloads.
+
+        Args:
+            plan_id: The ID of the plan to retrieve step summaries for
+            session_id: The plan's session; defaults to this context's session
+        """
+        query = "SELECT * FROM c WHERE c.plan_id=@plan_id AND c.user_id=@user_id AND c.data_type=@data_type"
+        parameters = [
+            {"name": "@plan_id", "value": plan_id},
+            {"name": "@data_type", "value": "step"},
+            {"name": "@user_id", "value": self.user_id},
+        ]
+        return await self.query_items(
+            query,
+            parameters,
+            StepSummary,
+            partition_key=session_id or self.session_id or None,
+            fields=list(StepSummary.model_fields),
+        )
+
+    async def get_step_status_counts(
+        self, plans: List[Any]
+    ) -> Dict[str, Dict[StepStatus, int]]:
+        """Count the steps of several plans by status in a single query.
+
+        When every plan lives in one session, the counting is done server side with
+        a partition-scoped GROUP BY. The Python SDK cannot run GROUP BY across
+        partitions, so plans from several sessions are counted from one projected
+        query that returns only plan_id and status per step.
+
+        Args:
+            plans: Plans (or plan summaries) with ``id`` and ``session_id``
+
+        Returns:
+            Mapping of plan_id to its status histogram; plans without steps map to {}
+        """
+        counts: Dict[str, Dict[StepStatus, int]] = {plan.id: {} for plan in plans}
+        if not plans:
+            return counts
+
+        await self.ensure_initialized()
+        await self._flush_pending_writes()
+
+        session_ids = {plan.session_id for plan in plans}
+        parameters = [
+            {"name": "@plan_ids", "value": list(counts)},
+            {"name": "@data_type", "value": "step"},
+            {"name": "@user_id", "value": self.user_id},
+        ]
+        where = "WHERE c.user_id=@user_id AND c.data_type=@data_type AND ARRAY_CONTAINS(@plan_ids, c.plan_id)"
+
+        if len(session_ids) == 1:
+            query = f"SELECT c.plan_id, c.status, COUNT(1) AS count FROM c {where} GROUP BY c.plan_id, c.status"
+            try:
+                items = self._container.query_items(
+                    query=query,
+                    parameters=parameters,
+                    partition_key=next(iter(session_ids)),
+                )
+                async for item in items:
+                    counts[item["plan_id"]][StepStatus(item["status"])] = item["count"]
+                return counts
+            except Exception as e:
+                logging.warning(f"Step status aggregate failed, counting client side: {e}")
+                counts = {plan.id: {} for plan in plans}
+
+        async for step in self.iter_items(
+            f"SELECT * FROM c {where}",
+            parameters,
+            StepSummary,
+            fields=list(StepSummary.model_fields),
+        ):
+            histogram = counts[step.plan_id]
+            histogram[step.status] = histogram.get(step.status, 0) + 1
+        return counts
+
     async def add_step(self, step: Step) -> None:
         """Add a step to Cosmos DB."""
         await self.add_item(step)
@@ -274,15 +845,34 @@ class CosmosMemoryContext(MemoryStoreBase):
         """Update an existing step in Cosmos DB."""
         await self.update_item(step)
 
-    async def get_steps_by_plan(self, plan_id: str) -> List[Step]:
-        """Retrieve all steps associated with a plan."""
+    async def get_steps_by_plan(
+        self, plan_id: str, session_id: Optional[str] = None
+    ) -> List[Step]:
+        """Retrieve all steps associated with a plan.
+
+        Args:
+            plan_id: The ID of the plan to retrieve steps for
+            session_id: The plan's session; defaults to this context's session. When
+                neither is known the query fans out across partitions and the result
+                is not cached.
+        """
+        partition_key = session_id or self.session_id or None
+        if partition_key:
+            cached = plan_cache.get_steps(self.user_id, partition_key, plan_id)
+            if cached is not None:
+                return cached
+
         query = "SELECT * FROM c WHERE c.plan_id=@plan_id AND c.user_id=@user_id AND c.data_type=@data_type"
         parameters = [
             {"name": "@plan_id", "value": plan_id},
             {"name": "@data_type", "value": "step"},
             {"name": "@user_id", "value": self.user_id},
         ]
-        steps = await self.query_items(query, parameters, Step)
+        steps = await self.query_items(
+            query, parameters, Step, partition_key=partition_key
+        )
+        if partition_key:
+            plan_cache.set_steps(self.user_id, partition_key, plan_id, steps)
         return steps
 
     async def get_steps_for_plan(
@@ -297,12 +887,19 @@ class CosmosMemoryContext(MemoryStoreBase):
         Returns:
             List of Step objects
         """
-        return await self.get_steps_by_plan(plan_id)
+        return await self.get_steps_by_plan(plan_id, session_id)
 
     async def get_step(self, step_id: str, session_id: str) -> Optional[Step]:
-        return await self.get_item_by_id(
+        cached = plan_cache.get_step(self.user_id, session_id, step_id)
+        if cached is not None:
+            return cached
+
+        step = await self.get_item_by_id(
             step_id, partition_key=session_id, model_class=Step
         )
+        if step is not None and step.user_id == self.user_id:
+            plan_cache.set_step(self.user_id, step)
+        return step
 
     async def add_agent_message(self, message: AgentMessage) -> None:
         """Add an agent message to Cosmos DB.
@@ -328,7 +925,9 @@ class CosmosMemoryContext(MemoryStoreBase):
             {"name": "@session_id", "value": session_id},
             {"name": "@data_type", "value": "agent_message"},
         ]
-        messages = await self.query_items(query, parameters, AgentMessage)
+        messages = await self.query_items(
+            query, parameters, AgentMessage, partition_key=session_id
+        )
         return messages
 
     async def add_message(self, message: ChatMessageContent) -> None:
@@ -336,11 +935,6 @@ class CosmosMemoryContext(MemoryStoreBase):
         await self.ensure_initialized()
 
         try:
-            self._messages.append(message)
-            # Ensure buffer size is maintained
-            while len(self._messages) > self._buffer_size:
-                self._messages.pop(0)
-
             message_dict = {
                 "id": str(uuid.uuid4()),
                 "session_id": self.session_id,
@@ -358,15 +952,28 @@ class CosmosMemoryContext(MemoryStoreBase):
             logging.exception(f"Failed to add message to Cosmos DB: {e}")
             raise  # Propagate the error instead of silently failing
 
+        # An unseeded buffer picks the message up when it is loaded
+        if self._messages.seeded:
+            self._messages.append(message)
+
     async def get_messages(self) -> List[ChatMessageContent]:
-        """Get recent messages for the session."""
+        """Get recent messages for the session.
+
+        The most recent messages are read from Cosmos DB once per session and then
+        served from the process-wide message buffer, which ``add_message`` keeps
+        up to date.
+        """
+        if self._messages.seeded:
+            return self._messages.messages()
+
         await self.ensure_initialized()
+        await self._flush_pending_writes()
 
         try:
             query = """
                 SELECT * FROM c
                 WHERE c.session_id=@session_id AND c.data_type=@data_type
-                ORDER BY c._ts ASC
+                ORDER BY c._ts DESC
                 OFFSET 0 LIMIT @limit
             """
             parameters = [
@@ -377,6 +984,7 @@ class CosmosMemoryContext(MemoryStoreBase):
             items = self._container.query_items(
                 query=query,
                 parameters=parameters,
+                partition_key=self.session_id,
             )
             messages = []
             async for item in items:
@@ -396,65 +1004,162 @@ class CosmosMemoryContext(MemoryStoreBase):
                     metadata=content.get("metadata", {}),
                 )
                 messages.append(message)
-            return messages
         except Exception as e:
             logging.exception(f"Failed to load messages from Cosmos DB: {e}")
             return []
 
+        # Newest first from the query; the buffer keeps them oldest first
+        messages.reverse()
+        self._messages.seed(messages)
+        return messages
+
     def get_chat_history(self) -> ChatHistory:
-        """Convert the buffered messages to a ChatHistory object."""
-        history = ChatHistory()
-        for message in self._messages:
-            history.add_message(message)
-        return history
+        """Return the buffered messages as a ChatHistory object.
+
+        The history is maintained incrementally by the message buffer; call
+        ``get_messages`` first to load earlier messages of the session.
+        """
+        return self._messages.chat_history()
 
     async def save_chat_history(self, history: ChatHistory) -> None:
         """Save a ChatHistory object to the store."""
         for message in history.messages:
             await self.add_message(message)
 
+    def _data_by_type_query(
+        self, data_type: str
+    ) -> Tuple[str, List[Dict[str, Any]], Type[BaseDataModel]]:
+        """Build the query, parameters and model class for a data_type lookup."""
+        query = "SELECT * FROM c WHERE c.session_id=@session_id AND c.user_id=@user_id AND c.data_type=@data_type ORDER BY c._ts ASC"
+        parameters = [
+            {"name": "@session_id", "value": self.session_id},
+            {"name": "@data_type", "value": data_type},
+            {"name": "@user_id", "value": self.user_id},
+        ]
+        model_class = self.MODEL_CLASS_MAPPING.get(data_type, BaseDataModel)
+        return query, parameters, model_class
+
     async def get_data_by_type(self, data_type: str) -> List[BaseDataModel]:
         """Query the Cosmos DB for documents with the matching data_type, session_id and user_id."""
         await self.ensure_initialized()
         if self._container is None:
             return []
 
-        model_class = self.MODEL_CLASS_MAPPING.get(data_type, BaseDataModel)
         try:
-            query = "SELECT * FROM c WHERE c.session_id=@session_id AND c.user_id=@user_id AND c.data_type=@data_type ORDER BY c._ts ASC"
-            parameters = [
-                {"name": "@session_id", "value": self.session_id},
-                {"name": "@data_type", "value": data_type},
-                {"name": "@user_id", "value": self.user_id},
-            ]
-            return await self.query_items(query, parameters, model_class)
+            query, parameters, model_class = self._data_by_type_query(data_type)
+            return await self.query_items(
+                query, parameters, model_class, partition_key=self.session_id
+            )
         except Exception as e:
             logging.exception(f"Failed to query data by type from Cosmos DB: {e}")
             return []
 
+    def iter_data_by_type(
+        self, data_type: str, page_size: Optional[int] = None
+    ) -> AsyncIterator[BaseDataModel]:
+        """Stream documents of a data_type for this session and user."""
+        query, parameters, model_class = self._data_by_type_query(data_type)
+        return self.iter_items(
+            query,
+            parameters,
+            model_class,
+            partition_key=self.session_id,
+            page_size=page_size,
+        )
+
+    async def get_data_by_type_page(
+        self, data_type: str, limit: int, continuation: Optional[str] = None
+    ) -> Tuple[List[BaseDataModel], Optional[str]]:
+        """Fetch one page of documents of a data_type for this session and user."""
+        query, parameters, model_class = self._data_by_type_query(data_type)
+        return await self.query_page(
+            query,
+            parameters,
+            model_class,
+            partition_key=self.session_id,
+            page_size=limit,
+            continuation=continuation,
+        )
+
     async def delete_item(self, item_id: str, partition_key: str) -> None:
         """Delete an item from Cosmos DB."""
         await self.ensure_initialized()
+        plan_cache.invalidate_session(self.user_id, partition_key)
         try:
             await self._container.delete_item(item=item_id, partition_key=partition_key)
         except Exception as e:
             logging.exception(f"Failed to delete item from Cosmos DB: {e}")
 
     async def delete_items_by_query(
-        self, query: str, parameters: List[Dict[str, Any]]
-    ) -> None:
-        """Delete items matching the query."""
+        self,
+        query: str,
+        parameters: List[Dict[str, Any]],
+        job: Optional[BulkDeleteJob] = None,
+    ) -> int:
+        """Delete items matching the query.
+
+        The query must return ``id`` and ``session_id``. Matching documents are
+        deleted in per-partition transactional batches with bounded concurrency.
+
+        Args:
+            query: The SQL query selecting the documents to delete
+            parameters: The query parameters
+            job: Optional job whose progress counters are updated
+
+        Returns:
+            The number of deleted documents
+        """
         await self.ensure_initialized()
+        await self._flush_pending_writes()
+        plan_cache.invalidate_user(self.user_id)
+        message_buffers.invalidate_user(self.user_id)
         try:
-            items = self._container.query_items(query=query, parameters=parameters)
-            async for item in items:
-                item_id = item["id"]
-                partition_key = item.get("session_id", None)
-                await self._container.delete_item(
-                    item=item_id, partition_key=partition_key
-                )
+            return await self._bulk_delete(query, parameters, job)
         except Exception as e:
             logging.exception(f"Failed to delete items from Cosmos DB: {e}")
+            return 0
+
+    async def _bulk_delete(
+        self,
+        query: str,
+        parameters: List[Dict[str, Any]],
+        job: Optional[BulkDeleteJob] = None,
+    ) -> int:
+        """Stream the ids matched by a query into the bulk delete engine."""
+        documents = self._container.query_items(query=query, parameters=parameters)
+        return await bulk_delete_documents(
+            self._container,
+            documents,
+            max_concurrency=config.COSMOSDB_BULK_DELETE_CONCURRENCY,
+            job=job,
+        )
+
+    async def delete_items_of_types(
+        self, data_types: List[str], job: Optional[BulkDeleteJob] = None
+    ) -> int:
+        """Delete every document of the given data types for this user.
+
+        Uses one query for all data types. Unlike ``delete_items_by_query`` errors
+        are raised, so a background job can report them.
+
+        Args:
+            data_types: The data types to delete
+            job: Optional job whose progress counters are updated
+
+        Returns:
+            The number of deleted documents
+        """
+        await self.ensure_initialized()
+        await self._flush_pending_writes()
+        plan_cache.invalidate_user(self.user_id)
+        message_buffers.invalidate_user(self.user_id)
+
+        query = "SELECT c.id, c.session_id FROM c WHERE c.user_id=@user_id AND ARRAY_CONTAINS(@data_types, c.data_type)"
+        parameters = [
+            {"name": "@user_id", "value": self.user_id},
+            {"name": "@data_types", "value": data_types},
+        ]
+        return await self._bulk_delete(query, parameters, job)
 
     async def delete_all_messages(self, data_type) -> None:
         """Delete all messages of a specific type from Cosmos DB."""
@@ -472,46 +1177,55 @@ class CosmosMemoryContext(MemoryStoreBase):
     async def get_all_messages(self) -> List[Dict[str, Any]]:
         """Retrieve all messages from Cosmos DB."""
         await self.ensure_initialized()
+        await self._flush_pending_writes()
         if self._container is None:
             return []
 
         try:
-            messages_list = []
-            query = "SELECT * FROM c WHERE c.user_id=@user_id OFFSET 0 LIMIT @limit"
-            parameters = [
-                {"name": "@user_id", "value": self.user_id},
-                {"name": "@limit", "value": 100},
-            ]
-            items = self._container.query_items(query=query, parameters=parameters)
-            async for item in items:
-                messages_list.append(item)
-            return messages_list
+            return [item async for item in self.iter_all_messages(max_items=100)]
         except Exception as e:
             logging.exception(f"Failed to get messages from Cosmos DB: {e}")
             return []
 
+    def iter_all_messages(
+        self, page_size: Optional[int] = None, max_items: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream every raw document of this user, across sessions."""
+        query = "SELECT * FROM c WHERE c.user_id=@user_id"
+        parameters = [{"name": "@user_id", "value": self.user_id}]
+        return self.iter_items(
+            query, parameters, page_size=page_size, max_items=max_items
+        )
+
+    async def get_all_messages_page(
+        self, limit: int, continuation: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Fetch one page of raw documents of this user, across sessions."""
+        query = "SELECT * FROM c WHERE c.user_id=@user_id"
+        parameters = [{"name": "@user_id", "value": self.user_id}]
+        return await self.query_page(
+            query, parameters, page_size=limit, continuation=continuation
+        )
+
     async def get_all_items(self) -> List[Dict[str, Any]]:
         """Retrieve all items from Cosmos DB."""
         return await self.get_all_messages()
 
-    def close(self) -> None:
-        """Close the Cosmos DB client."""
-        # No-op or implement synchronous cleanup if required
-        return
-
     async def __aenter__(self):
         return self
 
     async def __aexit__(self, exc_type, exc, tb):
-        # Call synchronous close
-        self.close()
+        await self.close()
 
     def __del__(self):
-        try:
-            # Synchronous close
-            self.close()
-        except Exception as e:
-            logging.warning(f"Error closing CosmosMemoryContext in __del__: {e}")
+        # Buffered writes can only be flushed by awaiting close()
+        write_buffer = getattr(self, "_write_buffer", None)
+        if write_buffer is not None and write_buffer.has_pending():
+            logging.warning(
+                f"CosmosMemoryContext of session {self.session_id} was dropped "
+                f"with {len(write_buffer)} unflushed writes"
+            )
+        self._container = None
 
     async def create_collection(self, collection_name: str) -> None:
         """Create a new collection. For CosmosDB, we don't need to create new collections
@@ -531,7 +1245,9 @@ class CosmosMemoryContext(MemoryStoreBase):
             """
             parameters = [{"name": "@session_id", "value": self.session_id}]
 
-            items = self._container.query_items(query=query, parameters=parameters)
+            items = self._container.query_items(
+                query=query, parameters=parameters, partition_key=self.session_id
+            )
             collections = []
             async for item in items:
                 if "collection" in item and item["collection"] not in collections:
@@ -561,33 +1277,93 @@ class CosmosMemoryContext(MemoryStoreBase):
                 {"name": "@session_id", "value": self.session_id},
             ]
 
-            items = self._container.query_items(query=query, parameters=parameters)
+            items = self._container.query_items(
+                query=query, parameters=parameters, partition_key=self.session_id
+            )
             async for item in items:
                 await self._container.delete_item(
                     item=item["id"], partition_key=item["session_id"]
                 )
         except Exception as e:
             logging.exception(f"Failed to delete collection from Cosmos DB: {e}")
-
-    async def upsert_memory_record(self, collection: str, record: MemoryRecord) -> str:
-        """Store a memory record."""
-        memory_dict = {
+        finally:
+            vector_indexes.invalidate(self._vector_index_key(collection_name))
+
+    def _memory_record_to_document(
+        self, collection: str, record: MemoryRecord
+    ) -> Dict[str, Any]:
+        """Serialize a memory record into a Cosmos DB document."""
+        # MemoryRecord only exposes some of its fields as properties
+        return {
             "id": record.id or str(uuid.uuid4()),
             "session_id": self.session_id,
             "user_id": self.user_id,
             "data_type": "memory",
             "collection": collection,
+            "is_reference": record._is_reference,
             "text": record.text,
             "description": record.description,
-            "external_source_name": record.external_source_name,
+            "external_source_name": record._external_source_name,
             "additional_metadata": record.additional_metadata,
-            "embedding": (
-                record.embedding.tolist() if record.embedding is not None else None
+            "embedding": encode_embedding(
+                record.embedding, self._embedding_encoding()
             ),
-            "key": record.key,
+            "key": record._key,
         }
 
+    @staticmethod
+    def _embedding_encoding() -> str:
+        """Return the storage encoding for embeddings of new memory records."""
+        if config.COSMOSDB_VECTOR_SEARCH:
+            # VectorDistance needs plain float arrays
+            return "json"
+        if config.MEMORY_EMBEDDING_ENCODING not in EMBEDDING_ENCODINGS:
+            logging.warning(
+                f"Unknown MEMORY_EMBEDDING_ENCODING {config.MEMORY_EMBEDDING_ENCODING}, using float32"
+            )
+            return "float32"
+        return config.MEMORY_EMBEDDING_ENCODING
+
+    @staticmethod
+    def _memory_record_from_item(
+        item: Dict[str, Any], with_embedding: bool = False
+    ) -> MemoryRecord:
+        """Build a memory record from a Cosmos DB document."""
+        embedding = decode_embedding(item.get("embedding")) if with_embedding else None
+
+        return MemoryRecord(
+            is_reference=item.get("is_reference", False),
+            external_source_name=item.get("external_source_name", ""),
+            id=item["id"],
+            description=item.get("description", ""),
+            text=item.get("text", ""),
+            additional_metadata=item.get("additional_metadata", ""),
+            embedding=embedding,
+            key=item.get("key", ""),
+        )
+
+    def _vector_index_key(self, collection: str) -> Tuple[str, str, str]:
+        """Return the vector index registry key of a collection."""
+        return (self.user_id, self.session_id, collection)
+
+    async def upsert_memory_record(self, collection: str, record: MemoryRecord) -> str:
+        """Store a memory record."""
+        await self.ensure_initialized()
+        memory_dict = self._memory_record_to_document(collection, record)
+
         await self._container.upsert_item(body=memory_dict)
+
+        # Keep a loaded vector index in sync with the write
+        index = vector_indexes.peek(self._vector_index_key(collection))
+        if index is not None:
+            if record.embedding is not None:
+                index.upsert(
+                    memory_dict["id"],
+                    record.embedding,
+                    self._memory_record_from_item(memory_dict),
+                )
+            else:
+                index.remove(memory_dict["id"])
         return memory_dict["id"]
 
     async def get_memory_record(
@@ -605,21 +1381,11 @@ class CosmosMemoryContext(MemoryStoreBase):
             {"name": "@data_type", "value": "memory"},
         ]
 
-        items = self._container.query_items(query=query, parameters=parameters)
+        items = self._container.query_items(
+            query=query, parameters=parameters, partition_key=self.session_id
+        )
         async for item in items:
-            return MemoryRecord(
-                id=item["id"],
-                text=item["text"],
-                description=item["description"],
-                external_source_name=item["external_source_name"],
-                additional_metadata=item["additional_metadata"],
-                embedding=(
-                    np.array(item["embedding"])
-                    if with_embedding and "embedding" in item
-                    else None
-                ),
-                key=item["key"],
-            )
+            return self._memory_record_from_item(item, with_embedding)
         return None
 
     async def remove_memory_record(self, collection: str, key: str) -> None:
@@ -635,11 +1401,16 @@ class CosmosMemoryContext(MemoryStoreBase):
             {"name": "@data_type", "value": "memory"},
         ]
 
-        items = self._container.query_items(query=query, parameters=parameters)
+        items = self._container.query_items(
+            query=query, parameters=parameters, partition_key=self.session_id
+        )
+        index = vector_indexes.peek(self._vector_index_key(collection))
         async for item in items:
             await self._container.delete_item(
                 item=item["id"], partition_key=self.session_id
             )
+            if index is not None:
+                index.remove(item["id"])
 
     async def upsert_async(self, collection_name: str, record: Dict[str, Any]) -> str:
         """Helper method to insert documents directly."""
@@ -680,23 +1451,12 @@ class CosmosMemoryContext(MemoryStoreBase):
                 {"name": "@limit", "value": limit},
             ]
 
-            items = self._container.query_items(query=query, parameters=parameters)
+            items = self._container.query_items(
+                query=query, parameters=parameters, partition_key=self.session_id
+            )
             records = []
             async for item in items:
-                embedding = None
-                if with_embeddings and "embedding" in item and item["embedding"]:
-                    embedding = np.array(item["embedding"])
-
-                record = MemoryRecord(
-                    id=item["id"],
-                    key=item.get("key", ""),
-                    text=item.get("text", ""),
-                    embedding=embedding,
-                    description=item.get("description", ""),
-                    additional_metadata=item.get("additional_metadata", ""),
-                    external_source_name=item.get("external_source_name", ""),
-                )
-                records.append(record)
+                records.append(self._memory_record_from_item(item, with_embeddings))
             return records
         except Exception as e:
             logging.exception(f"Failed to get memory records from Cosmos DB: {e}")
@@ -709,12 +1469,117 @@ class CosmosMemoryContext(MemoryStoreBase):
     async def upsert_batch(
         self, collection_name: str, records: List[MemoryRecord]
     ) -> List[str]:
-        """Upsert a batch of memory records into the store."""
-        result_ids = []
-        for record in records:
-            record_id = await self.upsert_memory_record(collection_name, record)
-            result_ids.append(record_id)
-        return result_ids
+        """Upsert a batch of memory records into the store.
+
+        Records are written with transactional batches of up to 100 operations,
+        several batches in flight at once, instead of one request per record.
+
+        Raises:
+            BatchWriteError: If some batches failed; it lists the record IDs that
+                were and were not written
+        """
+        await self.ensure_initialized()
+        documents = [
+            self._memory_record_to_document(collection_name, record)
+            for record in records
+        ]
+        # A transactional batch may not touch the same id twice; the last write wins
+        unique_documents = {document["id"]: document for document in documents}
+
+        try:
+            await self._execute_batches(
+                self.session_id,
+                [("upsert", (document,)) for document in unique_documents.values()],
+            )
+        except BatchWriteError as e:
+            logging.exception(
+                f"Failed to upsert memory records to Cosmos DB: {e}; "
+                f"not written: {e.failed_ids}"
+            )
+            vector_indexes.invalidate(self._vector_index_key(collection_name))
+            raise
+        except Exception as e:
+            logging.exception(f"Failed to upsert memory records to Cosmos DB: {e}")
+            vector_indexes.invalidate(self._vector_index_key(collection_name))
+            raise
+
+        index = vector_indexes.peek(self._vector_index_key(collection_name))
+        if index is not None:
+            for document, record in zip(documents, records):
+                if record.embedding is not None:
+                    index.upsert(
+                        document["id"],
+                        record.embedding,
+                        self._memory_record_from_item(document),
+                    )
+                else:
+                    index.remove(document["id"])
+        return [document["id"] for document in documents]
+
+    async def _execute_batches(
+        self, partition_key: str, operations: List[Tuple[str, Tuple[Any, ...]]]
+    ) -> None:
+        """Run operations of one partition as concurrent transactional batches.
+
+        Each chunk of up to 100 operations is atomic on its own; at most
+        COSMOSDB_BATCH_CONCURRENCY chunks are in flight at once. Every chunk is
+        attempted even if another fails.
+
+        Raises:
+            BatchWriteError: If any chunk failed, with the IDs that were and were
+                not written; the first chunk error is its cause
+        """
+        semaphore = asyncio.Semaphore(max(1, config.COSMOSDB_BATCH_CONCURRENCY))
+        chunks = [
+            operations[start : start + MAX_BATCH_OPERATIONS]
+            for start in range(0, len(operations), MAX_BATCH_OPERATIONS)
+        ]
+
+        async def execute(chunk: List[Tuple[str, Tuple[Any, ...]]]) -> None:
+            async with semaphore:
+                await self._container.execute_item_batch(
+                    batch_operations=chunk, partition_key=partition_key
+                )
+
+        results = await asyncio.gather(
+            *(execute(chunk) for chunk in chunks), return_exceptions=True
+        )
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if not errors:
+            return
+
+        def operation_id(operation: Tuple[str, Tuple[Any, ...]]) -> str:
+            target = operation[1][0]
+            return target["id"] if isinstance(target, dict) else str(target)
+
+        failed_ids: List[str] = []
+        written_ids: List[str] = []
+        for chunk, result in zip(chunks, results):
+            ids = failed_ids if isinstance(result, BaseException) else written_ids
+            ids.extend(operation_id(operation) for operation in chunk)
+        raise BatchWriteError(
+            f"{len(errors)} of {len(chunks)} batches failed; "
+            f"{len(failed_ids)} of {len(operations)} operations were not written",
+            failed_ids,
+            written_ids,
+        ) from errors[0]
+
+    def _memory_keys_query(
+        self, collection: str, keys: List[str], fields: str = "*"
+    ) -> Tuple[str, List[Dict[str, Any]]]:
+        """Build a query matching the memory records of a collection by key."""
+        query = f"""
+            SELECT {fields} FROM c
+            WHERE c.collection=@collection AND ARRAY_CONTAINS(@keys, c.key)
+            AND c.session_id=@session_id AND c.data_type=@data_type
+        """
+        parameters = [
+            {"name": "@collection", "value": collection},
+            {"name": "@keys", "value": keys},
+            {"name": "@session_id", "value": self.session_id},
+            {"name": "@data_type", "value": "memory"},
+        ]
+        return query, parameters
 
     async def get(
         self, collection_name: str, key: str, with_embedding: bool = False
@@ -725,22 +1590,72 @@ class CosmosMemoryContext(MemoryStoreBase):
     async def get_batch(
         self, collection_name: str, keys: List[str], with_embeddings: bool = False
     ) -> List[MemoryRecord]:
-        """Get a batch of memory records from the store."""
-        results = []
-        for key in keys:
-            record = await self.get_memory_record(collection_name, key, with_embeddings)
-            if record:
-                results.append(record)
-        return results
+        """Get a batch of memory records from the store.
+
+        All keys are looked up with a single partition-scoped query; records are
+        returned in the order of ``keys`` and missing keys are skipped.
+        """
+        if not keys:
+            return []
+        await self.ensure_initialized()
+
+        query, parameters = self._memory_keys_query(collection_name, list(keys))
+        records: Dict[str, MemoryRecord] = {}
+        try:
+            async for item in self._container.query_items(
+                query=query, parameters=parameters, partition_key=self.session_id
+            ):
+                records[item.get("key")] = self._memory_record_from_item(
+                    item, with_embeddings
+                )
+        except Exception as e:
+            logging.exception(f"Failed to get memory records from Cosmos DB: {e}")
+            raise
+        return [records[key] for key in keys if key in records]
 
     async def remove(self, collection_name: str, key: str) -> None:
         """Remove a memory record from the store."""
         await self.remove_memory_record(collection_name, key)
 
     async def remove_batch(self, collection_name: str, keys: List[str]) -> None:
-        """Remove a batch of memory records from the store."""
-        for key in keys:
-            await self.remove_memory_record(collection_name, key)
+        """Remove a batch of memory records from the store.
+
+        The ids of all keys are found with one query and deleted with
+        transactional batches through the bulk delete engine.
+        """
+        if not keys:
+            return
+        await self.ensure_initialized()
+
+        query, parameters = self._memory_keys_query(
+            collection_name, list(keys), fields="c.id, c.session_id"
+        )
+        try:
+            documents = [
+                item
+                async for item in self._container.query_items(
+                    query=query, parameters=parameters, partition_key=self.session_id
+                )
+            ]
+
+            async def stream() -> AsyncIterator[Dict[str, Any]]:
+                for document in documents:
+                    yield document
+
+            await bulk_delete_documents(
+                self._container,
+                stream(),
+                max_concurrency=config.COSMOSDB_BATCH_CONCURRENCY,
+            )
+        except Exception as e:
+            logging.exception(f"Failed to remove memory records from Cosmos DB: {e}")
+            vector_indexes.invalidate(self._vector_index_key(collection_name))
+            raise
+
+        index = vector_indexes.peek(self._vector_index_key(collection_name))
+        if index is not None:
+            for document in documents:
+                index.remove(document["id"])
 
     async def get_nearest_match(
         self,
@@ -764,28 +1679,164 @@ class CosmosMemoryContext(MemoryStoreBase):
         min_relevance_score: float = 0.0,
         with_embeddings: bool = False,
     ) -> List[Tuple[MemoryRecord, float]]:
-        """Get the nearest matches to the given embedding."""
+        """Get the nearest matches to the given embedding.
+
+        Every record of the collection is searched, not only the most recent ones.
+        With COSMOSDB_VECTOR_SEARCH enabled the search runs in Cosmos DB with
+        VectorDistance (the container needs a vector embedding policy on
+        /embedding); otherwise, or if that query fails, an in-process vector index
+        of the collection is used.
+        """
         await self.ensure_initialized()
 
+        if config.COSMOSDB_VECTOR_SEARCH:
+            try:
+                return await self._vector_distance_search(
+                    collection_name,
+                    embedding,
+                    limit,
+                    min_relevance_score,
+                    with_embeddings,
+                )
+            except Exception as e:
+                logging.warning(
+                    f"VectorDistance query failed, using the local vector index: {e}"
+                )
+
         try:
-            records = await self.get_memory_records(
-                collection_name, limit=100, with_embeddings=True
+            index = await vector_indexes.get_or_build(
+                self._vector_index_key(collection_name),
+                lambda: self._load_vector_index_entries(collection_name),
             )
-
             results = []
-            for record in records:
-                if record.embedding is not None:
-                    similarity = np.dot(embedding, record.embedding) / (
-                        np.linalg.norm(embedding) * np.linalg.norm(record.embedding)
+            for item_id, score in index.search(embedding, limit, min_relevance_score):
+                record = index.get_payload(item_id)
+                if with_embeddings:
+                    record = MemoryRecord(
+                        is_reference=record._is_reference,
+                        external_source_name=record._external_source_name,
+                        id=record.id,
+                        description=record.description,
+                        text=record.text,
+                        additional_metadata=record.additional_metadata,
+                        embedding=index.get_vector(item_id),
+                        key=record._key,
                     )
-
-                    if similarity >= min_relevance_score:
-                        if not with_embeddings:
-                            record.embedding = None
-                        results.append((record, float(similarity)))
-
-            results.sort(key=lambda x: x[1], reverse=True)
-            return results[:limit]
+                results.append((record, score))
+            return results
         except Exception as e:
             logging.exception(f"Failed to get nearest matches from Cosmos DB: {e}")
             return []
+
+    async def _load_vector_index_entries(
+        self, collection_name: str
+    ) -> List[Tuple[str, np.ndarray, MemoryRecord]]:
+        """Read every embedded record of a collection for the vector index."""
+        query = "SELECT * FROM c WHERE c.collection=@collection AND c.data_type=@data_type AND c.session_id=@session_id"
+        parameters = [
+            {"name": "@collection", "value": collection_name},
+            {"name": "@data_type", "value": "memory"},
+            {"name": "@session_id", "value": self.session_id},
+        ]
+        entries = []
+        async for item in self.iter_items(
+            query, parameters, partition_key=self.session_id
+        ):
+            embedding = decode_embedding(item.get("embedding"))
+            if embedding is not None:
+                entries.append(
+                    (item["id"], embedding, self._memory_record_from_item(item))
+                )
+        return entries
+
+    async def migrate_embeddings(self, encoding: Optional[str] = None) -> int:
+        """Re-encode the stored embeddings of all of this user's memory records.
+
+        Records already in the target encoding are left untouched. Rewrites are
+        committed in per-partition transactional batches.
+
+        Args:
+            encoding: Target encoding; defaults to the configured one
+
+        Returns:
+            The number of migrated records
+        """
+        await self.ensure_initialized()
+        encoding = encoding or self._embedding_encoding()
+        if encoding not in EMBEDDING_ENCODINGS:
+            raise ValueError(f"Unsupported embedding encoding: {encoding}")
+
+        query = "SELECT * FROM c WHERE c.user_id=@user_id AND c.data_type=@data_type AND IS_DEFINED(c.embedding)"
+        parameters = [
+            {"name": "@user_id", "value": self.user_id},
+            {"name": "@data_type", "value": "memory"},
+        ]
+        pending: Dict[str, List[Dict[str, Any]]] = {}
+        migrated = 0
+
+        async def write(partition_key: str, documents: List[Dict[str, Any]]) -> None:
+            await self._container.execute_item_batch(
+                batch_operations=[("upsert", (document,)) for document in documents],
+                partition_key=partition_key,
+            )
+
+        try:
+            async for item in self._container.query_items(
+                query=query, parameters=parameters
+            ):
+                if is_encoded_as(item.get("embedding"), encoding):
+                    continue
+                document = {k: v for k, v in item.items() if not k.startswith("_")}
+                document["embedding"] = encode_embedding(
+                    decode_embedding(item["embedding"]), encoding
+                )
+                partition_key = document["session_id"]
+                documents = pending.setdefault(partition_key, [])
+                documents.append(document)
+                if len(documents) >= MAX_BATCH_OPERATIONS:
+                    await write(partition_key, pending.pop(partition_key))
+                    migrated += len(documents)
+
+            for partition_key, documents in pending.items():
+                await write(partition_key, documents)
+                migrated += len(documents)
+        except Exception as e:
+            logging.exception(f"Failed to migrate memory embeddings: {e}")
+            raise
+
+        logging.info(f"Migrated {migrated} memory embeddings to {encoding}")
+        return migrated
+
+    async def _vector_distance_search(
+        self,
+        collection_name: str,
+        embedding: np.ndarray,
+        limit: int,
+        min_relevance_score: float,
+        with_embeddings: bool,
+    ) -> List[Tuple[MemoryRecord, float]]:
+        """Run a top-k cosine similarity search in Cosmos DB."""
+        query = """
+            SELECT TOP @limit c.id, c.is_reference, c.text, c.description,
+                c.external_source_name, c.additional_metadata, c.key, c.embedding,
+                VectorDistance(c.embedding, @embedding) AS score
+            FROM c
+            WHERE c.collection=@collection AND c.data_type=@data_type AND c.session_id=@session_id
+            ORDER BY VectorDistance(c.embedding, @embedding)
+        """
+        parameters = [
+            {"name": "@limit", "value": limit},
+            {"name": "@embedding", "value": np.asarray(embedding).tolist()},
+            {"name": "@collection", "value": collection_name},
+            {"name": "@data_type", "value": "memory"},
+            {"name": "@session_id", "value": self.session_id},
+        ]
+        items = self._container.query_items(
+            query=query, parameters=parameters, partition_key=self.session_id
+        )
+        results = []
+        async for item in items:
+            if item["score"] >= min_relevance_score:
+                record = self._memory_record_from_item(item, with_embeddings)
+                results.append((record, float(item["score"])))
+        return results
@@ -0,0 +1,94 @@
+# embedding_codec.py
+
+import base64
+import logging
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+
+# Supported storage encodings for memory record embeddings
+EMBEDDING_ENCODINGS = ("json", "float32", "int8")
+
+
+def encode_embedding(
+    embedding: Optional[np.ndarray], encoding: str = "float32"
+) -> Union[None, List[float], Dict[str, Any]]:
+    """Encode an embedding for storage in a Cosmos DB document.
+
+    Args:
+        embedding: The vector to encode
+        encoding: ``json`` stores a plain array of floats (needed for Cosmos DB
+            vector search), ``float32`` stores base64 little-endian float32 bytes
+            (about 4x smaller), and ``int8`` stores base64 bytes quantized with a
+            per-vector scale (about 16x smaller, slightly lossy)
+
+    Returns:
+        The JSON-serializable value to store, or None for a missing embedding
+
+    Raises:
+        ValueError: If the encoding is not supported
+    """
+    if embedding is None:
+        return None
+
+    vector = np.asarray(embedding, dtype=np.float32).ravel()
+    if encoding == "json":
+        return vector.tolist()
+    if encoding == "float32":
+        data = vector.astype("<f4").tobytes()
+        return {
+            "encoding": "float32",
+            "dims": int(vector.shape[0]),
+            "data": base64.b64encode(data).decode("ascii"),
+        }
+    if encoding == "int8":
+        peak = float(np.max(np.abs(vector))) if vector.size else 0.0
+        scale = peak / 127.0 if peak > 0 else 1.0
+        quantized = np.clip(np.rint(vector / scale), -127, 127).astype(np.int8)
+        return {
+            "encoding": "int8",
+            "dims": int(vector.shape[0]),
+            "scale": scale,
+            "data": base64.b64encode(quantized.tobytes()).decode("ascii"),
+        }
+    raise ValueError(f"Unsupported embedding encoding: {encoding}")
+
+
+def decode_embedding(value: Any) -> Optional[np.ndarray]:
+    """Decode a stored embedding into a contiguous float32 array.
+
+    Accepts every format written by ``encode_embedding``, including the plain
+    JSON arrays of records written before encodings existed.
+    """
+    if value is None:
+        return None
+    if isinstance(value, list):
+        return np.asarray(value, dtype=np.float32) if value else None
+    if not isinstance(value, dict):
+        logging.warning(f"Ignoring embedding of unexpected type {type(value)}")
+        return None
+
+    encoding = value.get("encoding")
+    data = base64.b64decode(value["data"])
+    if encoding == "float32":
+        vector = np.frombuffer(data, dtype="<f4").astype(np.float32)
+    elif encoding == "int8":
+        vector = np.frombuffer(data, dtype=np.int8).astype(np.float32)
+        vector *= np.float32(value["scale"])
+    else:
+        logging.warning(f"Ignoring embedding with unknown encoding {encoding}")
+        return None
+
+    if vector.shape[0] != value.get("dims", vector.shape[0]):
+        logging.warning("Ignoring embedding whose size does not match its dims")
+        return None
+    return np.ascontiguousarray(vector)
+
+
+def is_encoded_as(value: Any, encoding: str) -> bool:
+    """Return True if a stored embedding already uses the given encoding."""
+    if encoding == "json":
+        return value is None or isinstance(value, list)
+    return value is None or (
+        isinstance(value, dict) and value.get("encoding") == encoding
+    )
@@ -0,0 +1,140 @@
+# event_bus.py
+
+import asyncio
+import json
+import logging
+from typing import Any, Dict, Optional, Set, Tuple
+
+from app_config import config
+
+# Event telling a subscriber that it missed events and should reload its view
+RESYNC_EVENT = "resync"
+
+
+class Subscription:
+    """Queue of events delivered to one subscriber of a session."""
+
+    def __init__(self, user_id: str, session_id: str, max_events: int) -> None:
+        self.user_id = user_id
+        self.session_id = session_id
+        self._events: asyncio.Queue = asyncio.Queue(maxsize=max(1, max_events))
+        self.dropped = 0
+
+    def deliver(self, event: Dict[str, Any]) -> None:
+        """Queue an event without blocking the publisher.
+
+        A subscriber that falls behind loses its backlog and is sent a resync
+        event instead, so a slow browser never holds up agent execution.
+        """
+        try:
+            self._events.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped += self._events.qsize()
+            while not self._events.empty():
+                self._events.get_nowait()
+            self._events.put_nowait({"type": RESYNC_EVENT, "data": {}})
+
+    async def next(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Return the next event, or None if none arrived within ``timeout``."""
+        try:
+            return await asyncio.wait_for(self._events.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class SessionEventBus:
+    """In-process publish/subscribe of plan, step and message changes per session.
+
+    Memory contexts publish the documents they write; the event stream endpoint
+    subscribes for a session so browsers are told about changes instead of
+    re-querying Cosmos DB. Events only reach subscribers in the same process.
+    """
+
+    def __init__(self, max_events_per_subscriber: int = 256) -> None:
+        """Initialize the bus.
+
+        Args:
+            max_events_per_subscriber: Events buffered for a subscriber before its
+                backlog is replaced by a resync event
+        """
+        self._max_events = max_events_per_subscriber
+        self._subscriptions: Dict[Tuple[str, str], Set[Subscription]] = {}
+        self.published = 0
+        self.delivered = 0
+
+    def subscribe(self, user_id: str, session_id: str) -> Subscription:
+        """Start receiving the events of a user's session."""
+        subscription = Subscription(user_id, session_id, self._max_events)
+        self._subscriptions.setdefault((user_id, session_id), set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Stop delivering events to a subscription."""
+        key = (subscription.user_id, subscription.session_id)
+        subscriptions = self._subscriptions.get(key)
+        if subscriptions is None:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self._subscriptions[key]
+
+    def publish(
+        self, user_id: str, session_id: str, event_type: str, data: Dict[str, Any]
+    ) -> int:
+        """Deliver an event to every subscriber of a user's session.
+
+        Returns:
+            The number of subscribers the event was delivered to
+        """
+        self.published += 1
+        subscriptions = self._subscriptions.get((user_id, session_id))
+        if not subscriptions:
+            return 0
+        event = {"type": event_type, "data": data}
+        for subscription in list(subscriptions):
+            subscription.deliver(event)
+        self.delivered += len(subscriptions)
+        return len(subscriptions)
+
+    def publish_item(self, item: Any) -> int:
+        """Publish a written plan, step or agent message as an event.
+
+        The event type is the item's ``data_type``; publishing never raises, so a
+        failure here cannot fail the write that triggered it.
+        """
+        try:
+            user_id = getattr(item, "user_id", None)
+            session_id = getattr(item, "session_id", None)
+            if not user_id or not session_id:
+                return 0
+            if not self._subscriptions.get((user_id, session_id)):
+                # Nobody listens; skip serializing the item
+                self.published += 1
+                return 0
+            data = json.loads(item.model_dump_json())
+            return self.publish(user_id, session_id, item.data_type, data)
+        except Exception as e:
+            logging.warning(f"Failed to publish {type(item).__name__} event: {e}")
+            return 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return subscriber counts and event counters."""
+        subscriptions = [s for group in self._subscriptions.values() for s in group]
+        return {
+            "sessions": len(self._subscriptions),
+            "subscribers": len(subscriptions),
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": sum(s.dropped for s in subscriptions),
+        }
+
+
+def format_sse(event: Dict[str, Any]) -> str:
+    """Return an event as a Server-Sent Events message."""
+    return f"event: {event['type']}\ndata: {json.dumps(event['data'], default=str)}\n\n"
+
+
+# Process-wide bus shared by every memory context and event stream
+session_events = SessionEventBus(
+    max_events_per_subscriber=config.EVENT_STREAM_QUEUE_SIZE
+)
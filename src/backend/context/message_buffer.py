@@ -0,0 +1,135 @@
+# message_buffer.py
+
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional
+
+from semantic_kernel.contents import ChatHistory, ChatMessageContent
+
+from cache_utils import LRUTTLCache
+
+# Import the AppConfig instance
+from app_config import config
+
+
+class SessionMessageBuffer:
+    """Bounded ring buffer of the most recent chat messages of a session.
+
+    Appends are O(1); once ``max_messages`` is reached the oldest message is
+    dropped. A ``ChatHistory`` view is maintained incrementally: appends are added
+    to it directly and dropped messages are trimmed from its front in one step on
+    the next read, or by the append that lets it grow to twice the capacity, so it
+    stays bounded without being rebuilt message by message.
+    """
+
+    def __init__(self, max_messages: int = 100) -> None:
+        """Initialize an empty, unseeded buffer.
+
+        Args:
+            max_messages: Maximum number of messages kept
+        """
+        self._messages: "deque[ChatMessageContent]" = deque(
+            maxlen=max(1, max_messages)
+        )
+        self._history = ChatHistory()
+        self._pending_trim = 0
+        self.seeded = False
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    @property
+    def max_messages(self) -> int:
+        """Return the buffer capacity."""
+        return self._messages.maxlen
+
+    def seed(self, messages: Iterable[ChatMessageContent]) -> None:
+        """Replace the buffer contents with messages loaded from the store."""
+        self._messages.clear()
+        self._messages.extend(messages)
+        self._history = ChatHistory(messages=list(self._messages))
+        self._pending_trim = 0
+        self.seeded = True
+
+    def append(self, message: ChatMessageContent) -> None:
+        """Append a message, dropping the oldest one if the buffer is full."""
+        if len(self._messages) == self._messages.maxlen:
+            self._pending_trim += 1
+        self._messages.append(message)
+        self._history.messages.append(message)
+        if self._pending_trim >= self._messages.maxlen:
+            self._trim_history()
+
+    def messages(self) -> List[ChatMessageContent]:
+        """Return the buffered messages, oldest first."""
+        return list(self._messages)
+
+    def _trim_history(self) -> None:
+        """Drop the messages that left the buffer from the front of the history."""
+        if self._pending_trim:
+            del self._history.messages[: self._pending_trim]
+            self._pending_trim = 0
+
+    def chat_history(self) -> ChatHistory:
+        """Return a ChatHistory of the buffered messages.
+
+        The returned object is a shallow copy, so callers may add messages to it
+        without changing the buffer.
+        """
+        self._trim_history()
+        return self._history.model_copy(
+            update={"messages": list(self._history.messages)}
+        )
+
+
+class MessageBufferRegistry:
+    """Process-wide message buffers keyed by (user_id, session_id).
+
+    Buffers outlive the per-request memory contexts, so a session's recent
+    messages are loaded from Cosmos DB once and then reused. Idle buffers expire
+    after a TTL, which also bounds staleness when other processes write messages.
+    """
+
+    def __init__(self, max_sessions: int = 1024, ttl_seconds: float = 1800) -> None:
+        """Initialize the registry.
+
+        Args:
+            max_sessions: Maximum number of session buffers kept
+            ttl_seconds: Seconds a buffer is kept after it was created
+        """
+        self._buffers = LRUTTLCache(max_entries=max_sessions, ttl_seconds=ttl_seconds)
+
+    def get_or_create(
+        self, user_id: str, session_id: str, max_messages: int = 100
+    ) -> SessionMessageBuffer:
+        """Return the buffer of a session, creating an unseeded one if needed."""
+        key = (user_id, session_id)
+        buffer: Optional[SessionMessageBuffer] = self._buffers.get(key)
+        if buffer is None:
+            buffer = SessionMessageBuffer(max_messages)
+            self._buffers.set(key, buffer)
+        return buffer
+
+    def invalidate_session(self, user_id: str, session_id: str) -> None:
+        """Drop the buffer of a session."""
+        self._buffers.pop((user_id, session_id))
+
+    def invalidate_user(self, user_id: str) -> None:
+        """Drop every buffer of a user."""
+        self._buffers.invalidate(lambda key: key[0] == user_id)
+
+    def clear(self) -> None:
+        """Drop every buffer."""
+        self._buffers.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache counters plus the total number of buffered messages."""
+        stats = self._buffers.stats()
+        stats["messages"] = sum(len(buffer) for _, buffer in self._buffers.items())
+        return stats
+
+
+# Process-wide registry shared by every CosmosMemoryContext
+message_buffers = MessageBufferRegistry(
+    max_sessions=config.MESSAGE_BUFFER_MAX_SESSIONS,
+    ttl_seconds=config.MESSAGE_BUFFER_TTL_SECONDS,
+)
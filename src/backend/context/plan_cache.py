@@ -0,0 +1,116 @@
+# plan_cache.py
+
+from typing import Any, Dict, List, Optional
+
+from cache_utils import LRUTTLCache
+from models.messages_kernel import Plan, Step
+
+# Import the AppConfig instance
+from app_config import config
+
+
+class PlanCache:
+    """Process-wide read-through cache for plans and steps.
+
+    Entries are keyed by (user_id, session_id, kind, id), where kind is "plan",
+    "steps" (the step list of a plan) or "step". Values are stored and returned as
+    deep copies, so callers can mutate what they get back without corrupting the
+    cache. Step and plan updates are written through; inserts invalidate the session.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 30) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached plans, step lists and steps
+            ttl_seconds: Seconds an entry may be served before it is re-read
+        """
+        self._cache = LRUTTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+    @property
+    def enabled(self) -> bool:
+        """Return True if caching is switched on."""
+        return self._cache.enabled
+
+    def get_plan(self, user_id: str, session_id: str) -> Optional[Plan]:
+        """Return a copy of the cached plan for a session, if any."""
+        plan = self._cache.get((user_id, session_id, "plan", None))
+        return plan.model_copy(deep=True) if plan is not None else None
+
+    def set_plan(self, user_id: str, plan: Plan) -> None:
+        """Cache the current plan of its session."""
+        self._cache.set(
+            (user_id, plan.session_id, "plan", None), plan.model_copy(deep=True)
+        )
+
+    def get_steps(
+        self, user_id: str, session_id: str, plan_id: str
+    ) -> Optional[List[Step]]:
+        """Return a copy of the cached step list of a plan, if any."""
+        steps = self._cache.get((user_id, session_id, "steps", plan_id))
+        if steps is None:
+            return None
+        return [step.model_copy(deep=True) for step in steps]
+
+    def set_steps(
+        self, user_id: str, session_id: str, plan_id: str, steps: List[Step]
+    ) -> None:
+        """Cache the step list of a plan."""
+        self._cache.set(
+            (user_id, session_id, "steps", plan_id),
+            [step.model_copy(deep=True) for step in steps],
+        )
+
+    def get_step(self, user_id: str, session_id: str, step_id: str) -> Optional[Step]:
+        """Return a copy of a cached step, if any."""
+        step = self._cache.get((user_id, session_id, "step", step_id))
+        return step.model_copy(deep=True) if step is not None else None
+
+    def set_step(self, user_id: str, step: Step) -> None:
+        """Cache a single step."""
+        self._cache.set(
+            (user_id, step.session_id, "step", step.id), step.model_copy(deep=True)
+        )
+
+    def update_step(self, user_id: str, step: Step) -> None:
+        """Write an updated step through to the cached step and step list."""
+        self.set_step(user_id, step)
+
+        key = (user_id, step.session_id, "steps", step.plan_id)
+        steps = self._cache.peek(key)
+        if steps is None:
+            return
+        if not any(cached.id == step.id for cached in steps):
+            # The list no longer matches what is stored, let the next read refresh it
+            self._cache.pop(key)
+            return
+        self._cache.set(
+            key,
+            [
+                step.model_copy(deep=True) if cached.id == step.id else cached
+                for cached in steps
+            ],
+        )
+
+    def invalidate_session(self, user_id: str, session_id: str) -> None:
+        """Drop every cached entry of a session."""
+        self._cache.invalidate(lambda key: key[0] == user_id and key[1] == session_id)
+
+    def invalidate_user(self, user_id: str) -> None:
+        """Drop every cached entry of a user."""
+        self._cache.invalidate(lambda key: key[0] == user_id)
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return size and hit/miss counters."""
+        return self._cache.stats()
+
+
+# Process-wide cache shared by every CosmosMemoryContext
+plan_cache = PlanCache(
+    max_entries=config.COSMOSDB_READ_CACHE_SIZE,
+    ttl_seconds=config.COSMOSDB_READ_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,133 @@
+# session_registry.py
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Hashable, Set, Tuple
+
+import semantic_kernel as sk
+
+from cache_utils import LRUTTLCache
+from context.cosmos_memory_kernel import CosmosMemoryContext
+
+# Import the AppConfig instance
+from app_config import config
+
+
+class SessionContextRegistry:
+    """Process-wide registry of warm (kernel, memory context) pairs per session.
+
+    Endpoints get the same kernel and memory context for a (user_id, session_id)
+    until the session has been idle for ``idle_seconds`` or is pushed out by newer
+    sessions. Evicted memory contexts are closed in the background so their
+    buffered writes are flushed; a context held with ``pinned`` is closed only once
+    the last holder is done with it.
+    """
+
+    def __init__(
+        self,
+        kernel_factory: Callable[[], sk.Kernel],
+        max_sessions: int = 256,
+        idle_seconds: float = 900,
+    ) -> None:
+        """Initialize the registry.
+
+        Args:
+            kernel_factory: Creates the kernel of a new session
+            max_sessions: Maximum number of sessions kept warm
+            idle_seconds: Seconds since last use before a session is evicted
+        """
+        self._kernel_factory = kernel_factory
+        self._sessions = LRUTTLCache(
+            max_entries=max_sessions,
+            ttl_seconds=idle_seconds,
+            on_evict=self._on_evict,
+        )
+        self._closing: Set[asyncio.Task] = set()
+        # Holders per pinned memory context, and the keys of those already evicted
+        self._in_use: Dict[CosmosMemoryContext, int] = {}
+        self._deferred: Dict[CosmosMemoryContext, Hashable] = {}
+
+    def get(
+        self, user_id: str, session_id: str
+    ) -> Tuple[sk.Kernel, CosmosMemoryContext]:
+        """Return the kernel and memory context of a session, creating them once."""
+        key = (user_id, session_id)
+        entry = self._sessions.get(key)
+        if entry is None:
+            entry = (
+                self._kernel_factory(),
+                CosmosMemoryContext(session_id, user_id),
+            )
+        # Storing again restarts the idle timer and marks the session recently used
+        self._sessions.set(key, entry)
+        return entry
+
+    @asynccontextmanager
+    async def pinned(
+        self, user_id: str, session_id: str
+    ) -> AsyncIterator[Tuple[sk.Kernel, CosmosMemoryContext]]:
+        """Keep a session's memory context open while the block runs, even if evicted."""
+        kernel, memory_store = self.get(user_id, session_id)
+        self._in_use[memory_store] = self._in_use.get(memory_store, 0) + 1
+        try:
+            yield kernel, memory_store
+        finally:
+            self._in_use[memory_store] -= 1
+            if not self._in_use[memory_store]:
+                del self._in_use[memory_store]
+                key = self._deferred.pop(memory_store, None)
+                if key is not None:
+                    await self._close_context(key, memory_store)
+
+    def _on_evict(self, key: Hashable, entry: Tuple[Any, CosmosMemoryContext]) -> None:
+        _, memory_store = entry
+        if memory_store in self._in_use:
+            # Closed by pinned() once the running work is done
+            self._deferred[memory_store] = key
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(self._close_context(key, memory_store))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    @staticmethod
+    async def _close_context(
+        key: Hashable, memory_store: CosmosMemoryContext
+    ) -> None:
+        try:
+            await memory_store.close()
+        except Exception as e:
+            logging.exception(f"Failed to close memory context of session {key}: {e}")
+
+    def expire(self) -> int:
+        """Evict every idle session and return how many were evicted."""
+        return self._sessions.expire()
+
+    async def close(self) -> None:
+        """Close every memory context and forget all sessions."""
+        entries = list(self._sessions.items())
+        self._sessions.clear()
+        for key, (_, memory_store) in entries:
+            await self._close_context(key, memory_store)
+        if self._closing:
+            await asyncio.gather(*self._closing, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return live session count and hit/miss/eviction counters."""
+        stats = self._sessions.stats()
+        stats["live_sessions"] = stats.pop("entries")
+        stats["idle_seconds"] = stats.pop("ttl_seconds")
+        stats["pinned"] = len(self._in_use)
+        return stats
+
+
+# Process-wide registry used by initialize_runtime_and_context
+session_contexts = SessionContextRegistry(
+    kernel_factory=config.create_kernel,
+    max_sessions=config.SESSION_REGISTRY_MAX_SESSIONS,
+    idle_seconds=config.SESSION_REGISTRY_IDLE_SECONDS,
+)
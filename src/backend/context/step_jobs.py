@@ -0,0 +1,433 @@
+# step_jobs.py
+
+import asyncio
+import json
+import logging
+import sqlite3
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from semantic_kernel.kernel_pydantic import Field, KernelBaseModel
+
+from app_config import config
+from context.event_bus import session_events
+from models.messages_kernel import HumanFeedback
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+# Statuses of jobs that will not run again unless retried
+FINISHED_STATUSES = (COMPLETED, FAILED, CANCELLED)
+# Statuses of jobs that can be queued again
+RETRYABLE_STATUSES = (FAILED, CANCELLED)
+
+
+class StepJob(KernelBaseModel):
+    """A queued approval of one or all steps of a plan, and its progress."""
+
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    user_id: str
+    feedback: HumanFeedback
+    status: str = QUEUED  # queued, running, completed, failed, cancelled
+    attempts: int = 0
+    max_attempts: int = 1
+    error: Optional[str] = None
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class JobStore:
+    """Storage of step jobs, so queued jobs survive a restart when it is durable.
+
+    The base class keeps jobs in memory only; subclasses persist them.
+    """
+
+    # Whether jobs outlive the process
+    durable = False
+
+    def __init__(self) -> None:
+        self._jobs: Dict[str, str] = {}
+
+    async def save(self, job: StepJob) -> None:
+        """Insert or replace a job."""
+        self._jobs[job.id] = job.model_dump_json()
+
+    async def get(self, job_id: str) -> Optional[StepJob]:
+        """Return a job by ID, or None if it does not exist."""
+        data = self._jobs.get(job_id)
+        return StepJob.model_validate_json(data) if data is not None else None
+
+    async def unfinished(self) -> List[StepJob]:
+        """Return the queued and running jobs, oldest first."""
+        jobs = [StepJob.model_validate_json(data) for data in self._jobs.values()]
+        jobs = [job for job in jobs if job.status not in FINISHED_STATUSES]
+        return sorted(jobs, key=lambda job: job.created_at)
+
+    async def purge(self, finished_before: datetime) -> int:
+        """Delete finished jobs created before a point in time."""
+        jobs = [StepJob.model_validate_json(data) for data in self._jobs.values()]
+        purged = [
+            job.id
+            for job in jobs
+            if job.status in FINISHED_STATUSES and job.created_at < finished_before
+        ]
+        for job_id in purged:
+            del self._jobs[job_id]
+        return len(purged)
+
+
+class SQLiteJobStore(JobStore):
+    """Job store backed by a local SQLite file.
+
+    Each call opens its own connection in a worker thread, so the event loop is
+    never blocked on disk I/O. Intended for a single app process per file.
+    """
+
+    durable = True
+
+    def __init__(self, path: str) -> None:
+        """Initialize the store.
+
+        Args:
+            path: Path of the SQLite database file, created on first use
+        """
+        super().__init__()
+        self.path = path
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path)
+        if not self._initialized:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS step_jobs ("
+                "id TEXT PRIMARY KEY, status TEXT NOT NULL, "
+                "created_at TEXT NOT NULL, data TEXT NOT NULL)"
+            )
+            connection.commit()
+            self._initialized = True
+        return connection
+
+    def _execute(self, sql: str, parameters: Tuple = ()) -> List[Tuple]:
+        connection = self._connect()
+        try:
+            with connection:
+                cursor = connection.execute(sql, parameters)
+                if cursor.description is None:
+                    return [(cursor.rowcount,)]
+                return cursor.fetchall()
+        finally:
+            connection.close()
+
+    async def save(self, job: StepJob) -> None:
+        await asyncio.to_thread(
+            self._execute,
+            "INSERT OR REPLACE INTO step_jobs (id, status, created_at, data) "
+            "VALUES (?, ?, ?, ?)",
+            (job.id, job.status, job.created_at.isoformat(), job.model_dump_json()),
+        )
+
+    async def get(self, job_id: str) -> Optional[StepJob]:
+        rows = await asyncio.to_thread(
+            self._execute, "SELECT data FROM step_jobs WHERE id = ?", (job_id,)
+        )
+        return StepJob.model_validate_json(rows[0][0]) if rows else None
+
+    async def unfinished(self) -> List[StepJob]:
+        rows = await asyncio.to_thread(
+            self._execute,
+            "SELECT data FROM step_jobs WHERE status IN (?, ?) ORDER BY created_at",
+            (QUEUED, RUNNING),
+        )
+        return [StepJob.model_validate_json(row[0]) for row in rows]
+
+    async def purge(self, finished_before: datetime) -> int:
+        rows = await asyncio.to_thread(
+            self._execute,
+            "DELETE FROM step_jobs WHERE status IN (?, ?, ?) AND created_at < ?",
+            (*FINISHED_STATUSES, finished_before.isoformat()),
+        )
+        return rows[0][0]
+
+
+def create_job_store(path: str) -> JobStore:
+    """Return a SQLite store for a file path, or an in-memory store if it is empty."""
+    return SQLiteJobStore(path) if path else JobStore()
+
+
+class StepJobQueue:
+    """Runs step approvals in the background with a bounded pool of workers.
+
+    Submitting a job stores it and returns immediately; workers execute jobs in
+    submission order. A failed job is retried with exponential backoff until it
+    has run ``max_attempts`` times. Jobs that were queued or running when the
+    process stopped are queued again by ``start``; running them again is safe, as
+    the group chat manager skips steps that already ran.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        workers: int = 4,
+        max_attempts: int = 3,
+        retry_delay_seconds: float = 5,
+        retention_seconds: float = 86400,
+    ) -> None:
+        """Initialize the queue.
+
+        Args:
+            store: Durable storage of the jobs
+            workers: Number of jobs executed concurrently
+            max_attempts: Times a job runs before it is marked failed
+            retry_delay_seconds: Delay before the first retry, doubled per attempt
+            retention_seconds: Seconds finished jobs are kept for status lookups
+        """
+        self._store = store
+        self._workers = max(1, workers)
+        self._max_attempts = max(1, max_attempts)
+        self._retry_delay_seconds = retry_delay_seconds
+        self._retention_seconds = retention_seconds
+        self._handler: Optional[Callable[[StepJob], Awaitable[Any]]] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker_tasks: List[asyncio.Task] = []
+        self._retry_tasks: Set[asyncio.Task] = set()
+        # Running jobs and the tasks executing them, by job ID
+        self._running: Dict[str, Tuple[StepJob, asyncio.Task]] = {}
+
+        self.completed = 0
+        self.failed = 0
+        self.retried = 0
+        self.cancelled = 0
+
+    @property
+    def started(self) -> bool:
+        """Return True while the workers are running."""
+        return bool(self._worker_tasks)
+
+    async def start(self, handler: Callable[[StepJob], Awaitable[Any]]) -> int:
+        """Start the workers and queue again the jobs left over from a restart.
+
+        Args:
+            handler: Coroutine function executing a job
+
+        Returns:
+            The number of jobs queued again
+        """
+        if self.started:
+            return 0
+        self._handler = handler
+        self._queue = asyncio.Queue()
+
+        requeued = 0
+        try:
+            await self._store.purge(
+                datetime.now(timezone.utc) - timedelta(seconds=self._retention_seconds)
+            )
+            for job in await self._store.unfinished():
+                if job.status == RUNNING:
+                    # The interrupted run counts as an attempt
+                    if job.attempts >= job.max_attempts:
+                        self._finish(job, FAILED, "Interrupted by a restart")
+                        self.failed += 1
+                        await self._save(job)
+                        continue
+                    job.status = QUEUED
+                    await self._save(job)
+                self._queue.put_nowait(job.id)
+                requeued += 1
+        except Exception as e:
+            logging.exception(f"Failed to load step jobs from the job store: {e}")
+        if requeued:
+            logging.info(f"Queued {requeued} step jobs again after a restart")
+        if not self._store.durable:
+            logging.warning(
+                "Step jobs are kept in memory and lost on restart; set "
+                "STEP_JOB_DB_PATH to keep them"
+            )
+
+        self._worker_tasks = [
+            asyncio.create_task(self._work()) for _ in range(self._workers)
+        ]
+        return requeued
+
+    async def stop(self) -> None:
+        """Stop the workers; jobs still queued or running resume on the next start."""
+        tasks = self._worker_tasks + list(self._retry_tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._worker_tasks = []
+        self._retry_tasks.clear()
+
+    async def submit(self, user_id: str, feedback: HumanFeedback) -> StepJob:
+        """Store a job for the feedback and queue it.
+
+        Raises:
+            RuntimeError: If the queue has not been started
+        """
+        if not self.started:
+            raise RuntimeError("The step job queue has not been started")
+        job = StepJob(
+            user_id=user_id, feedback=feedback, max_attempts=self._max_attempts
+        )
+        await self._save(job)
+        self._queue.put_nowait(job.id)
+        return job
+
+    async def get(self, job_id: str, user_id: str) -> Optional[StepJob]:
+        """Return a job if it exists and belongs to the user."""
+        running = self._running.get(job_id)
+        job = running[0] if running else await self._store.get(job_id)
+        if job is None or job.user_id != user_id:
+            return None
+        return job
+
+    async def cancel(self, job_id: str, user_id: str) -> Optional[StepJob]:
+        """Cancel a queued or running job.
+
+        Returns:
+            The job, whose status is unchanged if it had already finished, or None
+            if it does not exist
+        """
+        job = await self.get(job_id, user_id)
+        if job is None or job.status in FINISHED_STATUSES:
+            return job
+        running = self._running.get(job_id)
+        if running is not None:
+            running[1].cancel()
+        self._finish(job, CANCELLED)
+        await self._save(job)
+        self.cancelled += 1
+        return job
+
+    async def retry(self, job_id: str, user_id: str) -> Optional[StepJob]:
+        """Queue a failed or cancelled job again with a fresh attempt budget.
+
+        Returns:
+            The job, whose status is unchanged unless it had failed or been
+            cancelled, or None if it does not exist
+
+        Raises:
+            RuntimeError: If the queue has not been started
+        """
+        if not self.started:
+            raise RuntimeError("The step job queue has not been started")
+        job = await self.get(job_id, user_id)
+        if job is None or job.status not in RETRYABLE_STATUSES:
+            return job
+        job.status = QUEUED
+        job.attempts = 0
+        job.error = None
+        job.finished_at = None
+        await self._save(job)
+        self._queue.put_nowait(job.id)
+        return job
+
+    async def _work(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                job = await self._store.get(job_id)
+                if job is not None and job.status == QUEUED:
+                    await self._execute(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.exception(f"Step job {job_id} could not be processed: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _execute(self, job: StepJob) -> None:
+        job.status = RUNNING
+        job.attempts += 1
+        job.started_at = datetime.now(timezone.utc)
+        await self._save(job)
+
+        task = asyncio.create_task(self._handler(job))
+        self._running[job.id] = (job, task)
+        try:
+            # Unlike awaiting the task, waiting for it does not raise when the job
+            # alone is cancelled
+            await asyncio.wait({task})
+        except asyncio.CancelledError:
+            # The worker is stopping; the job stays running and resumes on restart
+            task.cancel()
+            raise
+        finally:
+            self._running.pop(job.id, None)
+
+        if task.cancelled() or job.status == CANCELLED:
+            logging.info(f"Step job {job.id} was cancelled")
+            return
+
+        error = task.exception()
+        if error is None:
+            self._finish(job, COMPLETED)
+            self.completed += 1
+        elif job.attempts < job.max_attempts:
+            logging.warning(
+                f"Step job {job.id} failed on attempt {job.attempts}, retrying: {error}"
+            )
+            job.status = QUEUED
+            job.error = str(error)
+            self.retried += 1
+            self._schedule_retry(
+                job.id, self._retry_delay_seconds * 2 ** (job.attempts - 1)
+            )
+        else:
+            logging.error(f"Step job {job.id} failed after {job.attempts} attempts")
+            self._finish(job, FAILED, str(error))
+            self.failed += 1
+        await self._save(job)
+
+    async def _save(self, job: StepJob) -> None:
+        """Store a job and tell the session's event stream about its status."""
+        await self._store.save(job)
+        session_events.publish(
+            job.user_id,
+            job.feedback.session_id,
+            "step_job",
+            json.loads(job.model_dump_json()),
+        )
+
+    def _schedule_retry(self, job_id: str, delay_seconds: float) -> None:
+        async def requeue() -> None:
+            await asyncio.sleep(delay_seconds)
+            self._queue.put_nowait(job_id)
+
+        task = asyncio.create_task(requeue())
+        self._retry_tasks.add(task)
+        task.add_done_callback(self._retry_tasks.discard)
+
+    @staticmethod
+    def _finish(job: StepJob, status: str, error: Optional[str] = None) -> None:
+        job.status = status
+        job.finished_at = datetime.now(timezone.utc)
+        if error is not None:
+            job.error = error
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth, running jobs and outcome counters."""
+        return {
+            "workers": len(self._worker_tasks),
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "running": len(self._running),
+            "completed": self.completed,
+            "failed": self.failed,
+            "retried": self.retried,
+            "cancelled": self.cancelled,
+        }
+
+
+# Process-wide queue of step approvals, started with the app
+step_jobs = StepJobQueue(
+    store=create_job_store(config.STEP_JOB_DB_PATH),
+    workers=config.STEP_JOB_WORKERS,
+    max_attempts=config.STEP_JOB_MAX_ATTEMPTS,
+    retry_delay_seconds=config.STEP_JOB_RETRY_DELAY_SECONDS,
+    retention_seconds=config.STEP_JOB_RETENTION_SECONDS,
+)
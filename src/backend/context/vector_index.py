@@ -0,0 +1,221 @@
+# vector_index.py
+
+import asyncio
+import logging
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
+
+import numpy as np
+
+from cache_utils import LRUTTLCache
+
+# Import the AppConfig instance
+from app_config import config
+
+
+class VectorIndex:
+    """Exact in-process nearest-neighbour index using cosine similarity.
+
+    Vectors are normalized once on insert and kept in a contiguous float32 matrix,
+    so a search is a single matrix-vector product followed by an ``argpartition``
+    top-k selection instead of a Python loop over records.
+    """
+
+    def __init__(self, initial_capacity: int = 64) -> None:
+        """Initialize an empty index.
+
+        Args:
+            initial_capacity: Number of rows allocated up front; grows by doubling
+        """
+        self._initial_capacity = max(1, initial_capacity)
+        self._matrix: Optional[np.ndarray] = None
+        self._norms = np.empty(0, dtype=np.float32)
+        self._ids: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._payloads: Dict[str, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._positions
+
+    @property
+    def dimensions(self) -> Optional[int]:
+        """Return the vector size, or None while the index is empty."""
+        return None if self._matrix is None else self._matrix.shape[1]
+
+    def _ensure_capacity(self, dimensions: int) -> None:
+        if self._matrix is None:
+            self._matrix = np.empty(
+                (self._initial_capacity, dimensions), dtype=np.float32
+            )
+            self._norms = np.empty(self._initial_capacity, dtype=np.float32)
+        elif len(self._ids) == self._matrix.shape[0]:
+            capacity = self._matrix.shape[0] * 2
+            matrix = np.empty((capacity, dimensions), dtype=np.float32)
+            matrix[: len(self._ids)] = self._matrix[: len(self._ids)]
+            norms = np.empty(capacity, dtype=np.float32)
+            norms[: len(self._ids)] = self._norms[: len(self._ids)]
+            self._matrix, self._norms = matrix, norms
+
+    def upsert(self, item_id: str, vector: np.ndarray, payload: Any = None) -> bool:
+        """Insert or replace a vector.
+
+        Returns:
+            False if the vector was rejected (zero length or wrong dimensions)
+        """
+        vector = np.asarray(vector, dtype=np.float32).ravel()
+        norm = float(np.linalg.norm(vector))
+        if norm == 0.0 or not np.isfinite(norm):
+            self.remove(item_id)
+            return False
+        if self.dimensions is not None and vector.shape[0] != self.dimensions:
+            logging.warning(
+                f"Skipping vector {item_id} with {vector.shape[0]} dimensions, index has {self.dimensions}"
+            )
+            return False
+
+        position = self._positions.get(item_id)
+        if position is None:
+            self._ensure_capacity(vector.shape[0])
+            position = len(self._ids)
+            self._ids.append(item_id)
+            self._positions[item_id] = position
+
+        self._matrix[position] = vector / norm
+        self._norms[position] = norm
+        self._payloads[item_id] = payload
+        return True
+
+    def remove(self, item_id: str) -> None:
+        """Remove a vector by moving the last row into its slot."""
+        position = self._positions.pop(item_id, None)
+        if position is None:
+            return
+        self._payloads.pop(item_id, None)
+
+        last = len(self._ids) - 1
+        if position != last:
+            moved_id = self._ids[last]
+            self._matrix[position] = self._matrix[last]
+            self._norms[position] = self._norms[last]
+            self._ids[position] = moved_id
+            self._positions[moved_id] = position
+        self._ids.pop()
+
+    def get_payload(self, item_id: str) -> Any:
+        """Return the payload stored with a vector."""
+        return self._payloads.get(item_id)
+
+    def get_vector(self, item_id: str) -> Optional[np.ndarray]:
+        """Return the original (denormalized) vector."""
+        position = self._positions.get(item_id)
+        if position is None:
+            return None
+        return self._matrix[position] * self._norms[position]
+
+    def search(
+        self, query: np.ndarray, limit: int = 1, min_score: float = 0.0
+    ) -> List[Tuple[str, float]]:
+        """Return up to ``limit`` (id, cosine similarity) pairs, best first."""
+        count = len(self._ids)
+        if count == 0 or limit <= 0:
+            return []
+
+        query = np.asarray(query, dtype=np.float32).ravel()
+        if query.shape[0] != self.dimensions:
+            raise ValueError(
+                f"Query has {query.shape[0]} dimensions, index has {self.dimensions}"
+            )
+        norm = float(np.linalg.norm(query))
+        if norm == 0.0:
+            return []
+
+        scores = self._matrix[:count] @ (query / norm)
+        if limit < count:
+            candidates = np.argpartition(-scores, limit - 1)[:limit]
+        else:
+            candidates = np.arange(count)
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+
+        return [
+            (self._ids[position], float(scores[position]))
+            for position in candidates
+            if scores[position] >= min_score
+        ]
+
+
+class VectorIndexRegistry:
+    """Process-wide cache of loaded vector indexes, one per memory collection.
+
+    An index is built from every record of the collection the first time it is
+    searched and then kept in sync by writes from this process. Entries expire
+    after a TTL so writes from other processes are eventually picked up.
+    """
+
+    def __init__(self, max_indexes: int = 64, ttl_seconds: float = 300) -> None:
+        """Initialize the registry.
+
+        Args:
+            max_indexes: Maximum number of collections kept in memory
+            ttl_seconds: Seconds before an index is rebuilt from Cosmos DB
+        """
+        self._indexes = LRUTTLCache(max_entries=max_indexes, ttl_seconds=ttl_seconds)
+        self._lock = asyncio.Lock()
+
+    async def get_or_build(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Iterable[Tuple[str, np.ndarray, Any]]]],
+    ) -> VectorIndex:
+        """Return the index for a key, building it with ``loader`` on a miss.
+
+        Args:
+            key: Identifies the collection, e.g. (user_id, session_id, collection)
+            loader: Coroutine function returning (id, vector, payload) tuples
+        """
+        index = self._indexes.get(key)
+        if index is not None:
+            return index
+
+        async with self._lock:
+            # Another task may have built it while this one waited
+            index = self._indexes.peek(key)
+            if index is not None:
+                return index
+
+            index = VectorIndex()
+            for item_id, vector, payload in await loader():
+                index.upsert(item_id, vector, payload)
+            self._indexes.set(key, index)
+            return index
+
+    def peek(self, key: Hashable) -> Optional[VectorIndex]:
+        """Return a loaded index without building it."""
+        return self._indexes.peek(key)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a loaded index."""
+        self._indexes.pop(key)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache counters plus the total number of indexed vectors."""
+        stats = self._indexes.stats()
+        stats["vectors"] = sum(len(index) for _, index in self._indexes.items())
+        return stats
+
+
+# Process-wide registry shared by every CosmosMemoryContext
+vector_indexes = VectorIndexRegistry(
+    ttl_seconds=config.MEMORY_VECTOR_INDEX_TTL_SECONDS,
+)
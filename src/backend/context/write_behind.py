@@ -0,0 +1,212 @@
+# write_behind.py
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from azure.cosmos.aio import ContainerProxy
+from azure.cosmos.exceptions import CosmosBatchOperationError
+
+# Cosmos DB rejects transactional batches with more than 100 operations
+MAX_BATCH_OPERATIONS = 100
+
+# Status codes of writes that fail the same way however often they are retried
+NON_RETRYABLE_STATUS_CODES = (400, 409, 412, 413)
+
+PendingOperations = List[Tuple[str, Tuple[str, Dict[str, Any]]]]
+
+
+class WriteBehindBuffer:
+    """Buffers document writes and flushes them to Cosmos DB as transactional batches.
+
+    Writes are grouped by partition key (session_id). A partition is flushed when it
+    reaches ``max_batch_size`` operations, when ``flush_interval`` seconds have passed
+    since the first buffered write, or when ``flush()`` is awaited explicitly. Pending
+    documents can be read back with ``get_pending`` for read-your-writes consistency,
+    including while they are being written. A failed write is retried by another
+    flush after ``flush_interval``, up to ``max_attempts`` times; writes rejected
+    with a status code that cannot succeed on retry are dropped and logged.
+    """
+
+    def __init__(
+        self,
+        container_provider: Callable[[], Awaitable[ContainerProxy]],
+        max_batch_size: int = MAX_BATCH_OPERATIONS,
+        flush_interval: float = 0.2,
+        partition_key_field: str = "session_id",
+        max_attempts: int = 3,
+    ) -> None:
+        """Initialize the buffer.
+
+        Args:
+            container_provider: Coroutine function returning the target container
+            max_batch_size: Operations per partition that trigger an immediate flush
+            flush_interval: Maximum seconds a write may stay buffered
+            partition_key_field: Document field holding the partition key value
+            max_attempts: Times a write is tried before it is dropped
+        """
+        self._container_provider = container_provider
+        self._max_batch_size = max(1, min(max_batch_size, MAX_BATCH_OPERATIONS))
+        self._flush_interval = flush_interval
+        self._partition_key_field = partition_key_field
+        self._max_attempts = max(1, max_attempts)
+
+        # partition key -> item id -> (operation, document); dicts keep insertion order
+        self._pending: Dict[Any, Dict[str, Tuple[str, Dict[str, Any]]]] = {}
+        # Operations of the flush in progress, readable until they are written
+        self._in_flight: Dict[Any, Dict[str, Tuple[str, Dict[str, Any]]]] = {}
+        # Failed attempts of buffered writes by (partition key, item id)
+        self._attempts: Dict[Tuple[Any, str], int] = {}
+        self.dropped = 0
+        self._flush_lock = asyncio.Lock()
+        self._timer: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        pending = sum(len(ops) for ops in self._pending.values())
+        return pending + sum(len(ops) for ops in self._in_flight.values())
+
+    def has_pending(self) -> bool:
+        """Return True if any write is waiting to be flushed or being written."""
+        return bool(self._pending or self._in_flight)
+
+    def get_pending(self, item_id: str, partition_key: Any) -> Optional[Dict[str, Any]]:
+        """Return the buffered document for an id, if a write for it is pending."""
+        entry = self._pending.get(partition_key, {}).get(item_id)
+        if entry is None:
+            entry = self._in_flight.get(partition_key, {}).get(item_id)
+        return entry[1] if entry else None
+
+    async def add(self, operation: str, document: Dict[str, Any]) -> None:
+        """Buffer a ``create`` or ``upsert`` of a document.
+
+        Args:
+            operation: Either "create" or "upsert"
+            document: The serialized document, including id and partition key
+        """
+        partition_key = document.get(self._partition_key_field)
+        partition = self._pending.setdefault(partition_key, {})
+
+        previous = partition.get(document["id"])
+        if previous and previous[0] == "create":
+            # The document has not reached Cosmos DB yet, so keep it a create
+            operation = "create"
+        partition[document["id"]] = (operation, document)
+        # A new write of the document gets a fresh attempt budget
+        self._attempts.pop((partition_key, document["id"]), None)
+
+        if len(partition) >= self._max_batch_size:
+            await self.flush()
+        elif self._timer is None or self._timer.done():
+            self._timer = asyncio.create_task(self._flush_after_interval())
+
+    async def _flush_after_interval(self) -> None:
+        """Flush pending writes once the flush interval has elapsed."""
+        try:
+            await asyncio.sleep(self._flush_interval)
+            await self.flush()
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            # Failed writes stay buffered and flush() has scheduled another try
+            logging.error(f"Background write-behind flush failed: {e}")
+
+    async def flush(self) -> None:
+        """Write every pending operation to Cosmos DB.
+
+        Raises:
+            Exception: The first batch error; failed operations are kept for retry
+                unless they were dropped
+        """
+        async with self._flush_lock:
+            if not self._pending:
+                return
+
+            self._in_flight, self._pending = self._pending, {}
+            errors: List[Exception] = []
+            try:
+                container = await self._container_provider()
+                for partition_key, operations in self._in_flight.items():
+                    items = list(operations.items())
+                    for start in range(0, len(items), MAX_BATCH_OPERATIONS):
+                        chunk = items[start : start + MAX_BATCH_OPERATIONS]
+                        try:
+                            await container.execute_item_batch(
+                                batch_operations=[
+                                    (operation, (document,))
+                                    for _, (operation, document) in chunk
+                                ],
+                                partition_key=partition_key,
+                            )
+                        except Exception as e:
+                            logging.exception(
+                                f"Failed to flush {len(chunk)} buffered writes "
+                                f"for partition {partition_key}: {e}"
+                            )
+                            errors.append(e)
+                            self._requeue(partition_key, chunk, e)
+                        else:
+                            for item_id, _ in chunk:
+                                self._attempts.pop((partition_key, item_id), None)
+            except Exception as e:
+                # The container is unavailable; keep every write for the next flush
+                errors.append(e)
+                for partition_key, operations in self._in_flight.items():
+                    self._requeue(partition_key, list(operations.items()))
+            finally:
+                self._in_flight = {}
+
+            if errors:
+                self._schedule_retry()
+                raise errors[0]
+
+    def _schedule_retry(self) -> None:
+        """Flush the writes kept after a failure again once the interval elapses."""
+        if not self._pending:
+            return
+        timer = self._timer
+        if timer is None or timer.done() or timer is asyncio.current_task():
+            self._timer = asyncio.create_task(self._flush_after_interval())
+
+    def _requeue(
+        self,
+        partition_key: Any,
+        chunk: PendingOperations,
+        error: Optional[Exception] = None,
+    ) -> None:
+        """Put failed operations back, unless a newer write for the id arrived.
+
+        When the batch error names the operation that failed, only that one uses
+        up an attempt; the others failed because the batch is atomic.
+        """
+        failed_index = None
+        if isinstance(error, CosmosBatchOperationError):
+            failed_index = error.error_index
+        status_code = getattr(error, "status_code", None)
+        non_retryable = status_code in NON_RETRYABLE_STATUS_CODES
+
+        partition = self._pending.setdefault(partition_key, {})
+        for index, (item_id, entry) in enumerate(chunk):
+            if item_id in partition:
+                continue
+            if error is not None and failed_index in (None, index):
+                key = (partition_key, item_id)
+                attempts = self._attempts.get(key, 0) + 1
+                if non_retryable or attempts >= self._max_attempts:
+                    self._attempts.pop(key, None)
+                    self.dropped += 1
+                    logging.error(
+                        f"Dropping buffered {entry[0]} of {item_id} in partition "
+                        f"{partition_key} after {attempts} attempts: {error}"
+                    )
+                    continue
+                self._attempts[key] = attempts
+            partition[item_id] = entry
+        if not partition:
+            del self._pending[partition_key]
+
+    async def close(self) -> None:
+        """Cancel the background timer and flush what is left."""
+        if self._timer is not None and not self._timer.done():
+            self._timer.cancel()
+        self._timer = None
+        await self.flush()
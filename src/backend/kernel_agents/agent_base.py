@@ -9,7 +9,10 @@ import semantic_kernel as sk
 # Import the new AppConfig instance
 from app_config import config
 from context.cosmos_memory_kernel import CosmosMemoryContext
+from context.event_bus import session_events
 from event_utils import track_event_if_configured
+from kernel_agents.agent_definition_registry import agent_definitions
+from kernel_agents.reply_stream import ChunkHandler, collect_reply
 from models.messages_kernel import (ActionRequest, ActionResponse,
                                     AgentMessage, Step, StepStatus)
 from semantic_kernel.agents import AzureAIAgentThread  # pylint:disable=E0611
@@ -115,19 +118,29 @@ class BaseAgent(AzureAIAgent):
             action_request.action
         ]
 
+        # Each step runs on a thread of its own; see _new_step_thread
+        thread = self._new_step_thread()
         try:
-            # Use the agent to process the action request
-            async_generator = self.invoke(
-                messages=self._message,
-                thread=self._thread,
-            )
-
-            response_content = ""
+            # Use the agent to process the action request; in streaming mode the
+            # reply is forwarded to the session's event stream as it is generated
+            streaming = config.AGENT_REPLY_STREAMING
+            if streaming:
+                async_generator = self.invoke_stream(
+                    messages=self._message,
+                    thread=thread,
+                )
+                on_chunk = self._reply_chunk_publisher(action_request)
+            else:
+                async_generator = self.invoke(
+                    messages=self._message,
+                    thread=thread,
+                )
+                on_chunk = None
 
             # Collect the response from the async generator
-            async for chunk in async_generator:
-                if chunk is not None:
-                    response_content += str(chunk)
+            response_content = await collect_reply(
+                async_generator, self._agent_name, on_chunk=on_chunk, streamed=streaming
+            )
 
             # Log the messages in the thread
             # async for msg in self._thread.get_messages():
@@ -186,6 +199,8 @@ class BaseAgent(AzureAIAgent):
                 status=StepStatus.failed,
             )
             return response.json()
+        finally:
+            await self._delete_step_thread(thread)
 
         # Update step status
         step.status = StepStatus.completed
@@ -218,6 +233,47 @@ class BaseAgent(AzureAIAgent):
 
         return response.json()
 
+    def _new_step_thread(self) -> Optional[AzureAIAgentThread]:
+        """Return a new conversation thread for executing one step.
+
+        Independent steps run at the same time and the Azure AI Agents service
+        allows one active run per thread, so steps cannot share the session's
+        thread. A fresh thread also keeps a step from seeing steps it does not
+        depend on; the history of its predecessors is part of the action. Without
+        a client the shared thread is used.
+        """
+        if self.client is None:
+            return self._thread
+        return AzureAIAgentThread(client=self.client)
+
+    async def _delete_step_thread(self, thread: Optional[AzureAIAgentThread]) -> None:
+        """Delete a thread made by _new_step_thread once its step is done."""
+        if thread is None or thread is self._thread or thread.id is None:
+            return
+        try:
+            await thread.delete()
+        except Exception as e:
+            logging.warning(f"Failed to delete step thread {thread.id}: {e}")
+
+    def _reply_chunk_publisher(self, action_request: ActionRequest) -> ChunkHandler:
+        """Return a callback publishing reply chunks to the session's event stream."""
+
+        def publish(content: str, index: int) -> None:
+            session_events.publish(
+                self._user_id,
+                action_request.session_id,
+                "agent_reply_chunk",
+                {
+                    "step_id": action_request.step_id,
+                    "plan_id": action_request.plan_id,
+                    "source": self._agent_name,
+                    "index": index,
+                    "content": content,
+                },
+            )
+
+        return publish
+
     def save_state(self) -> Mapping[str, Any]:
         """Save the state of this agent."""
         return {"memory": self._memory_store.save_state()}
@@ -242,16 +298,15 @@ class BaseAgent(AzureAIAgent):
         temperature: float = 0.0,
     ):
         """
-        Creates a new Azure AI Agent with the specified name and instructions using AIProjectClient.
-        If an agent with the given name (assistant_id) already exists, it tries to retrieve it first.
+        Returns the Azure AI Agent definition with the specified name and instructions.
+        Definitions are served from the process-wide agent definition registry; a new
+        agent is only created in the AI project if no matching definition exists.
 
         Args:
-            kernel: The Semantic Kernel instance
-            agent_name: The name of the agent (will be used as assistant_id)
+            agent_name: The name of the agent
             instructions: The system message / instructions for the agent
-            agent_type: The type of agent (defaults to "assistant")
             tools: Optional tool definitions for the agent
-            tool_resources: Optional tool resources required by the tools
+            client: Optional AIProjectClient; defaults to the shared one
             response_format: Optional response format to control structured output
             temperature: The temperature setting for the agent (defaults to 0.0)
 
@@ -263,45 +318,13 @@ class BaseAgent(AzureAIAgent):
             if client is None:
                 client = config.get_ai_project_client()
 
-            # # First try to get an existing agent with this name as assistant_id
-            try:
-                agent_id = None
-                agent_list = await client.agents.list_agents()
-                for agent in agent_list.data:
-                    if agent.name == agent_name:
-                        agent_id = agent.id
-                        break
-                # If the agent already exists, we can use it directly
-                # Get the existing agent definition
-                if agent_id is not None:
-                    logging.info(f"Agent with ID {agent_id} exists.")
-
-                    existing_definition = await client.agents.get_agent(agent_id)
-
-                    return existing_definition
-            except Exception as e:
-                # The Azure AI Projects SDK throws an exception when the agent doesn't exist
-                # (not returning None), so we catch it and proceed to create a new agent
-                if "ResourceNotFound" in str(e) or "404" in str(e):
-                    logging.info(
-                        f"Agent with ID {agent_name} not found. Will create a new one."
-                    )
-                else:
-                    # Log unexpected errors but still try to create a new agent
-                    logging.warning(
-                        f"Unexpected error while retrieving agent {agent_name}: {str(e)}. Attempting to create new agent."
-                    )
-
-            # Create the agent using the project client with the agent_name as both name and assistantId
-            agent_definition = await client.agents.create_agent(
-                model=config.AZURE_OPENAI_DEPLOYMENT_NAME,
-                name=agent_name,
+            return await agent_definitions.get_or_create(
+                agent_name=agent_name,
                 instructions=instructions,
-                temperature=temperature,
                 response_format=response_format,
+                temperature=temperature,
+                client=client,
             )
-
-            return agent_definition
         except Exception as exc:
             logging.error("Failed to create Azure AI Agent: %s", exc)
             raise
@@ -0,0 +1,182 @@
+"""Bounded cache of per-session agent graphs for the AgentFactory."""
+
+import asyncio
+import logging
+import sys
+import types
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Hashable, Optional, Set
+
+from cache_utils import LRUTTLCache
+from models.messages_kernel import AgentType
+from semantic_kernel.agents import AzureAIAgentThread  # pylint:disable=E0611
+
+
+# Objects shared by every session that are left out of size estimates
+_NOT_FOLLOWED = (
+    type,
+    types.ModuleType,
+    types.FunctionType,
+    types.BuiltinFunctionType,
+    types.MethodType,
+)
+
+
+class SessionAgentGraph:
+    """Everything the AgentFactory keeps for one session."""
+
+    def __init__(self) -> None:
+        # Built agents by type
+        self.agents: Dict[AgentType, Any] = {}
+        # Session conversation thread; steps run on threads of their own
+        self.thread: Optional[AzureAIAgentThread] = None
+        # Azure AI agents by name
+        self.azure_ai_agents: Dict[str, Any] = {}
+        # Construction time in milliseconds by agent type
+        self.timings: Dict[AgentType, float] = {}
+        # Approximate size in bytes of each agent, measured once when it is added
+        self.agent_bytes: Dict[AgentType, int] = {}
+        # Requests and jobs using the graph; its thread is kept while any run
+        self.in_flight = 0
+        self.evicted = False
+
+    def add_agent(self, agent_type: AgentType, agent: Any) -> None:
+        """Store a built agent and measure its size for the cache stats."""
+        self.agents[agent_type] = agent
+        self.agent_bytes[agent_type] = approximate_size(agent)
+
+
+def approximate_size(obj: Any, seen: Optional[Set[int]] = None, depth: int = 6) -> int:
+    """Return the approximate memory footprint of an object graph in bytes.
+
+    Follows containers and instance attributes up to ``depth`` levels, counting
+    each object once. Classes, modules and functions are not followed.
+    """
+    if seen is None:
+        seen = set()
+    if id(obj) in seen or isinstance(obj, _NOT_FOLLOWED):
+        return 0
+    seen.add(id(obj))
+    try:
+        size = sys.getsizeof(obj)
+    except TypeError:
+        return 0
+    if depth <= 0:
+        return size
+
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += approximate_size(key, seen, depth - 1)
+            size += approximate_size(value, seen, depth - 1)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += approximate_size(item, seen, depth - 1)
+    elif not isinstance(obj, (str, bytes, int, float, bool)):
+        attributes = getattr(obj, "__dict__", None)
+        if attributes is not None:
+            size += approximate_size(attributes, seen, depth - 1)
+    return size
+
+
+class SessionAgentCache:
+    """LRU/TTL cache of session agent graphs.
+
+    A session's agents, thread and timings are cached and evicted together. Entries
+    expire ``ttl_seconds`` after their last use; when a graph is evicted its
+    conversation thread is deleted in the background, or once the work pinning the
+    graph with ``pinned`` has finished.
+    """
+
+    def __init__(self, max_sessions: int = 256, ttl_seconds: float = 3600) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_sessions: Maximum number of session graphs kept
+            ttl_seconds: Seconds since last use before a graph is evicted
+        """
+        self._graphs = LRUTTLCache(
+            max_entries=max_sessions, ttl_seconds=ttl_seconds, on_evict=self._on_evict
+        )
+        self._closing: Set[asyncio.Task] = set()
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._graphs
+
+    def get(self, session_id: str) -> SessionAgentGraph:
+        """Return the graph of a session, creating it if needed, and mark it used."""
+        graph = self._graphs.get(session_id)
+        if graph is None:
+            graph = SessionAgentGraph()
+        # Storing again restarts the TTL, so it counts from the last use
+        self._graphs.set(session_id, graph)
+        return graph
+
+    def peek(self, session_id: str) -> Optional[SessionAgentGraph]:
+        """Return the graph of a session without creating it or marking it used."""
+        return self._graphs.peek(session_id)
+
+    def pop(self, session_id: str) -> Optional[SessionAgentGraph]:
+        """Remove a session graph without closing its thread."""
+        return self._graphs.pop(session_id)
+
+    def clear(self) -> None:
+        """Remove every session graph without closing threads."""
+        self._graphs.clear()
+
+    def expire(self) -> int:
+        """Evict every expired session graph and return how many were evicted."""
+        return self._graphs.expire()
+
+    @asynccontextmanager
+    async def pinned(self, session_id: str) -> AsyncIterator[SessionAgentGraph]:
+        """Keep a session's thread alive while the block runs, even if evicted."""
+        graph = self.get(session_id)
+        graph.in_flight += 1
+        try:
+            yield graph
+        finally:
+            graph.in_flight -= 1
+            if graph.evicted and graph.in_flight == 0:
+                self._close(session_id, graph)
+
+    def _on_evict(self, session_id: Hashable, graph: SessionAgentGraph) -> None:
+        logging.info(f"Evicting agents of session {session_id}")
+        graph.evicted = True
+        if graph.in_flight:
+            # Deleted by pinned() once the running work is done
+            return
+        self._close(session_id, graph)
+
+    def _close(self, session_id: Hashable, graph: SessionAgentGraph) -> None:
+        thread = graph.thread
+        if thread is None or thread.id is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(self._delete_thread(session_id, thread))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    @staticmethod
+    async def _delete_thread(session_id: Hashable, thread: AzureAIAgentThread) -> None:
+        try:
+            await thread.delete()
+        except Exception as e:
+            logging.warning(f"Failed to delete thread of session {session_id}: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return entry count, eviction counters and approximate size in bytes.
+
+        Sizes are measured when agents are added, so this stays cheap to call.
+        """
+        stats = self._graphs.stats()
+        stats["agents"] = 0
+        stats["pinned"] = 0
+        stats["approximate_bytes"] = 0
+        for _, graph in self._graphs.items():
+            stats["agents"] += len(graph.agents)
+            stats["pinned"] += int(graph.in_flight > 0)
+            stats["approximate_bytes"] += sum(graph.agent_bytes.values())
+        return stats
@@ -0,0 +1,213 @@
+# agent_definition_registry.py
+
+import asyncio
+import hashlib
+import json
+import logging
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Import the AppConfig instance
+from app_config import config
+
+# (agent_name, instructions hash, response_format hash)
+DefinitionKey = Tuple[str, str, str]
+
+# Page size used when listing agents from the AI project service
+LIST_AGENTS_PAGE_SIZE = 100
+
+
+def _hash_value(value: Any) -> str:
+    """Return a stable short hash of a string or JSON-like value."""
+    if hasattr(value, "as_dict"):
+        value = value.as_dict()
+    if not isinstance(value, str):
+        value = json.dumps(value, sort_keys=True, default=str)
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()[:16]
+
+
+def definition_key(
+    agent_name: str, instructions: Optional[str], response_format: Any = None
+) -> DefinitionKey:
+    """Return the registry key of an agent definition.
+
+    A missing response format and ``"auto"`` are treated as the same format.
+    """
+    if response_format is None:
+        response_format = "auto"
+    return (agent_name, _hash_value(instructions or ""), _hash_value(response_format))
+
+
+class AgentDefinitionRegistry:
+    """Process-wide cache of Azure AI agent definitions.
+
+    Definitions are looked up by name, instructions and response format, so an
+    agent whose instructions changed gets a new definition instead of a stale one.
+    The registry is warmed with one paginated ``list_agents`` scan and refreshed on
+    a timer; creating agents for a session then needs no listing calls at all.
+    """
+
+    def __init__(self, client_provider: Callable[[], Any]) -> None:
+        """Initialize an empty registry.
+
+        Args:
+            client_provider: Returns the AIProjectClient used when none is passed
+        """
+        self._client_provider = client_provider
+        self._definitions: Dict[DefinitionKey, Any] = {}
+        self._warmed = False
+        # One lock per definition, so only creations of the same agent wait
+        self._create_locks: Dict[DefinitionKey, asyncio.Lock] = {}
+        # Sequence number of each definition created here, to tell whether it
+        # was created after a listing started
+        self._creations = 0
+        self._created_at: Dict[DefinitionKey, int] = {}
+        self._warm_lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+        self.refreshes = 0
+        self.hits = 0
+        self.created = 0
+
+    def __len__(self) -> int:
+        return len(self._definitions)
+
+    async def refresh(self, client=None) -> int:
+        """Reload every agent definition from the AI project service.
+
+        The listing replaces the cached definitions, so definitions deleted in the
+        project are dropped. Definitions created here while the listing was in
+        flight are kept, as the listing may not include them.
+
+        Returns:
+            The number of definitions loaded, or -1 if listing failed
+        """
+        started = self._creations
+        try:
+            client = client or self._client_provider()
+            definitions: Dict[DefinitionKey, Any] = {}
+            after = None
+            while True:
+                page = await client.agents.list_agents(
+                    limit=LIST_AGENTS_PAGE_SIZE, after=after
+                )
+                for definition in page.data:
+                    key = definition_key(
+                        definition.name,
+                        definition.instructions,
+                        definition.response_format,
+                    )
+                    # The service lists newest first; keep the newest duplicate
+                    definitions.setdefault(key, definition)
+                if not page.has_more or not page.data:
+                    break
+                after = page.last_id
+        except Exception as e:
+            logging.exception(f"Failed to list Azure AI agent definitions: {e}")
+            return -1
+
+        for key, created in list(self._created_at.items()):
+            if created < started:
+                # Created before the listing started, so the listing is current
+                del self._created_at[key]
+            elif key not in definitions and key in self._definitions:
+                definitions[key] = self._definitions[key]
+        self._definitions = definitions
+        self._warmed = True
+        self.refreshes += 1
+        logging.info(f"Loaded {len(definitions)} Azure AI agent definitions")
+        return len(definitions)
+
+    async def get_or_create(
+        self,
+        agent_name: str,
+        instructions: str,
+        response_format: Any = None,
+        temperature: float = 0.0,
+        client=None,
+    ) -> Any:
+        """Return a matching agent definition, creating it if none exists.
+
+        Args:
+            agent_name: The name of the agent
+            instructions: The system message / instructions for the agent
+            response_format: Optional response format to control structured output
+            temperature: The temperature setting used when creating the agent
+            client: Optional AIProjectClient; defaults to the shared one
+        """
+        key = definition_key(agent_name, instructions, response_format)
+        definition = self._definitions.get(key)
+        if definition is not None:
+            self.hits += 1
+            return definition
+
+        client = client or self._client_provider()
+        if not self._warmed:
+            # Startup warm-up did not happen or failed; list once now
+            async with self._warm_lock:
+                if not self._warmed:
+                    await self.refresh(client)
+            definition = self._definitions.get(key)
+            if definition is not None:
+                self.hits += 1
+                return definition
+
+        lock = self._create_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # Another task may have created it while this one waited
+            definition = self._definitions.get(key)
+            if definition is not None:
+                self.hits += 1
+                return definition
+
+            logging.info(f"Creating Azure AI agent definition for {agent_name}")
+            definition = await client.agents.create_agent(
+                model=config.AZURE_OPENAI_DEPLOYMENT_NAME,
+                name=agent_name,
+                instructions=instructions,
+                temperature=temperature,
+                response_format=response_format,
+            )
+            self._definitions[key] = definition
+            self._created_at[key] = self._creations
+            self._creations += 1
+            self.created += 1
+            return definition
+
+    def start_refresh(self, interval_seconds: float) -> None:
+        """Refresh the registry in the background every ``interval_seconds``."""
+        if interval_seconds <= 0 or self._refresh_task is not None:
+            return
+
+        async def refresh_forever() -> None:
+            while True:
+                await asyncio.sleep(interval_seconds)
+                await self.refresh()
+
+        self._refresh_task = asyncio.create_task(refresh_forever())
+
+    async def stop_refresh(self) -> None:
+        """Stop the background refresh."""
+        if self._refresh_task is None:
+            return
+        self._refresh_task.cancel()
+        try:
+            await self._refresh_task
+        except asyncio.CancelledError:
+            pass
+        self._refresh_task = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the number of cached definitions and lookup counters."""
+        return {
+            "definitions": len(self._definitions),
+            "warmed": self._warmed,
+            "refreshes": self.refreshes,
+            "hits": self.hits,
+            "created": self.created,
+        }
+
+
+# Process-wide registry shared by every agent
+agent_definitions = AgentDefinitionRegistry(
+    client_provider=config.get_ai_project_client
+)
@@ -1,9 +1,11 @@
 """Factory for creating agents in the Multi-Agent Custom Automation Engine."""
 
+import asyncio
 import inspect
 import logging
+import time
 from types import SimpleNamespace
-from typing import Any, Callable, Dict, List, Optional, Type
+from typing import Any, Callable, Dict, List, Optional, Type, Union
 
 # Import the new AppConfig instance
 from app_config import config
@@ -11,11 +13,13 @@ from azure.ai.projects.models import (ResponseFormatJsonSchema,
                                       ResponseFormatJsonSchemaType)
 from context.cosmos_memory_kernel import CosmosMemoryContext
 from kernel_agents.agent_base import BaseAgent
+from kernel_agents.agent_cache import SessionAgentCache
 from kernel_agents.generic_agent import GenericAgent
 from kernel_agents.group_chat_manager import GroupChatManager
 # Import all specialized agent implementations
 from kernel_agents.hr_agent import HrAgent
 from kernel_agents.human_agent import HumanAgent
+from kernel_agents.lazy_agent import LazyAgent
 from kernel_agents.marketing_agent import MarketingAgent
 from kernel_agents.planner_agent import PlannerAgent  # Add PlannerAgent import
 from kernel_agents.procurement_agent import ProcurementAgent
@@ -74,14 +78,14 @@ class AgentFactory:
         AgentType.GROUP_CHAT_MANAGER: GroupChatManager.default_system_message(),
     }
 
-    # Cache of agent instances by session_id and agent_type
-    _agent_cache: Dict[str, Dict[AgentType, BaseAgent]] = {}
+    # Bounded cache of each session's agents, thread and construction timings
+    _sessions: SessionAgentCache = SessionAgentCache(
+        max_sessions=config.AGENT_CACHE_MAX_SESSIONS,
+        ttl_seconds=config.AGENT_CACHE_TTL_SECONDS,
+    )
 
-    # Cache of threads
-    _thread_cache: Dict[str, AzureAIAgentThread] = {}
-
-    # Cache of Azure AI Agent instances
-    _azure_ai_agent_cache: Dict[str, Dict[str, AzureAIAgent]] = {}
+    # Aggregated construction times by agent type
+    _construction_stats: Dict[str, Dict[str, float]] = {}
 
     @classmethod
     async def create_agent(
@@ -126,14 +130,12 @@ class AgentFactory:
             ValueError: If the agent type is unknown or initialization fails
         """
         # Check if we already have an agent in the cache
-        if (
-            session_id in cls._agent_cache
-            and agent_type in cls._agent_cache[session_id]
-        ):
+        cached_agent = cls._sessions.get(session_id).agents.get(agent_type)
+        if cached_agent is not None:
             logger.info(
                 f"Returning cached agent instance for session {session_id} and agent type {agent_type}"
             )
-            return cls._agent_cache[session_id][agent_type]
+            return cached_agent
 
         # Get the agent class
         agent_class = cls._agent_classes.get(agent_type)
@@ -187,9 +189,7 @@ class AgentFactory:
             raise
 
         # Cache the agent instance
-        if session_id not in cls._agent_cache:
-            cls._agent_cache[session_id] = {}
-        cls._agent_cache[session_id][agent_type] = agent
+        cls._sessions.get(session_id).add_agent(agent_type, agent)
 
         return agent
 
@@ -201,11 +201,18 @@ class AgentFactory:
         temperature: float = 0.0,
         memory_store: Optional[CosmosMemoryContext] = None,
         client: Optional[Any] = None,
-    ) -> Dict[AgentType, BaseAgent]:
+        lazy: Optional[bool] = None,
+    ) -> Dict[AgentType, Union[BaseAgent, LazyAgent]]:
         """Create all agent types for a session in a specific order.
 
         This method creates all agent instances for a session in a multi-phase approach:
-        1. First, it creates all basic agent types except for the Planner and GroupChatManager
+        1. First, it sets up all basic agent types except for the Planner and
+           GroupChatManager. In lazy mode each one is a LazyAgent proxy that is only
+           built when first used; the GroupChatManager builds the ones an approved
+           plan needs concurrently before running its steps. Otherwise they are all
+           built concurrently up front and an agent that fails to build is logged
+           and left out instead of failing the session. Either way at most
+           AGENT_CREATE_CONCURRENCY agents of a session are built at a time
         2. Then it creates the Planner agent, providing it with references to all other agents
         3. Finally, it creates the GroupChatManager with references to all agents including the Planner
 
@@ -216,10 +223,14 @@ class AgentFactory:
             session_id: The unique identifier for the current session
             user_id: The user identifier for the current user
             temperature: The temperature parameter for agent responses (0.0-1.0)
+            lazy: Build specialists on first use; defaults to on unless AGENT_EAGER_CREATE is set
 
         Returns:
-            Dictionary mapping agent types (from AgentType enum) to initialized agent instances
+            Dictionary mapping agent types (from AgentType enum) to agent instances or
+            lazy proxies for specialists that have not been built yet
         """
+        if lazy is None:
+            lazy = not config.AGENT_EAGER_CREATE
 
         # Create each agent type in two phases
         # First, create all agents except PlannerAgent and GroupChatManager
@@ -227,10 +238,12 @@ class AgentFactory:
         planner_agent_type = AgentType.PLANNER
         group_chat_manager_type = AgentType.GROUP_CHAT_MANAGER
 
-        if cls._thread_cache is None or session_id not in cls._thread_cache:
-            #Create thread for agent conversation
-            thread = AzureAIAgentThread(client=client)
-            cls._thread_cache[session_id] = thread
+        graph = cls._sessions.get(session_id)
+        if graph.thread is None:
+            # Session thread of the agents; specialists run each step on a
+            # thread of their own and only fall back to this one without a client
+            graph.thread = AzureAIAgentThread(client=client)
+        thread = graph.thread
 
         try:
             if client is None:
@@ -240,25 +253,61 @@ class AgentFactory:
         except Exception as client_exc:
             logger.error(f"Error creating AIProjectClient: {client_exc}")
 
-        # Initialize agent cache for this session if it doesn't exist
-        if session_id not in cls._agent_cache:
-            cls._agent_cache[session_id] = {}
-
         # Phase 1: Create all agents except planner and group chat manager
-        for agent_type in [
+        # concurrently; a failing agent is logged and left out of the session
+        semaphore = asyncio.Semaphore(max(1, config.AGENT_CREATE_CONCURRENCY))
+
+        async def create_specialist(agent_type: AgentType) -> Optional[BaseAgent]:
+            async with semaphore:
+                try:
+                    return await cls._create_agent_timed(
+                        agent_type=agent_type,
+                        session_id=session_id,
+                        user_id=user_id,
+                        temperature=temperature,
+                        client=client,
+                        memory_store=memory_store,
+                        thread=thread,
+                    )
+                except Exception as e:
+                    logger.error(
+                        f"Skipping agent {agent_type} for session {session_id}: {e}"
+                    )
+                    return None
+
+        async def build_on_first_use(agent_type: AgentType) -> BaseAgent:
+            # First-use builds of one session share the eager path's limit
+            async with semaphore:
+                return await cls._create_agent_timed(
+                    agent_type=agent_type,
+                    session_id=session_id,
+                    user_id=user_id,
+                    temperature=temperature,
+                    client=client,
+                    memory_store=memory_store,
+                    thread=thread,
+                )
+
+        def lazy_specialist(agent_type: AgentType) -> Union[BaseAgent, LazyAgent]:
+            cached = graph.agents.get(agent_type)
+            if cached is not None:
+                return cached
+            return LazyAgent(agent_type, lambda: build_on_first_use(agent_type))
+
+        specialist_types = [
             at
             for at in cls._agent_classes.keys()
             if at != planner_agent_type and at != group_chat_manager_type
-        ]:
-            agents[agent_type] = await cls.create_agent(
-                agent_type=agent_type,
-                session_id=session_id,
-                user_id=user_id,
-                temperature=temperature,
-                client=client,
-                memory_store=memory_store,
-                thread=cls._thread_cache[session_id],
+        ]
+        if lazy:
+            specialists = [lazy_specialist(at) for at in specialist_types]
+        else:
+            specialists = await asyncio.gather(
+                *(create_specialist(agent_type) for agent_type in specialist_types)
             )
+        for agent_type, agent in zip(specialist_types, specialists):
+            if agent is not None:
+                agents[agent_type] = agent
 
         # Create agent name to instance mapping for the planner
         agent_instances = {}
@@ -276,7 +325,7 @@ class AgentFactory:
         )
 
         # Phase 2: Create the planner agent with agent_instances
-        planner_agent = await cls.create_agent(
+        planner_agent = await cls._create_agent_timed(
             agent_type=AgentType.PLANNER,
             session_id=session_id,
             user_id=user_id,
@@ -297,7 +346,7 @@ class AgentFactory:
         agents[planner_agent_type] = planner_agent
 
         # Phase 3: Create group chat manager with all agents including the planner
-        group_chat_manager = await cls.create_agent(
+        group_chat_manager = await cls._create_agent_timed(
             agent_type=AgentType.GROUP_CHAT_MANAGER,
             session_id=session_id,
             user_id=user_id,
@@ -307,8 +356,55 @@ class AgentFactory:
         )
         agents[group_chat_manager_type] = group_chat_manager
 
+        timings = cls.get_construction_timings(session_id)
+        logger.info(
+            f"Agent construction for session {session_id} (ms): "
+            + ", ".join(f"{t.value}={ms:.0f}" for t, ms in timings.items())
+        )
         return agents
 
+    @classmethod
+    async def _create_agent_timed(
+        cls, agent_type: AgentType, session_id: str, **kwargs
+    ) -> BaseAgent:
+        """Create an agent with ``create_agent`` and record how long it took."""
+        graph = cls._sessions.peek(session_id)
+        cached = graph is not None and agent_type in graph.agents
+        start = time.perf_counter()
+        agent = await cls.create_agent(
+            agent_type=agent_type, session_id=session_id, **kwargs
+        )
+        if not cached:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            cls._sessions.get(session_id).timings[agent_type] = elapsed_ms
+            stats = cls._construction_stats.setdefault(
+                agent_type.value, {"count": 0, "total_ms": 0.0, "max_ms": 0.0}
+            )
+            stats["count"] += 1
+            stats["total_ms"] += elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+            stats["last_ms"] = elapsed_ms
+        return agent
+
+    @classmethod
+    def get_construction_timings(cls, session_id: str) -> Dict[AgentType, float]:
+        """Return the construction time in milliseconds of each agent of a session."""
+        graph = cls._sessions.peek(session_id)
+        return dict(graph.timings) if graph is not None else {}
+
+    @classmethod
+    def construction_stats(cls) -> Dict[str, Dict[str, float]]:
+        """Return construction count, mean, max and last time by agent type."""
+        return {
+            agent_type: {
+                "count": stats["count"],
+                "mean_ms": round(stats["total_ms"] / stats["count"], 1),
+                "max_ms": round(stats["max_ms"], 1),
+                "last_ms": round(stats["last_ms"], 1),
+            }
+            for agent_type, stats in cls._construction_stats.items()
+        }
+
     @classmethod
     def get_agent_class(cls, agent_type: AgentType) -> Type[BaseAgent]:
         """Get the agent class for the specified type.
@@ -335,13 +431,23 @@ class AgentFactory:
             session_id: If provided, clear only this session's cache
         """
         if session_id:
-            if session_id in cls._agent_cache:
-                del cls._agent_cache[session_id]
+            if cls._sessions.pop(session_id) is not None:
                 logger.info(f"Cleared agent cache for session {session_id}")
-            if session_id in cls._azure_ai_agent_cache:
-                del cls._azure_ai_agent_cache[session_id]
-                logger.info(f"Cleared Azure AI agent cache for session {session_id}")
         else:
-            cls._agent_cache.clear()
-            cls._azure_ai_agent_cache.clear()
+            cls._sessions.clear()
             logger.info("Cleared all agent caches")
+
+    @classmethod
+    def pin_session(cls, session_id: str):
+        """Return a context manager keeping a session's thread while work runs."""
+        return cls._sessions.pinned(session_id)
+
+    @classmethod
+    def expire_cache(cls) -> int:
+        """Evict idle sessions, deleting their threads, and return how many."""
+        return cls._sessions.expire()
+
+    @classmethod
+    def cache_stats(cls) -> Dict[str, Any]:
+        """Return cached session count, evictions and approximate size in bytes."""
+        return cls._sessions.stats()
@@ -0,0 +1,181 @@
+"""Per-plan conversation history handed to the agent executing a step."""
+
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+from app_config import config
+from cache_utils import LRUTTLCache
+from models.messages_kernel import AgentType, Plan, Step
+
+HISTORY_INTRO = (
+    "<conversation_history>Here is the conversation history so far for the current "
+    "plan. This information may or may not be relevant to the step you have been "
+    "asked to execute."
+)
+HISTORY_END = "<conversation_history \\>"
+
+
+def estimate_tokens(text: str) -> int:
+    """Return a rough token count of text, at about four characters per token."""
+    return max(1, len(text) // 4)
+
+
+class HistoryEntry:
+    """One previous step of the conversation, rendered in full and summarized."""
+
+    __slots__ = ("source", "text", "tokens", "summary", "summary_tokens")
+
+    def __init__(self, position: int, step: Step, summary_chars: int) -> None:
+        # The values the entry was rendered from, to detect a re-executed step
+        self.source = (position, step.action, step.agent_reply)
+        manager = AgentType.GROUP_CHAT_MANAGER.value
+        heading = f"Step {position}\n{manager}: {step.action}\n"
+        reply = f"{step.agent_reply}"
+        self.text = f"{heading}{step.agent.value}: {reply}\n"
+        self.tokens = estimate_tokens(self.text)
+        if len(reply) > summary_chars:
+            reply = reply[:summary_chars].rstrip() + " [...]"
+        self.summary = f"{heading}{step.agent.value}: {reply}\n"
+        self.summary_tokens = estimate_tokens(self.summary)
+
+
+class PlanHistory:
+    """Conversation history of one plan, built up one completed step at a time.
+
+    Each step's entry is rendered once, when its reply is first seen, and reused
+    for every later step. Rendering keeps the most recent steps in full within the
+    token budget; older steps are shortened to a summary and the oldest are left
+    out once even their summaries no longer fit.
+    """
+
+    def __init__(self, token_budget: int, summary_chars: int) -> None:
+        """Initialize an empty history.
+
+        Args:
+            token_budget: Approximate tokens the previous steps may take up
+            summary_chars: Characters of a reply kept when a step is summarized
+        """
+        self._token_budget = max(0, token_budget)
+        self._summary_chars = max(0, summary_chars)
+        self._entries: Dict[str, HistoryEntry] = {}
+        self.summarized = 0
+        self.omitted = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _entry(self, position: int, step: Step) -> HistoryEntry:
+        entry = self._entries.get(step.id)
+        if entry is None or entry.source != (position, step.action, step.agent_reply):
+            entry = HistoryEntry(position, step, self._summary_chars)
+            # Steps still waiting for their reply are rendered again next time
+            if step.agent_reply is not None:
+                self._entries[step.id] = entry
+        return entry
+
+    def render(self, plan: Plan, steps: Sequence[Step], step_ids: Set[str]) -> str:
+        """Return the history of the given previous steps for an agent prompt.
+
+        Args:
+            plan: The plan the steps belong to
+            steps: Every step of the plan, in plan order
+            step_ids: IDs of the steps to include
+        """
+        entries = [
+            self._entry(position, step)
+            for position, step in enumerate(steps)
+            if step.id in step_ids
+        ]
+
+        # Fill the budget from the most recent step backwards
+        selected: List[str] = []
+        used = 0
+        omitted = 0
+        for index in range(len(entries) - 1, -1, -1):
+            entry = entries[index]
+            if used + entry.tokens <= self._token_budget:
+                selected.append(entry.text)
+                used += entry.tokens
+            elif used + entry.summary_tokens <= self._token_budget:
+                selected.append(entry.summary)
+                used += entry.summary_tokens
+                self.summarized += 1
+            else:
+                omitted = index + 1
+                break
+        selected.reverse()
+        self.omitted += omitted
+
+        parts = [
+            HISTORY_INTRO,
+            f"The user's task was:\n{plan.summary}\n\n",
+            f" human_clarification_request:\n{plan.human_clarification_request}\n\n",
+            f" human_clarification_response:\n{plan.human_clarification_response}\n\n",
+            "The conversation between the previous agents so far is below:\n",
+        ]
+        if omitted:
+            parts.append(
+                f"({omitted} earlier steps are left out to keep the history short)\n"
+            )
+        parts.extend(selected)
+        parts.append(HISTORY_END)
+        return "".join(parts)
+
+
+class ConversationHistories:
+    """Process-wide LRU/TTL cache of plan histories, keyed by user and plan."""
+
+    def __init__(
+        self,
+        max_plans: int = 512,
+        ttl_seconds: float = 3600,
+        token_budget: int = 8000,
+        summary_chars: int = 300,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_plans: Maximum number of plan histories kept
+            ttl_seconds: Seconds since last use before a history is dropped
+            token_budget: Approximate tokens of previous steps per prompt
+            summary_chars: Characters of a reply kept when a step is summarized
+        """
+        self._histories = LRUTTLCache(max_entries=max_plans, ttl_seconds=ttl_seconds)
+        self._token_budget = token_budget
+        self._summary_chars = summary_chars
+
+    def get(self, user_id: str, plan_id: str) -> PlanHistory:
+        """Return the history of a plan, creating it if needed, and mark it used."""
+        key = (user_id, plan_id)
+        history: Optional[PlanHistory] = self._histories.get(key)
+        if history is None:
+            history = PlanHistory(self._token_budget, self._summary_chars)
+        # Storing again restarts the TTL, so it counts from the last use
+        self._histories.set(key, history)
+        return history
+
+    def invalidate(self, user_id: str, plan_id: str) -> None:
+        """Drop the history of a plan."""
+        self._histories.pop((user_id, plan_id))
+
+    def clear(self) -> None:
+        """Drop every plan history."""
+        self._histories.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cached plan and step counts and how often history was shortened."""
+        stats = self._histories.stats()
+        stats["plans"] = stats.pop("entries")
+        histories = [history for _, history in self._histories.items()]
+        stats["steps"] = sum(len(history) for history in histories)
+        stats["summarized"] = sum(history.summarized for history in histories)
+        stats["omitted"] = sum(history.omitted for history in histories)
+        return stats
+
+
+# Process-wide plan histories used by the GroupChatManager
+conversation_histories = ConversationHistories(
+    max_plans=config.CONVERSATION_HISTORY_MAX_PLANS,
+    ttl_seconds=config.CONVERSATION_HISTORY_TTL_SECONDS,
+    token_budget=config.CONVERSATION_HISTORY_TOKEN_BUDGET,
+    summary_chars=config.CONVERSATION_HISTORY_SUMMARY_CHARS,
+)
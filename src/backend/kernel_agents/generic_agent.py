@@ -5,6 +5,7 @@ import semantic_kernel as sk
 from context.cosmos_memory_kernel import CosmosMemoryContext
 from kernel_agents.agent_base import BaseAgent
 from kernel_tools.generic_tools import GenericTools
+from kernel_tools.tool_registry import kernel_functions, tool_methods
 from models.messages_kernel import AgentType
 from semantic_kernel.functions import KernelFunction
 
@@ -39,10 +40,8 @@ class GenericAgent(BaseAgent):
         """
         # Load configuration if tools not provided
         if not tools:
-            # Get tools directly from GenericTools class
-            tools_dict = GenericTools.get_all_kernel_functions()
-
-            tools = [KernelFunction.from_method(func) for func in tools_dict.values()]
+            # Use the precomputed GenericTools functions shared by every instance
+            tools = list(kernel_functions(GenericTools))
 
             # Use system message from config if not explicitly provided
             if not system_message:
@@ -126,7 +125,7 @@ class GenericAgent(BaseAgent):
     @property
     def plugins(self):
         """Get the plugins for the generic agent."""
-        return GenericTools.get_all_kernel_functions()
+        return tool_methods(GenericTools)
 
     # Explicitly inherit handle_action_request from the parent class
     async def handle_action_request(self, action_request_json: str) -> str:
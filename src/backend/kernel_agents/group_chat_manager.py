@@ -1,3 +1,4 @@
+import asyncio
 import json
 import logging
 import re
@@ -5,9 +6,14 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple
 
 import semantic_kernel as sk
+from app_config import config
 from context.cosmos_memory_kernel import CosmosMemoryContext
 from event_utils import track_event_if_configured
 from kernel_agents.agent_base import BaseAgent
+from kernel_agents.conversation_history import conversation_histories
+from kernel_agents.lazy_agent import resolve_agent
+from kernel_agents.step_scheduler import (predecessors, run_step_graph,
+                                          step_dependencies)
 from models.messages_kernel import (ActionRequest, ActionResponse,
                                     AgentMessage, AgentType, HumanFeedback,
                                     HumanFeedbackStatus, InputTask, Plan,
@@ -81,6 +87,10 @@ class GroupChatManager(BaseAgent):
         ]
         self._agent_tools_list = agent_tools_list or []
         self._agent_instances = agent_instances or {}
+        # Limits how many independent steps of this session run at once
+        self._step_semaphore = asyncio.Semaphore(
+            max(1, config.GROUP_CHAT_STEP_CONCURRENCY)
+        )
 
         # Create the Azure AI Agent for group chat operations
         # This will be initialized in async_init
@@ -253,7 +263,9 @@ class GroupChatManager(BaseAgent):
         # Update and execute the specific step if step_id is provided
         if message.step_id:
             step = next((s for s in steps if s.id == message.step_id), None)
-            if step:
+            if step and message.approved and self._already_executed(step):
+                logging.info(f"Step {step.id} was already executed, skipping it")
+            elif step:
                 await self._update_step_status(
                     step, message.approved, received_human_feedback
                 )
@@ -264,7 +276,7 @@ class GroupChatManager(BaseAgent):
                     # TODO: Implement this logic later
                     step.status = StepStatus.rejected
                     step.human_approval_status = HumanFeedbackStatus.rejected
-                    self._memory_store.update_step(step)
+                    await self._memory_store.update_step(step)
                     track_event_if_configured(
                         "Group Chat Manager - Steps has been rejected and updated into the cosmos",
                         {
@@ -275,32 +287,81 @@ class GroupChatManager(BaseAgent):
                             "source": step.agent,
                         },
                     )
+        elif message.approved:
+            # Update and execute all steps if no specific step_id is provided;
+            # steps that do not depend on each other run concurrently
+            async def approve_and_execute(step: Step) -> None:
+                if self._already_executed(step):
+                    # A retried or repeated approval leaves finished steps alone
+                    logging.info(f"Step {step.id} was already executed, skipping it")
+                    return
+                await self._update_step_status(
+                    step, message.approved, received_human_feedback
+                )
+                await self._execute_step(message.session_id, step)
+
+            await self._build_agents_for(steps)
+            await run_step_graph(steps, approve_and_execute, self._step_semaphore)
         else:
-            # Update and execute all steps if no specific step_id is provided
+            # Reject all steps if no specific step_id is provided
             for step in steps:
                 await self._update_step_status(
                     step, message.approved, received_human_feedback
                 )
-                if message.approved:
-                    await self._execute_step(message.session_id, step)
-                else:
-                    # Notify the GroupChatManager that the step has been rejected
-                    # TODO: Implement this logic later
-                    step.status = StepStatus.rejected
-                    step.human_approval_status = HumanFeedbackStatus.rejected
-                    self._memory_store.update_step(step)
-                    track_event_if_configured(
-                        f"{AgentType.GROUP_CHAT_MANAGER.value} - Step has been rejected and updated into the cosmos",
-                        {
-                            "status": StepStatus.rejected,
-                            "session_id": message.session_id,
-                            "user_id": self._user_id,
-                            "human_approval_status": HumanFeedbackStatus.rejected,
-                            "source": step.agent,
-                        },
-                    )
+                # Notify the GroupChatManager that the step has been rejected
+                # TODO: Implement this logic later
+                step.status = StepStatus.rejected
+                step.human_approval_status = HumanFeedbackStatus.rejected
+                await self._memory_store.update_step(step)
+                track_event_if_configured(
+                    f"{AgentType.GROUP_CHAT_MANAGER.value} - Step has been rejected and updated into the cosmos",
+                    {
+                        "status": StepStatus.rejected,
+                        "session_id": message.session_id,
+                        "user_id": self._user_id,
+                        "human_approval_status": HumanFeedbackStatus.rejected,
+                        "source": step.agent,
+                    },
+                )
+
+    @staticmethod
+    def _already_executed(step: Step) -> bool:
+        """Return True if an approved step already ran.
+
+        Specialist steps are done once their agent replied; a failed reply leaves
+        the step to run again. Human steps complete as soon as they are approved.
+        """
+        if step.agent == AgentType.HUMAN:
+            return (
+                step.status == StepStatus.completed
+                and step.human_approval_status == HumanFeedbackStatus.accepted
+            )
+        return step.agent_reply is not None
 
     # Function to update step status and add feedback
+    async def _build_agents_for(self, steps: List[Step]) -> None:
+        """Build the lazily created specialists a plan needs, concurrently.
+
+        Steps run in dependency order, so without this an agent would only be
+        built once the step before it finished. A failed build is logged and
+        tried again when its step runs.
+        """
+        agent_names = {
+            step.agent.value
+            for step in steps
+            if step.agent != AgentType.HUMAN and not self._already_executed(step)
+        }
+        names = sorted(name for name in agent_names if name in self._agent_instances)
+        results = await asyncio.gather(
+            *(resolve_agent(self._agent_instances[name]) for name in names),
+            return_exceptions=True,
+        )
+        for name, result in zip(names, results):
+            if isinstance(result, Exception):
+                logging.warning(
+                    f"Building agent {name} ahead of its steps failed: {result}"
+                )
+
     async def _update_step_status(
         self, step: Step, approved: bool, received_human_feedback: str
     ):
@@ -346,29 +407,13 @@ class GroupChatManager(BaseAgent):
         plan = await self._memory_store.get_plan_by_session(session_id=session_id)
         steps: List[Step] = await self._memory_store.get_steps_by_plan(plan.id)
 
-        current_step_id = step.id
-        # Initialize the formatted string
-        formatted_string = ""
-        formatted_string += "<conversation_history>Here is the conversation history so far for the current plan. This information may or may not be relevant to the step you have been asked to execute."
-        formatted_string += f"The user's task was:\n{plan.summary}\n\n"
-        formatted_string += (
-            f" human_clarification_request:\n{plan.human_clarification_request}\n\n"
-        )
-        formatted_string += (
-            f" human_clarification_response:\n{plan.human_clarification_response}\n\n"
-        )
-        formatted_string += (
-            "The conversation between the previous agents so far is below:\n"
-        )
-
-        # Iterate over the steps until the current_step_id
-        for i, step in enumerate(steps):
-            if step.id == current_step_id:
-                break
-            formatted_string += f"Step {i}\n"
-            formatted_string += f"{AgentType.GROUP_CHAT_MANAGER.value}: {step.action}\n"
-            formatted_string += f"{step.agent.value}: {step.agent_reply}\n"
-        formatted_string += "<conversation_history \\>"
+        # Only the steps this step depends on, directly or transitively, are
+        # complete when it runs; with the default chain that is every earlier step
+        history_step_ids = predecessors(step.id, step_dependencies(steps))
+        # Entries of previous steps are rendered once per plan and reused; the
+        # history is kept within the configured token budget
+        history = conversation_histories.get(self._user_id, plan.id)
+        formatted_string = history.render(plan, steps, history_step_ids)
 
         logging.info(f"Formatted string: {formatted_string}")
 
@@ -433,8 +478,9 @@ class GroupChatManager(BaseAgent):
                 },
             )
         else:
-            # Use the agent from the step to determine which agent to send to
-            agent = self._agent_instances[step.agent.value]
+            # Use the agent from the step to determine which agent to send to;
+            # specialists are built here the first time a step is routed to them
+            agent = await resolve_agent(self._agent_instances[step.agent.value])
             await agent.handle_action_request(
                 action_request
             )  # this function is in base_agent.py
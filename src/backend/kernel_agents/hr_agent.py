@@ -5,6 +5,7 @@ import semantic_kernel as sk
 from context.cosmos_memory_kernel import CosmosMemoryContext
 from kernel_agents.agent_base import BaseAgent
 from kernel_tools.hr_tools import HrTools
+from kernel_tools.tool_registry import kernel_functions, tool_methods
 from models.messages_kernel import AgentType
 from semantic_kernel.functions import KernelFunction
 
@@ -44,9 +45,8 @@ class HrAgent(BaseAgent):
         """
         # Load configuration if tools not provided
         if not tools:
-            # Get tools directly from HrTools class
-            tools_dict = HrTools.get_all_kernel_functions()
-            tools = [KernelFunction.from_method(func) for func in tools_dict.values()]
+            # Use the precomputed HrTools functions shared by every instance
+            tools = list(kernel_functions(HrTools))
 
             # Use system message from config if not explicitly provided
             if not system_message:
@@ -128,4 +128,4 @@ class HrAgent(BaseAgent):
     @property
     def plugins(self):
         """Get the plugins for the HR agent."""
-        return HrTools.get_all_kernel_functions()
+        return tool_methods(HrTools)
@@ -0,0 +1,68 @@
+"""Lazy proxy for agents that are only built when they are first used."""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Optional, Union
+
+from kernel_agents.agent_base import BaseAgent
+from models.messages_kernel import ActionRequest, AgentType
+
+
+class LazyAgent:
+    """Stands in for a specialist agent until a step is routed to it.
+
+    Building an agent creates its tools and looks up its remote definition, which
+    most plans never need for most agents. The proxy builds the agent once, on the
+    first ``handle_action_request`` (or explicit ``get``), and then delegates to it.
+    A failed build is not cached, so the next use tries again.
+    """
+
+    def __init__(
+        self, agent_type: AgentType, factory: Callable[[], Awaitable[BaseAgent]]
+    ) -> None:
+        """Initialize the proxy.
+
+        Args:
+            agent_type: The type of the agent behind the proxy
+            factory: Coroutine function building the agent
+        """
+        self.agent_type = agent_type
+        self._factory = factory
+        self._agent: Optional[BaseAgent] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_built(self) -> bool:
+        """Return True once the agent has been built."""
+        return self._agent is not None
+
+    async def get(self) -> BaseAgent:
+        """Return the agent, building it on first use."""
+        if self._agent is not None:
+            return self._agent
+        async with self._lock:
+            if self._agent is None:
+                logging.info(f"Building agent {self.agent_type.value} on first use")
+                self._agent = await self._factory()
+        return self._agent
+
+    async def handle_action_request(self, action_request: ActionRequest) -> str:
+        """Build the agent if needed and let it handle the action request."""
+        agent = await self.get()
+        return await agent.handle_action_request(action_request)
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for attributes the proxy itself does not define
+        agent = self.__dict__.get("_agent")
+        if agent is None:
+            raise AttributeError(
+                f"Agent {self.agent_type.value} has not been built yet; await get() first"
+            )
+        return getattr(agent, name)
+
+
+async def resolve_agent(agent: Union[BaseAgent, LazyAgent]) -> BaseAgent:
+    """Return the real agent behind a possibly lazy agent."""
+    if isinstance(agent, LazyAgent):
+        return await agent.get()
+    return agent
@@ -5,6 +5,7 @@ import semantic_kernel as sk
 from context.cosmos_memory_kernel import CosmosMemoryContext
 from kernel_agents.agent_base import BaseAgent
 from kernel_tools.marketing_tools import MarketingTools
+from kernel_tools.tool_registry import kernel_functions, tool_methods
 from models.messages_kernel import AgentType
 from semantic_kernel.functions import KernelFunction
 
@@ -42,9 +43,8 @@ class MarketingAgent(BaseAgent):
         """
         # Load configuration if tools not provided
         if not tools:
-            # Get tools directly from MarketingTools class
-            tools_dict = MarketingTools.get_all_kernel_functions()
-            tools = [KernelFunction.from_method(func) for func in tools_dict.values()]
+            # Use the precomputed MarketingTools functions shared by every instance
+            tools = list(kernel_functions(MarketingTools))
 
         # Use system message from config if not explicitly provided
         if not system_message:
@@ -127,4 +127,4 @@ class MarketingAgent(BaseAgent):
     @property
     def plugins(self):
         """Get the plugins for the marketing agent."""
-        return MarketingTools.get_all_kernel_functions()
+        return tool_methods(MarketingTools)
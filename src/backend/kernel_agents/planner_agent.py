@@ -12,12 +12,8 @@ from azure.ai.projects.models import (ResponseFormatJsonSchema,
 from context.cosmos_memory_kernel import CosmosMemoryContext
 from event_utils import track_event_if_configured
 from kernel_agents.agent_base import BaseAgent
-from kernel_tools.generic_tools import GenericTools
-from kernel_tools.hr_tools import HrTools
-from kernel_tools.marketing_tools import MarketingTools
-from kernel_tools.procurement_tools import ProcurementTools
-from kernel_tools.product_tools import ProductTools
-from kernel_tools.tech_support_tools import TechSupportTools
+from kernel_agents.reply_stream import collect_reply
+from kernel_tools.tools_catalog import get_tools_catalog
 from models.messages_kernel import (AgentMessage, AgentType,
                                     HumanFeedbackStatus, InputTask, Plan,
                                     PlannerResponsePlan, PlanStatus, Step,
@@ -89,14 +85,9 @@ class PlannerAgent(BaseAgent):
             AgentType.TECH_SUPPORT.value,
             AgentType.GENERIC.value,
         ]
-        self._agent_tools_list = {
-            AgentType.HR: HrTools.generate_tools_json_doc(),
-            AgentType.MARKETING: MarketingTools.generate_tools_json_doc(),
-            AgentType.PRODUCT: ProductTools.generate_tools_json_doc(),
-            AgentType.PROCUREMENT: ProcurementTools.generate_tools_json_doc(),
-            AgentType.TECH_SUPPORT: TechSupportTools.generate_tools_json_doc(),
-            AgentType.GENERIC: GenericTools.generate_tools_json_doc(),
-        }
+        # Tool descriptions are built once per process and shared by all planners
+        self._tools_catalog = get_tools_catalog()
+        self._agent_tools_list = self._tools_catalog.json_docs
 
         self._agent_instances = agent_instances or {}
 
@@ -305,6 +296,24 @@ class PlannerAgent(BaseAgent):
 
         return "Plan updated with human clarification"
 
+    @staticmethod
+    def _resolve_dependencies(
+        positions: Optional[List[int]], previous_steps: List[Step], position: int
+    ) -> Optional[List[str]]:
+        """Map the planner's step positions to the IDs of earlier steps.
+
+        Positions that do not refer to an earlier step are dropped, so the
+        dependencies always form a DAG. None keeps the default of depending on
+        the previous step.
+        """
+        if positions is None:
+            return None
+        return [
+            previous_steps[i].id
+            for i in dict.fromkeys(positions)
+            if 0 <= i < position
+        ]
+
     async def _create_structured_plan(
         self, input_task: InputTask
     ) -> Tuple[Plan, List[Step]]:
@@ -336,13 +345,9 @@ class PlannerAgent(BaseAgent):
                 thread=thread,
             )
 
-            # Call invoke with proper keyword arguments and JSON response schema
-            response_content = ""
-
-            # Collect the response from the async generator
-            async for chunk in async_generator:
-                if chunk is not None:
-                    response_content += str(chunk)
+            # Collect the response from the async generator; the plan is JSON, so
+            # it is only used once complete
+            response_content = await collect_reply(async_generator, self._agent_name)
 
             logging.info(f"Response content length: {len(response_content)}")
 
@@ -387,12 +392,9 @@ class PlannerAgent(BaseAgent):
                 human_clarification_request=human_clarification_request,
             )
 
-            # Store the plan
-            await self._memory_store.add_plan(plan)
-
             # Create steps from the parsed data
             steps = []
-            for step_data in steps_data:
+            for position, step_data in enumerate(steps_data):
                 action = step_data.action
                 agent_name = step_data.agent
 
@@ -413,19 +415,24 @@ class PlannerAgent(BaseAgent):
                     agent=agent_name,
                     status=StepStatus.planned,
                     human_approval_status=HumanFeedbackStatus.requested,
+                    depends_on=self._resolve_dependencies(
+                        step_data.depends_on, steps, position
+                    ),
                 )
 
-                # Store the step
-                await self._memory_store.add_step(step)
                 steps.append(step)
 
+            # Store the plan and all of its steps in one transactional batch
+            await self._memory_store.add_plan_with_steps(plan, steps)
+
+            for step in steps:
                 try:
                     track_event_if_configured(
                         "Planner - Added planned individual step into the cosmos",
                         {
                             "plan_id": plan.id,
-                            "action": action,
-                            "agent": agent_name,
+                            "action": step.action,
+                            "agent": step.agent,
                             "status": StepStatus.planned,
                             "session_id": input_task.session_id,
                             "user_id": self._user_id,
@@ -458,9 +465,6 @@ class PlannerAgent(BaseAgent):
                 timestamp=datetime.datetime.utcnow().isoformat(),
             )
 
-            # Store the dummy plan
-            await self._memory_store.add_plan(dummy_plan)
-
             # Create a dummy step for analyzing the task
             dummy_step = Step(
                 id=str(uuid.uuid4()),
@@ -474,9 +478,6 @@ class PlannerAgent(BaseAgent):
                 timestamp=datetime.datetime.utcnow().isoformat(),
             )
 
-            # Store the dummy step
-            await self._memory_store.add_step(dummy_step)
-
             # Add a second step to request human clarification
             clarification_step = Step(
                 id=str(uuid.uuid4()),
@@ -490,8 +491,10 @@ class PlannerAgent(BaseAgent):
                 timestamp=datetime.datetime.utcnow().isoformat(),
             )
 
-            # Store the clarification step
-            await self._memory_store.add_step(clarification_step)
+            # Store the dummy plan and both steps in one transactional batch
+            await self._memory_store.add_plan_with_steps(
+                dummy_plan, [dummy_step, clarification_step]
+            )
 
             # Log the event
             try:
@@ -524,14 +527,8 @@ class PlannerAgent(BaseAgent):
         # Create a list of available agents
         agents_str = ", ".join(self._available_agents)
 
-        # Create list of available tools in JSON-like format
-        tools_list = []
-
-        for agent_name, tools in self._agent_tools_list.items():
-            if agent_name in self._available_agents:
-                tools_list.append(tools)
-
-        tools_str = str(tools_list)
+        # Pre-rendered list of the available agents' tools
+        tools_str = self._tools_catalog.prompt_text(self._available_agents)
 
         # Return a dictionary with template variables
         return {
@@ -575,6 +572,8 @@ class PlannerAgent(BaseAgent):
 
             Ensure the summary of the plan and the overall steps is less than 50 words.
 
+            For each step, set depends_on to the zero-based positions of the earlier steps whose results the step needs. Use an empty list for a step that needs no result from another step, so it can run alongside them. If you are unsure, leave depends_on as null and the step will wait for the step before it.
+
             Identify any additional information that might be required to complete the task. Include this information in the plan in the human_clarification_request field of the plan. If it is not required, leave it as null. Do not include information that you are waiting for clarification on in the string of the action field, as this otherwise won't get updated.
 
             You must prioritise using the provided functions to accomplish each step. First evaluate each and every function the agents have access too. Only if you cannot find a function needed to complete the task, and you have reviewed each and every function, and determined why each are not suitable, there are two options you can take when generating the plan.
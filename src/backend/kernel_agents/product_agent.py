@@ -5,6 +5,7 @@ import semantic_kernel as sk
 from context.cosmos_memory_kernel import CosmosMemoryContext
 from kernel_agents.agent_base import BaseAgent
 from kernel_tools.product_tools import ProductTools
+from kernel_tools.tool_registry import kernel_functions, tool_methods
 from models.messages_kernel import AgentType
 from semantic_kernel.functions import KernelFunction
 
@@ -46,9 +47,8 @@ class ProductAgent(BaseAgent):
         """
         # Load configuration if tools not provided
         if not tools:
-            # Get tools directly from ProductTools class
-            tools_dict = ProductTools.get_all_kernel_functions()
-            tools = [KernelFunction.from_method(func) for func in tools_dict.values()]
+            # Use the precomputed ProductTools functions shared by every instance
+            tools = list(kernel_functions(ProductTools))
 
         # Use system message from config if not explicitly provided
         if not system_message:
@@ -131,7 +131,7 @@ class ProductAgent(BaseAgent):
     @property
     def plugins(self):
         """Get the plugins for the product agent."""
-        return ProductTools.get_all_kernel_functions()
+        return tool_methods(ProductTools)
 
     # Explicitly inherit handle_action_request from the parent class
     # This is not technically necessary but makes the inheritance explicit
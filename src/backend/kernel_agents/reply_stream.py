@@ -0,0 +1,116 @@
+"""Collection of agent replies, chunk by chunk, with latency metrics."""
+
+import time
+from typing import Any, AsyncIterable, Callable, Dict, List, Optional
+
+# Called with the text of each chunk and its position in the reply
+ChunkHandler = Callable[[str, int], None]
+
+
+class ReplyMetrics:
+    """Time to first token and total reply time of agent replies, by agent."""
+
+    def __init__(self) -> None:
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def record(
+        self,
+        agent_name: str,
+        first_chunk_ms: Optional[float],
+        total_ms: float,
+        chunks: int,
+        streamed: bool,
+    ) -> None:
+        """Record one reply.
+
+        Args:
+            agent_name: The agent that replied
+            first_chunk_ms: Milliseconds until the first non-empty chunk, if any
+            total_ms: Milliseconds until the reply was complete
+            chunks: Number of non-empty chunks received
+            streamed: Whether the reply was requested as a stream
+        """
+        stats = self._stats.setdefault(
+            agent_name,
+            {
+                "count": 0,
+                "streamed": 0,
+                "chunks": 0,
+                "ttft_count": 0,
+                "ttft_total_ms": 0.0,
+                "ttft_max_ms": 0.0,
+                "total_ms": 0.0,
+            },
+        )
+        stats["count"] += 1
+        stats["streamed"] += int(streamed)
+        stats["chunks"] += chunks
+        stats["total_ms"] += total_ms
+        stats["last_total_ms"] = total_ms
+        if first_chunk_ms is not None:
+            stats["ttft_count"] += 1
+            stats["ttft_total_ms"] += first_chunk_ms
+            stats["ttft_max_ms"] = max(stats["ttft_max_ms"], first_chunk_ms)
+            stats["last_ttft_ms"] = first_chunk_ms
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Return reply counts and mean, max and last latencies by agent."""
+        result = {}
+        for agent_name, stats in self._stats.items():
+            ttft_count = stats["ttft_count"] or 1
+            result[agent_name] = {
+                "count": stats["count"],
+                "streamed": stats["streamed"],
+                "mean_chunks": round(stats["chunks"] / stats["count"], 1),
+                "mean_ttft_ms": round(stats["ttft_total_ms"] / ttft_count, 1),
+                "max_ttft_ms": round(stats["ttft_max_ms"], 1),
+                "last_ttft_ms": round(stats.get("last_ttft_ms", 0.0), 1),
+                "mean_total_ms": round(stats["total_ms"] / stats["count"], 1),
+                "last_total_ms": round(stats["last_total_ms"], 1),
+            }
+        return result
+
+    def clear(self) -> None:
+        """Forget every recorded reply."""
+        self._stats.clear()
+
+
+# Process-wide reply latency metrics, reported by /api/metrics
+reply_metrics = ReplyMetrics()
+
+
+async def collect_reply(
+    chunks: AsyncIterable[Any],
+    agent_name: str,
+    on_chunk: Optional[ChunkHandler] = None,
+    streamed: bool = False,
+) -> str:
+    """Join the chunks of an agent reply into one string.
+
+    Chunks are gathered in a list and joined once, and each non-empty chunk is
+    passed to ``on_chunk`` as soon as it arrives. The time to the first chunk and
+    to the complete reply is recorded in ``reply_metrics``.
+
+    Args:
+        chunks: The items yielded by the agent's ``invoke`` or ``invoke_stream``
+        agent_name: The agent replying, used to group metrics
+        on_chunk: Optional callback receiving each chunk's text and position
+        streamed: Whether ``chunks`` comes from ``invoke_stream``
+    """
+    parts: List[str] = []
+    start = time.perf_counter()
+    first_chunk_ms: Optional[float] = None
+    async for chunk in chunks:
+        if chunk is None:
+            continue
+        text = str(chunk)
+        if not text:
+            continue
+        if first_chunk_ms is None:
+            first_chunk_ms = (time.perf_counter() - start) * 1000
+        if on_chunk is not None:
+            on_chunk(text, len(parts))
+        parts.append(text)
+    total_ms = (time.perf_counter() - start) * 1000
+    reply_metrics.record(agent_name, first_chunk_ms, total_ms, len(parts), streamed)
+    return "".join(parts)
@@ -0,0 +1,77 @@
+"""Dependency-aware scheduling of plan steps."""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Sequence, Set
+
+from models.messages_kernel import Step
+
+
+def step_dependencies(steps: Sequence[Step]) -> Dict[str, List[str]]:
+    """Return the IDs of the steps each step waits for, keyed by step ID.
+
+    A step without ``depends_on`` waits for the step before it, so plans made
+    before dependencies existed still run as a chain. Dependencies on unknown or
+    later steps are dropped, which keeps the graph acyclic.
+    """
+    dependencies: Dict[str, List[str]] = {}
+    seen: List[str] = []
+    for step in steps:
+        if step.depends_on is None:
+            dependencies[step.id] = seen[-1:]
+        else:
+            earlier = set(seen)
+            dependencies[step.id] = [
+                step_id
+                for step_id in dict.fromkeys(step.depends_on)
+                if step_id in earlier
+            ]
+        seen.append(step.id)
+    return dependencies
+
+
+def predecessors(step_id: str, dependencies: Dict[str, List[str]]) -> Set[str]:
+    """Return the IDs of every step a step depends on, directly or transitively."""
+    found: Set[str] = set()
+    pending = list(dependencies.get(step_id, ()))
+    while pending:
+        current = pending.pop()
+        if current not in found:
+            found.add(current)
+            pending.extend(dependencies.get(current, ()))
+    return found
+
+
+async def run_step_graph(
+    steps: Sequence[Step],
+    run: Callable[[Step], Awaitable[None]],
+    semaphore: asyncio.Semaphore,
+) -> None:
+    """Run every step once the steps it depends on have finished.
+
+    Independent steps run concurrently, at most as many at a time as the
+    semaphore allows. When a step fails, the steps depending on it are skipped,
+    the others still run, and the first failure in plan order is raised.
+
+    Args:
+        steps: The plan's steps, in plan order
+        run: Coroutine function executing one step
+        semaphore: Limits how many steps run at the same time
+    """
+    dependencies = step_dependencies(steps)
+    tasks: Dict[str, asyncio.Task] = {}
+
+    async def run_when_ready(step: Step) -> None:
+        # Raises the failure of a dependency, which skips this step
+        for step_id in dependencies[step.id]:
+            await tasks[step_id]
+        async with semaphore:
+            await run(step)
+
+    # Steps only depend on earlier steps, so their tasks already exist
+    for step in steps:
+        tasks[step.id] = asyncio.create_task(run_when_ready(step))
+
+    results = await asyncio.gather(*tasks.values(), return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
@@ -5,6 +5,7 @@ import semantic_kernel as sk
 from context.cosmos_memory_kernel import CosmosMemoryContext
 from kernel_agents.agent_base import BaseAgent
 from kernel_tools.tech_support_tools import TechSupportTools
+from kernel_tools.tool_registry import kernel_functions, tool_methods
 from models.messages_kernel import AgentType
 from semantic_kernel.functions import KernelFunction
 
@@ -43,9 +44,8 @@ class TechSupportAgent(BaseAgent):
         """
         # Load configuration if tools not provided
         if not tools:
-            # Get tools directly from TechSupportTools class
-            tools_dict = TechSupportTools.get_all_kernel_functions()
-            tools = [KernelFunction.from_method(func) for func in tools_dict.values()]
+            # Use the precomputed TechSupportTools functions shared by every instance
+            tools = list(kernel_functions(TechSupportTools))
 
         # Use system message from config if not explicitly provided
         if not system_message:
@@ -128,4 +128,4 @@ class TechSupportAgent(BaseAgent):
     @property
     def plugins(self):
         """Get the plugins for the tech support agent."""
-        return TechSupportTools.get_all_kernel_functions()
+        return tool_methods(TechSupportTools)
@@ -0,0 +1,30 @@
+"""Process-wide registry of the kernel functions exposed by each tools class."""
+
+import functools
+from types import MappingProxyType
+from typing import Callable, Mapping, Tuple, Type
+
+from semantic_kernel.functions import KernelFunction
+
+
+@functools.lru_cache(maxsize=None)
+def tool_methods(tools_class: Type) -> Mapping[str, Callable]:
+    """Return the ``@kernel_function`` methods of a tools class by name.
+
+    The class is inspected once; later calls return the same read-only mapping.
+    """
+    return MappingProxyType(dict(tools_class.get_all_kernel_functions()))
+
+
+@functools.lru_cache(maxsize=None)
+def kernel_functions(tools_class: Type) -> Tuple[KernelFunction, ...]:
+    """Return the KernelFunction wrappers of a tools class, built once per class.
+
+    The tuple is shared by every agent using the class. Semantic Kernel copies
+    functions when it adds them to an agent's plugin, so the shared instances are
+    never modified.
+    """
+    return tuple(
+        KernelFunction.from_method(method)
+        for method in tool_methods(tools_class).values()
+    )
@@ -0,0 +1,92 @@
+"""Process-wide catalog of the tools available to the specialist agents."""
+
+import hashlib
+import json
+import threading
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Optional, Type
+
+from kernel_tools.generic_tools import GenericTools
+from kernel_tools.hr_tools import HrTools
+from kernel_tools.marketing_tools import MarketingTools
+from kernel_tools.procurement_tools import ProcurementTools
+from kernel_tools.product_tools import ProductTools
+from kernel_tools.tech_support_tools import TechSupportTools
+from models.messages_kernel import AgentType
+
+# Tools class of each specialist, in the order they are listed to the planner
+TOOLS_BY_AGENT: Mapping[AgentType, Type] = MappingProxyType(
+    {
+        AgentType.HR: HrTools,
+        AgentType.MARKETING: MarketingTools,
+        AgentType.PRODUCT: ProductTools,
+        AgentType.PROCUREMENT: ProcurementTools,
+        AgentType.TECH_SUPPORT: TechSupportTools,
+        AgentType.GENERIC: GenericTools,
+    }
+)
+
+
+class ToolsCatalog:
+    """Tool descriptions of every specialist agent, rendered once.
+
+    Holds each agent's ``generate_tools_json_doc`` output, the parsed tool list
+    served by ``/api/agent-tools`` and a content hash used as its version and
+    ETag. Planner prompt fragments are rendered once per set of available agents.
+    """
+
+    def __init__(self, tools_by_agent: Mapping[AgentType, Type]) -> None:
+        """Build the catalog.
+
+        Args:
+            tools_by_agent: Tools class of each agent type, in prompt order
+        """
+        self.json_docs: Mapping[AgentType, str] = MappingProxyType(
+            {
+                agent_type: tools_class.generate_tools_json_doc()
+                for agent_type, tools_class in tools_by_agent.items()
+            }
+        )
+        self.tools: List[Dict[str, Any]] = [
+            tool for doc in self.json_docs.values() for tool in json.loads(doc)
+        ]
+
+        digest = hashlib.sha256()
+        for agent_type, doc in self.json_docs.items():
+            digest.update(agent_type.value.encode("utf-8"))
+            digest.update(doc.encode("utf-8"))
+        self.version = digest.hexdigest()[:16]
+        self.etag = f'"{self.version}"'
+        # The /api/agent-tools response body, serialized once
+        self.tools_json = json.dumps(self.tools, ensure_ascii=False)
+
+        self._prompt_texts: Dict[FrozenSet[str], str] = {}
+
+    def prompt_text(self, available_agents: Iterable[str]) -> str:
+        """Return the planner's tools listing for the given agents.
+
+        The text is the string form of the list of JSON documents of the available
+        agents, as the planner prompt has always used, rendered once per set.
+        """
+        key = frozenset(available_agents)
+        text = self._prompt_texts.get(key)
+        if text is None:
+            text = str(
+                [doc for agent_type, doc in self.json_docs.items() if agent_type in key]
+            )
+            self._prompt_texts[key] = text
+        return text
+
+
+_catalog: Optional[ToolsCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_tools_catalog() -> ToolsCatalog:
+    """Return the process-wide tools catalog, building it on first use."""
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = ToolsCatalog(TOOLS_BY_AGENT)
+    return _catalog
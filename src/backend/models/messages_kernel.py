@@ -192,6 +192,28 @@ class Step(BaseDataModel):
     human_feedback: Optional[str] = None
     human_approval_status: Optional[HumanFeedbackStatus] = HumanFeedbackStatus.requested
     updated_action: Optional[str] = None
+    # IDs of the steps whose results this step needs; None means the previous step
+    depends_on: Optional[List[str]] = None
+
+
+class StepSummary(KernelBaseModel):
+    """Lightweight projection of a step used for status counts."""
+
+    id: str
+    plan_id: str
+    session_id: str
+    status: StepStatus = StepStatus.planned
+
+
+class PlanSummary(KernelBaseModel):
+    """Lightweight projection of a plan used by list views."""
+
+    id: str
+    session_id: str
+    user_id: str
+    initial_goal: str
+    overall_status: PlanStatus = PlanStatus.in_progress
+    timestamp: Optional[datetime] = None
 
 
 class ThreadIdAgent(BaseDataModel):
@@ -229,20 +251,31 @@ class PlanWithSteps(Plan):
 
     def update_step_counts(self):
         """Update the counts of steps by their status."""
+        status_counts: Dict[StepStatus, int] = {}
+        for step in self.steps:
+            status_counts[step.status] = status_counts.get(step.status, 0) + 1
+        self.apply_step_status_counts(status_counts)
+
+    def apply_step_status_counts(self, status_counts: Dict[StepStatus, int]):
+        """Update the counts of steps from a status histogram.
+
+        Lets callers fill in the counts from an aggregate query or lightweight
+        projections (see StepSummary) without loading the full step documents.
+        """
         status_counts = {
-            StepStatus.planned: 0,
-            StepStatus.awaiting_feedback: 0,
-            StepStatus.approved: 0,
-            StepStatus.rejected: 0,
-            StepStatus.action_requested: 0,
-            StepStatus.completed: 0,
-            StepStatus.failed: 0,
+            status: status_counts.get(status, 0)
+            for status in (
+                StepStatus.planned,
+                StepStatus.awaiting_feedback,
+                StepStatus.approved,
+                StepStatus.rejected,
+                StepStatus.action_requested,
+                StepStatus.completed,
+                StepStatus.failed,
+            )
         }
 
-        for step in self.steps:
-            status_counts[step.status] += 1
-
-        self.total_steps = len(self.steps)
+        self.total_steps = sum(status_counts.values())
         self.planned = status_counts[StepStatus.planned]
         self.awaiting_feedback = status_counts[StepStatus.awaiting_feedback]
         self.approved = status_counts[StepStatus.approved]
@@ -425,6 +458,8 @@ class SKChatHistory:
 class PlannerResponseStep(KernelBaseModel):
     action: str
     agent: AgentType
+    # Zero-based positions of the earlier steps this step needs results from
+    depends_on: Optional[List[int]] = None
 
 
 class PlannerResponsePlan(KernelBaseModel):
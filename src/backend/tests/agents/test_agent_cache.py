@@ -0,0 +1,77 @@
+import os
+import sys
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+# Add the backend directory to the path so we can import our modules
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+from kernel_agents.agent_cache import SessionAgentCache, approximate_size  # noqa: E402
+from models.messages_kernel import AgentType  # noqa: E402
+
+
+def make_thread(thread_id="thread-1"):
+    thread = MagicMock()
+    thread.id = thread_id
+    thread.delete = AsyncMock()
+    return thread
+
+
+@pytest.mark.asyncio
+async def test_evicted_session_graph_deletes_its_thread():
+    """Sessions beyond the bound are evicted as a whole and their thread deleted."""
+    cache = SessionAgentCache(max_sessions=1)
+    first = cache.get("s1")
+    first.agents[AgentType.HR] = object()
+    first.thread = make_thread()
+
+    cache.get("s2")
+    for task in list(cache._closing):
+        await task
+
+    assert "s1" not in cache and "s2" in cache
+    first.thread.delete.assert_awaited_once()
+    assert cache.stats()["evictions"] == 1
+
+
+def test_stats_report_entries_and_approximate_bytes():
+    """Stats include the number of sessions, agents and their size."""
+    cache = SessionAgentCache()
+    graph = cache.get("s1")
+    graph.add_agent(AgentType.HR, {"instructions": "x" * 10_000})
+
+    stats = cache.stats()
+
+    assert stats["entries"] == 1 and stats["agents"] == 1
+    assert stats["approximate_bytes"] >= 10_000
+
+
+@pytest.mark.asyncio
+async def test_pinned_graph_keeps_its_thread_until_the_work_is_done():
+    """A graph evicted while a job uses it has its thread deleted afterwards."""
+    cache = SessionAgentCache(max_sessions=1)
+
+    async with cache.pinned("s1") as graph:
+        graph.thread = make_thread()
+        assert cache.stats()["pinned"] == 1
+
+        cache.get("s2")
+        assert "s1" not in cache
+        graph.thread.delete.assert_not_called()
+
+    for task in list(cache._closing):
+        await task
+    graph.thread.delete.assert_awaited_once()
+    assert cache.stats()["pinned"] == 0
+
+
+def test_approximate_size_counts_shared_objects_once():
+    """Objects reachable from several graphs are only counted once."""
+    shared = ["y" * 5_000]
+    seen = set()
+    first = approximate_size({"a": shared}, seen)
+    second = approximate_size({"b": shared}, seen)
+    assert first > 5_000 > second
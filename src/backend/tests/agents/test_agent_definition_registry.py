@@ -0,0 +1,146 @@
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+# Add the backend directory to the path so we can import our modules
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+# Mock environment variables before importing modules that load AppConfig
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://mock-openai-endpoint")
+os.environ.setdefault("AZURE_AI_SUBSCRIPTION_ID", "mock-subscription-id")
+os.environ.setdefault("AZURE_AI_RESOURCE_GROUP", "mock-resource-group")
+os.environ.setdefault("AZURE_AI_PROJECT_NAME", "mock-project-name")
+os.environ.setdefault("AZURE_AI_AGENT_PROJECT_CONNECTION_STRING", "mock-connection")
+
+from kernel_agents.agent_definition_registry import (  # noqa: E402
+    AgentDefinitionRegistry,
+)
+
+
+def definition(agent_id, name, instructions, response_format="auto"):
+    return SimpleNamespace(
+        id=agent_id,
+        name=name,
+        instructions=instructions,
+        response_format=response_format,
+    )
+
+
+def page(data, has_more=False):
+    return SimpleNamespace(
+        data=data, has_more=has_more, last_id=data[-1].id if data else None
+    )
+
+
+@pytest.fixture
+def client():
+    client = MagicMock()
+    client.agents.list_agents = AsyncMock(
+        side_effect=[
+            page([definition("a1", "HrAgent", "be helpful")], has_more=True),
+            page([definition("a2", "ProductAgent", "sell things")]),
+        ]
+    )
+    client.agents.create_agent = AsyncMock(
+        side_effect=lambda **kwargs: definition(
+            "new", kwargs["name"], kwargs["instructions"]
+        )
+    )
+    return client
+
+
+@pytest.mark.asyncio
+async def test_warmed_registry_needs_no_listing_calls(client):
+    """After one paginated warm-up, matching definitions are served from memory."""
+    registry = AgentDefinitionRegistry(client_provider=lambda: client)
+
+    assert await registry.refresh() == 2
+    hr = await registry.get_or_create("HrAgent", "be helpful")
+    product = await registry.get_or_create("ProductAgent", "sell things", client=client)
+
+    assert (hr.id, product.id) == ("a1", "a2")
+    assert client.agents.list_agents.await_count == 2
+    assert client.agents.list_agents.await_args.kwargs["after"] == "a1"
+    client.agents.create_agent.assert_not_awaited()
+    client.agents.get_agent.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_changed_instructions_create_a_new_definition_once(client):
+    """A definition is keyed by its instructions, and created only once."""
+    registry = AgentDefinitionRegistry(client_provider=lambda: client)
+    await registry.refresh()
+
+    first = await registry.get_or_create("HrAgent", "new instructions")
+    second = await registry.get_or_create("HrAgent", "new instructions")
+
+    assert first is second and first.id == "new"
+    client.agents.create_agent.assert_awaited_once()
+    assert registry.stats()["created"] == 1
+
+
+@pytest.mark.asyncio
+async def test_refresh_drops_deleted_definitions_but_keeps_new_ones(client):
+    """A refresh mirrors the project, except for definitions created meanwhile."""
+    registry = AgentDefinitionRegistry(client_provider=lambda: client)
+    await registry.refresh()
+    await registry.get_or_create("HrAgent", "created before the listing")
+
+    listing_started = asyncio.Event()
+    finish_listing = asyncio.Event()
+
+    async def list_agents(**kwargs):
+        # ProductAgent was deleted in the project
+        listing_started.set()
+        await finish_listing.wait()
+        return page([definition("a1", "HrAgent", "be helpful")])
+
+    client.agents.list_agents = AsyncMock(side_effect=list_agents)
+    refresh = asyncio.create_task(registry.refresh())
+    await listing_started.wait()
+    created = await registry.get_or_create("TechAgent", "created during the listing")
+    finish_listing.set()
+
+    # The listed HrAgent and the TechAgent created while listing
+    assert await refresh == 2
+    assert await registry.get_or_create("TechAgent", "created during the listing") is (
+        created
+    )
+    # Deleted and unlisted definitions are created again when next needed
+    assert client.agents.create_agent.await_count == 2
+    await registry.get_or_create("ProductAgent", "sell things")
+    await registry.get_or_create("HrAgent", "created before the listing")
+    assert client.agents.create_agent.await_count == 4
+
+
+@pytest.mark.asyncio
+async def test_different_definitions_are_created_concurrently(client):
+    """Only creations of the same definition wait for each other."""
+    registry = AgentDefinitionRegistry(client_provider=lambda: client)
+    await registry.refresh()
+    running = 0
+    peak = 0
+
+    async def create_agent(**kwargs):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.05)
+        running -= 1
+        return definition("new", kwargs["name"], kwargs["instructions"])
+
+    client.agents.create_agent = AsyncMock(side_effect=create_agent)
+    await asyncio.gather(
+        registry.get_or_create("HrAgent", "new"),
+        registry.get_or_create("HrAgent", "new"),
+        registry.get_or_create("ProductAgent", "new"),
+    )
+
+    assert peak == 2
+    assert client.agents.create_agent.await_count == 2
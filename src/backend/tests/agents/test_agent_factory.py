@@ -0,0 +1,84 @@
+import asyncio
+import os
+import sys
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# Add the backend directory to the path so we can import our modules
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+# Mock environment variables before importing modules that load AppConfig
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://mock-openai-endpoint")
+os.environ.setdefault("AZURE_AI_SUBSCRIPTION_ID", "mock-subscription-id")
+os.environ.setdefault("AZURE_AI_RESOURCE_GROUP", "mock-resource-group")
+os.environ.setdefault("AZURE_AI_PROJECT_NAME", "mock-project-name")
+os.environ.setdefault("AZURE_AI_AGENT_PROJECT_CONNECTION_STRING", "mock-connection")
+
+from kernel_agents.agent_factory import AgentFactory  # noqa: E402
+from kernel_agents.lazy_agent import LazyAgent, resolve_agent  # noqa: E402
+from models.messages_kernel import AgentType  # noqa: E402
+
+DELAY = 0.1
+
+
+async def fake_create_agent(agent_type, session_id, **kwargs):
+    await asyncio.sleep(DELAY)
+    if agent_type == AgentType.MARKETING:
+        raise RuntimeError("definition lookup failed")
+    AgentFactory._sessions.get(session_id).agents[agent_type] = agent_type
+    return agent_type
+
+
+@pytest.mark.asyncio
+async def test_specialists_are_built_concurrently_and_isolated():
+    """Specialists build in parallel, and one failure does not fail the session."""
+    AgentFactory.clear_cache()
+    with patch.object(AgentFactory, "create_agent", side_effect=fake_create_agent):
+        start = time.perf_counter()
+        agents = await AgentFactory.create_all_agents(
+            session_id="s1", user_id="user", client=MagicMock(), lazy=False
+        )
+        elapsed = time.perf_counter() - start
+
+    # Specialists in one round, then planner and group chat manager in order
+    assert elapsed < DELAY * 5
+    assert AgentType.MARKETING not in agents
+    assert AgentType.PLANNER in agents and AgentType.GROUP_CHAT_MANAGER in agents
+
+    timings = AgentFactory.get_construction_timings("s1")
+    assert AgentType.HR in timings and AgentType.MARKETING not in timings
+    assert all(ms >= DELAY * 1000 * 0.9 for ms in timings.values())
+    assert AgentFactory.construction_stats()[AgentType.HR.value]["count"] >= 1
+    AgentFactory.clear_cache()
+
+
+@pytest.mark.asyncio
+async def test_lazy_specialists_are_built_on_first_use():
+    """Only the planner and group chat manager are built up front in lazy mode."""
+    AgentFactory.clear_cache()
+    with patch.object(
+        AgentFactory, "create_agent", side_effect=fake_create_agent
+    ) as create_agent:
+        agents = await AgentFactory.create_all_agents(
+            session_id="s2", user_id="user", client=MagicMock(), lazy=True
+        )
+        built = {call.kwargs["agent_type"] for call in create_agent.call_args_list}
+        assert built == {AgentType.PLANNER, AgentType.GROUP_CHAT_MANAGER}
+
+        hr = agents[AgentType.HR]
+        assert isinstance(hr, LazyAgent) and not hr.is_built
+        assert await resolve_agent(hr) == AgentType.HR
+        assert await hr.get() == AgentType.HR
+        assert create_agent.call_count == 3
+
+        # Later requests of the session get the already built agent directly
+        agents = await AgentFactory.create_all_agents(
+            session_id="s2", user_id="user", client=MagicMock(), lazy=True
+        )
+        assert agents[AgentType.HR] == AgentType.HR
+        assert isinstance(agents[AgentType.PRODUCT], LazyAgent)
+    AgentFactory.clear_cache()
@@ -0,0 +1,105 @@
+import os
+import sys
+
+# Add the backend directory to the path so we can import our modules
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+# Mock environment variables before importing modules that load AppConfig
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://mock-openai-endpoint")
+os.environ.setdefault("AZURE_AI_SUBSCRIPTION_ID", "mock-subscription-id")
+os.environ.setdefault("AZURE_AI_RESOURCE_GROUP", "mock-resource-group")
+os.environ.setdefault("AZURE_AI_PROJECT_NAME", "mock-project-name")
+os.environ.setdefault("AZURE_AI_AGENT_PROJECT_CONNECTION_STRING", "mock-connection")
+
+from kernel_agents.conversation_history import (  # noqa: E402
+    ConversationHistories,
+    PlanHistory,
+    estimate_tokens,
+)
+from models.messages_kernel import AgentType, Plan, Step  # noqa: E402
+
+
+def make_plan(count, reply_size=20):
+    plan = Plan(
+        session_id="s1", user_id="user", initial_goal="goal", summary="Onboard Jo"
+    )
+    steps = [
+        Step(
+            plan_id=plan.id,
+            session_id="s1",
+            user_id="user",
+            action=f"action {i}",
+            agent=AgentType.HR,
+            agent_reply=f"reply {i} " + "x" * reply_size,
+        )
+        for i in range(count)
+    ]
+    return plan, steps
+
+
+def test_history_matches_the_full_rendering_within_budget():
+    """A short history lists every previous step in full, in plan order."""
+    plan, steps = make_plan(3)
+    history = PlanHistory(token_budget=8000, summary_chars=300)
+
+    text = history.render(plan, steps, {steps[0].id, steps[1].id})
+
+    assert text.startswith("<conversation_history>Here is the conversation history")
+    assert "The user's task was:\nOnboard Jo\n\n" in text
+    assert (
+        "The conversation between the previous agents so far is below:\n"
+        f"Step 0\nGroup_Chat_Manager: action 0\nHr_Agent: {steps[0].agent_reply}\n"
+        f"Step 1\nGroup_Chat_Manager: action 1\nHr_Agent: {steps[1].agent_reply}\n"
+        "<conversation_history \\>"
+    ) in text
+    assert "action 2" not in text
+
+
+def test_completed_steps_are_rendered_once_and_refreshed_when_rerun():
+    plan, steps = make_plan(3)
+    steps[2].agent_reply = None
+    history = PlanHistory(token_budget=8000, summary_chars=300)
+    all_ids = {step.id for step in steps}
+
+    history.render(plan, steps, all_ids)
+    first = history._entries[steps[0].id]
+    history.render(plan, steps, all_ids)
+
+    # The step still waiting for its reply is not cached
+    assert len(history) == 2
+    assert history._entries[steps[0].id] is first
+
+    steps[0].agent_reply = "a new reply"
+    assert "a new reply" in history.render(plan, steps, all_ids)
+
+
+def test_long_histories_are_summarized_and_truncated_oldest_first():
+    """Recent steps stay in full, older ones are summarized, the oldest dropped."""
+    plan, steps = make_plan(40, reply_size=2000)
+    budget = 2000
+    history = PlanHistory(token_budget=budget, summary_chars=100)
+
+    text = history.render(plan, steps, {step.id for step in steps[:-1]})
+
+    # The most recent previous step is kept in full
+    assert steps[38].agent_reply in text
+    # Older steps are shortened, and the oldest are left out entirely
+    assert "reply 30 " + "x" * 91 + " [...]" in text
+    assert "Step 0\n" not in text
+    assert "earlier steps are left out to keep the history short" in text
+    assert estimate_tokens(text) < budget + 200
+    assert history.summarized > 0 and history.omitted > 0
+
+
+def test_histories_are_cached_per_user_and_plan():
+    histories = ConversationHistories(max_plans=2)
+
+    first = histories.get("user", "p1")
+
+    assert histories.get("user", "p1") is first
+    assert histories.get("other", "p1") is not first
+    histories.invalidate("user", "p1")
+    assert histories.get("user", "p1") is not first
+    assert histories.stats()["plans"] == 2
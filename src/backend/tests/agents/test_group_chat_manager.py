@@ -0,0 +1,144 @@
+import asyncio
+import os
+import sys
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+# Add the backend directory to the path so we can import our modules
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+# Mock environment variables before importing modules that load AppConfig
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://mock-openai-endpoint")
+os.environ.setdefault("AZURE_AI_SUBSCRIPTION_ID", "mock-subscription-id")
+os.environ.setdefault("AZURE_AI_RESOURCE_GROUP", "mock-resource-group")
+os.environ.setdefault("AZURE_AI_PROJECT_NAME", "mock-project-name")
+os.environ.setdefault("AZURE_AI_AGENT_PROJECT_CONNECTION_STRING", "mock-connection")
+
+from kernel_agents.group_chat_manager import GroupChatManager  # noqa: E402
+from kernel_agents.lazy_agent import LazyAgent  # noqa: E402
+from models.messages_kernel import (AgentType, HumanFeedback,  # noqa: E402
+                                    HumanFeedbackStatus, Plan, Step,
+                                    StepStatus)
+
+
+def make_step(step_id, agent=AgentType.GENERIC, **fields):
+    return Step(
+        id=step_id,
+        plan_id="p1",
+        session_id="s1",
+        user_id="user",
+        action=f"do {step_id}",
+        agent=agent,
+        depends_on=[],
+        **fields,
+    )
+
+
+def make_manager(steps):
+    memory_store = MagicMock()
+    memory_store.get_steps_by_plan = AsyncMock(return_value=steps)
+    memory_store.get_plan_by_session = AsyncMock(
+        return_value=Plan(
+            id="p1",
+            session_id="s1",
+            user_id="user",
+            initial_goal="goal",
+        )
+    )
+    manager = GroupChatManager.model_construct()
+    manager._user_id = "user"
+    manager._memory_store = memory_store
+    manager._step_semaphore = asyncio.Semaphore(4)
+    manager._agent_instances = {}
+    manager._update_step_status = AsyncMock()
+    manager._execute_step = AsyncMock()
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_approving_again_skips_steps_that_already_ran():
+    """A retried approval of a plan only executes the steps that have not run."""
+    steps = [
+        make_step("replied", agent_reply="done", status=StepStatus.completed),
+        make_step(
+            "human",
+            agent=AgentType.HUMAN,
+            status=StepStatus.completed,
+            human_approval_status=HumanFeedbackStatus.accepted,
+        ),
+        make_step("failed", status=StepStatus.action_requested),
+        make_step("pending"),
+    ]
+    manager = make_manager(steps)
+
+    await manager.handle_human_feedback(
+        HumanFeedback(plan_id="p1", session_id="s1", approved=True)
+    )
+
+    executed = [call.args[1].id for call in manager._execute_step.await_args_list]
+    assert sorted(executed) == ["failed", "pending"]
+
+    # Approving a single step that already ran does nothing either
+    manager._execute_step.reset_mock()
+    await manager.handle_human_feedback(
+        HumanFeedback(step_id="replied", plan_id="p1", session_id="s1", approved=True)
+    )
+    manager._execute_step.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_lazy_agents_of_a_plan_are_built_concurrently():
+    """Agents of dependent steps are built together before the steps run."""
+    steps = [
+        make_step("first", agent=AgentType.HR),
+        make_step("second", agent=AgentType.PRODUCT),
+        make_step("ask", agent=AgentType.HUMAN),
+    ]
+    steps[1].depends_on = ["first"]
+    manager = make_manager(steps)
+    building = 0
+    both_building = asyncio.Event()
+
+    def factory(agent_type):
+        async def build():
+            nonlocal building
+            building += 1
+            if building == 2:
+                both_building.set()
+            await asyncio.wait_for(both_building.wait(), 1)
+            return MagicMock(name=agent_type.value)
+
+        return LazyAgent(agent_type, build)
+
+    for agent_type in (AgentType.HR, AgentType.PRODUCT):
+        manager._agent_instances[agent_type.value] = factory(agent_type)
+
+    await manager.handle_human_feedback(
+        HumanFeedback(plan_id="p1", session_id="s1", approved=True)
+    )
+
+    assert all(agent.is_built for agent in manager._agent_instances.values())
+    assert manager._execute_step.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_rejected_steps_are_saved():
+    """Rejecting one step or the whole plan awaits the step updates."""
+    steps = [make_step("a"), make_step("b")]
+    manager = make_manager(steps)
+    manager._memory_store.update_step = AsyncMock()
+
+    await manager.handle_human_feedback(
+        HumanFeedback(step_id="a", plan_id="p1", session_id="s1", approved=False)
+    )
+    assert manager._memory_store.update_step.await_count == 1
+
+    await manager.handle_human_feedback(
+        HumanFeedback(plan_id="p1", session_id="s1", approved=False)
+    )
+    assert manager._memory_store.update_step.await_count == 3
+    assert all(step.status == StepStatus.rejected for step in steps)
+    manager._execute_step.assert_not_awaited()
@@ -0,0 +1,92 @@
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+# Add the backend directory to the path so we can import our modules
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+# Mock environment variables before importing modules that load AppConfig
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://mock-openai-endpoint")
+os.environ.setdefault("AZURE_AI_SUBSCRIPTION_ID", "mock-subscription-id")
+os.environ.setdefault("AZURE_AI_RESOURCE_GROUP", "mock-resource-group")
+os.environ.setdefault("AZURE_AI_PROJECT_NAME", "mock-project-name")
+os.environ.setdefault("AZURE_AI_AGENT_PROJECT_CONNECTION_STRING", "mock-connection")
+
+from context.event_bus import session_events  # noqa: E402
+from kernel_agents.agent_base import BaseAgent  # noqa: E402
+from kernel_agents.reply_stream import collect_reply, reply_metrics  # noqa: E402
+from models.messages_kernel import ActionRequest, AgentType  # noqa: E402
+
+DELAY = 0.05
+
+
+async def slow_chunks():
+    yield None
+    yield ""
+    for text in ["Hello", ", ", "world"]:
+        await asyncio.sleep(DELAY)
+        yield text
+
+
+@pytest.mark.asyncio
+async def test_chunks_are_forwarded_as_they_arrive_and_joined():
+    """Each non-empty chunk reaches the callback before the reply is complete."""
+    reply_metrics.clear()
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    received = []
+
+    reply = await collect_reply(
+        slow_chunks(),
+        "HR_Agent",
+        on_chunk=lambda text, index: received.append((text, index, loop.time())),
+        streamed=True,
+    )
+
+    assert reply == "Hello, world"
+    assert [(text, index) for text, index, _ in received] == [
+        ("Hello", 0),
+        (", ", 1),
+        ("world", 2),
+    ]
+    # The first chunk is delivered long before the last one arrives
+    assert received[0][2] - start < DELAY * 2
+
+    stats = reply_metrics.stats()["HR_Agent"]
+    assert stats["count"] == 1 and stats["streamed"] == 1
+    assert stats["mean_chunks"] == 3
+    assert DELAY * 1000 * 0.8 <= stats["last_ttft_ms"] < stats["last_total_ms"]
+
+
+@pytest.mark.asyncio
+async def test_reply_chunks_are_published_to_the_session():
+    """Streamed chunks are pushed to the session's event subscribers."""
+    agent = SimpleNamespace(_user_id="user", _agent_name=AgentType.HR.value)
+    action_request = ActionRequest(
+        step_id="step-1",
+        plan_id="plan-1",
+        session_id="s1",
+        action="do it",
+        agent=AgentType.HR,
+    )
+    subscription = session_events.subscribe("user", "s1")
+    try:
+        publish = BaseAgent._reply_chunk_publisher(agent, action_request)
+        publish("Hello", 0)
+        event = await subscription.next(timeout=1)
+    finally:
+        session_events.unsubscribe(subscription)
+
+    assert event["type"] == "agent_reply_chunk"
+    assert event["data"] == {
+        "step_id": "step-1",
+        "plan_id": "plan-1",
+        "source": AgentType.HR.value,
+        "index": 0,
+        "content": "Hello",
+    }
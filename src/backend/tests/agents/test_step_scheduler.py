@@ -0,0 +1,181 @@
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+# Add the backend directory to the path so we can import our modules
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+# Mock environment variables before importing modules that load AppConfig
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://mock-openai-endpoint")
+os.environ.setdefault("AZURE_AI_SUBSCRIPTION_ID", "mock-subscription-id")
+os.environ.setdefault("AZURE_AI_RESOURCE_GROUP", "mock-resource-group")
+os.environ.setdefault("AZURE_AI_PROJECT_NAME", "mock-project-name")
+os.environ.setdefault("AZURE_AI_AGENT_PROJECT_CONNECTION_STRING", "mock-connection")
+
+from kernel_agents.agent_base import BaseAgent  # noqa: E402
+from kernel_agents.step_scheduler import (predecessors,  # noqa: E402
+                                          run_step_graph, step_dependencies)
+from models.messages_kernel import (ActionRequest, AgentType,  # noqa: E402
+                                    Step, StepStatus)
+from semantic_kernel.agents import AzureAIAgentThread  # noqa: E402
+
+DELAY = 0.1
+
+
+def make_step(step_id, depends_on=None):
+    return Step(
+        id=step_id,
+        plan_id="p1",
+        session_id="s1",
+        user_id="user",
+        action=f"do {step_id}",
+        agent=AgentType.GENERIC,
+        depends_on=depends_on,
+    )
+
+
+def test_steps_without_dependencies_form_a_chain():
+    steps = [make_step("a"), make_step("b"), make_step("c")]
+
+    dependencies = step_dependencies(steps)
+
+    assert dependencies == {"a": [], "b": ["a"], "c": ["b"]}
+    assert predecessors("c", dependencies) == {"a", "b"}
+
+
+def test_unknown_and_later_dependencies_are_dropped():
+    steps = [
+        make_step("a", ["c", "x"]),
+        make_step("b", []),
+        make_step("c", ["a", "a"]),
+    ]
+
+    dependencies = step_dependencies(steps)
+
+    assert dependencies == {"a": [], "b": [], "c": ["a"]}
+    assert predecessors("c", dependencies) == {"a"}
+    assert predecessors("b", dependencies) == set()
+
+
+@pytest.mark.asyncio
+async def test_independent_steps_run_concurrently_within_the_limit():
+    steps = [
+        make_step("a", []),
+        make_step("b", []),
+        make_step("c", []),
+        make_step("d", ["a", "b", "c"]),
+    ]
+    finished = []
+    running = 0
+    peak = 0
+
+    async def run(step):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(DELAY)
+        running -= 1
+        finished.append(step.id)
+
+    start = time.perf_counter()
+    await run_step_graph(steps, run, asyncio.Semaphore(2))
+    elapsed = time.perf_counter() - start
+
+    # Two rounds for a, b and c under a limit of two, then d after all of them
+    assert peak == 2
+    assert finished[-1] == "d"
+    assert elapsed < DELAY * 3.9
+
+
+@pytest.mark.asyncio
+async def test_failed_step_skips_its_dependents_only():
+    steps = [make_step("a", []), make_step("b", ["a"]), make_step("c", [])]
+    ran = []
+
+    async def run(step):
+        if step.id == "a":
+            raise RuntimeError("agent failed")
+        ran.append(step.id)
+
+    with pytest.raises(RuntimeError, match="agent failed"):
+        await run_step_graph(steps, run, asyncio.Semaphore(4))
+
+    assert ran == ["c"]
+
+
+class OneRunPerThreadAgent(BaseAgent):
+    """Agent whose service, like Azure AI Agents, rejects a second run on a thread."""
+
+    @classmethod
+    async def create(cls, **kwargs):
+        raise NotImplementedError
+
+    async def invoke(self, messages, thread=None, **kwargs):
+        if thread.id is None:
+            await thread.create()
+        if thread.id in self._active_threads:
+            raise RuntimeError(f"Thread {thread.id} already has an active run")
+        self._active_threads.add(thread.id)
+        try:
+            await asyncio.sleep(DELAY)
+            yield f"done on {thread.id}"
+        finally:
+            self._active_threads.discard(thread.id)
+
+
+@pytest.mark.asyncio
+async def test_independent_steps_run_on_threads_of_their_own():
+    """Concurrent steps of one agent never share a thread, which the service rejects."""
+    thread_ids = iter(["thread-a", "thread-b"])
+    client = SimpleNamespace(
+        agents=SimpleNamespace(
+            create_thread=AsyncMock(
+                side_effect=lambda **kwargs: SimpleNamespace(id=next(thread_ids))
+            ),
+            delete_thread=AsyncMock(),
+        )
+    )
+    steps = {step.id: step for step in [make_step("a", []), make_step("b", [])]}
+    memory_store = MagicMock()
+    memory_store.get_step = AsyncMock(side_effect=lambda step_id, _: steps[step_id])
+    memory_store.add_item = AsyncMock()
+    memory_store.update_step = AsyncMock()
+
+    agent = OneRunPerThreadAgent.model_construct(client=client)
+    agent._agent_name = AgentType.GENERIC.value
+    agent._user_id = "user"
+    agent._memory_store = memory_store
+    agent._active_threads = set()
+    # The session's thread, which every step used to share
+    agent._thread = AzureAIAgentThread(client=client, thread_id="session-thread")
+
+    async def run(step):
+        action_request = ActionRequest(
+            step_id=step.id,
+            plan_id=step.plan_id,
+            session_id=step.session_id,
+            action=step.action,
+            agent=step.agent,
+        )
+        await agent.handle_action_request(action_request)
+
+    start = time.perf_counter()
+    await run_step_graph(list(steps.values()), run, asyncio.Semaphore(4))
+    elapsed = time.perf_counter() - start
+
+    assert all(step.status == StepStatus.completed for step in steps.values())
+    assert {step.agent_reply for step in steps.values()} == {
+        "done on thread-a",
+        "done on thread-b",
+    }
+    assert elapsed < DELAY * 1.9
+    # Step threads are deleted once their step is done; the session's is kept
+    deleted = [call.args[0] for call in client.agents.delete_thread.await_args_list]
+    assert sorted(deleted) == ["thread-a", "thread-b"]
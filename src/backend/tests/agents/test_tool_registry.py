@@ -0,0 +1,37 @@
+import os
+import sys
+from unittest.mock import patch
+
+# Add the backend directory to the path so we can import our modules
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+from kernel_tools.marketing_tools import MarketingTools  # noqa: E402
+from kernel_tools.tool_registry import kernel_functions, tool_methods  # noqa: E402
+
+
+def test_kernel_functions_are_built_once_per_class():
+    """Repeated lookups reuse the same functions without any reflection."""
+    first = kernel_functions(MarketingTools)
+
+    with patch("inspect.getmembers") as getmembers, patch(
+        "semantic_kernel.functions.KernelFunction.from_method"
+    ) as from_method:
+        second = kernel_functions(MarketingTools)
+
+    assert second is first
+    getmembers.assert_not_called()
+    from_method.assert_not_called()
+    assert {f.name for f in first} == set(tool_methods(MarketingTools))
+    assert len(first) == len(MarketingTools.get_all_kernel_functions())
+
+
+def test_tool_methods_are_read_only():
+    """The shared mapping cannot be changed by one agent for all others."""
+    methods = tool_methods(MarketingTools)
+    try:
+        methods["injected"] = print
+    except TypeError:
+        pass
+    assert "injected" not in tool_methods(MarketingTools)
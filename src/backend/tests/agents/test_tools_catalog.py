@@ -0,0 +1,40 @@
+import json
+import os
+import sys
+
+# Add the backend directory to the path so we can import our modules
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+from kernel_tools.hr_tools import HrTools  # noqa: E402
+from kernel_tools.tools_catalog import (  # noqa: E402
+    TOOLS_BY_AGENT,
+    ToolsCatalog,
+    get_tools_catalog,
+)
+from models.messages_kernel import AgentType  # noqa: E402
+
+
+def test_catalog_is_built_once_and_versioned():
+    """The shared catalog is reused and its version is stable across builds."""
+    catalog = get_tools_catalog()
+
+    assert get_tools_catalog() is catalog
+    assert ToolsCatalog(TOOLS_BY_AGENT).version == catalog.version
+    assert catalog.etag == f'"{catalog.version}"'
+    assert json.loads(catalog.tools_json) == catalog.tools
+    assert {tool["agent"] for tool in catalog.tools} >= {HrTools.agent_name}
+
+
+def test_prompt_text_matches_planner_format_and_is_reused():
+    """Prompt text lists the available agents' tool docs, rendered once per set."""
+    catalog = get_tools_catalog()
+    agents = [AgentType.HUMAN.value, AgentType.HR.value, AgentType.GENERIC.value]
+
+    text = catalog.prompt_text(agents)
+
+    assert text == str(
+        [catalog.json_docs[AgentType.HR], catalog.json_docs[AgentType.GENERIC]]
+    )
+    assert catalog.prompt_text(reversed(agents)) is text
@@ -0,0 +1,80 @@
+import asyncio
+import os
+import sys
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+# Add the backend directory to the path so we can import our modules
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+from azure.cosmos.exceptions import CosmosResourceNotFoundError  # noqa: E402
+from context.bulk_delete import (  # noqa: E402
+    BulkDeleteJobs,
+    bulk_delete_documents,
+)
+
+
+async def documents(items):
+    for item in items:
+        yield item
+
+
+@pytest.mark.asyncio
+async def test_bulk_delete_batches_per_partition():
+    """Ids are grouped per partition and deleted in batches of at most 100."""
+    container = MagicMock()
+    container.execute_item_batch = AsyncMock()
+    items = [{"id": f"a{i}", "session_id": "s1"} for i in range(150)]
+    items.append({"id": "b0", "session_id": "s2"})
+
+    deleted = await bulk_delete_documents(container, documents(items))
+
+    assert deleted == 151
+    sizes = sorted(
+        len(call.kwargs["batch_operations"])
+        for call in container.execute_item_batch.await_args_list
+    )
+    assert sizes == [1, 50, 100]
+    operation = container.execute_item_batch.await_args_list[0].kwargs[
+        "batch_operations"
+    ][0]
+    assert operation[0] == "delete"
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_falls_back_to_single_deletes():
+    """A failed batch is retried per item and missing items count as deleted."""
+    container = MagicMock()
+    container.execute_item_batch = AsyncMock(side_effect=RuntimeError("conflict"))
+    container.delete_item = AsyncMock(
+        side_effect=[None, CosmosResourceNotFoundError(message="gone")]
+    )
+    items = [{"id": "a", "session_id": "s1"}, {"id": "b", "session_id": "s1"}]
+
+    deleted = await bulk_delete_documents(container, documents(items))
+
+    assert deleted == 2
+    assert container.delete_item.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_job_registry_tracks_progress():
+    """Background jobs report their progress and are scoped to their user."""
+    jobs = BulkDeleteJobs()
+
+    async def run(job):
+        job.found = job.deleted = 3
+
+    job = jobs.start("user", ["plan"], run)
+    assert jobs.get(job.id, "other-user") is None
+
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    finished = jobs.get(job.id, "user")
+    assert finished.status == "completed"
+    assert finished.deleted == 3
+    assert finished.finished_at is not None
@@ -0,0 +1,94 @@
+import asyncio
+import os
+import sys
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+# Add the backend directory to the path so we can import our modules
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+# Mock environment variables before importing modules that load AppConfig
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://mock-openai-endpoint")
+os.environ.setdefault("AZURE_AI_SUBSCRIPTION_ID", "mock-subscription-id")
+os.environ.setdefault("AZURE_AI_RESOURCE_GROUP", "mock-resource-group")
+os.environ.setdefault("AZURE_AI_PROJECT_NAME", "mock-project-name")
+os.environ.setdefault("AZURE_AI_AGENT_PROJECT_CONNECTION_STRING", "mock-connection")
+
+from context.cosmos_client_pool import CosmosClientPool  # noqa: E402
+
+
+@pytest.fixture
+def mock_cosmos_client():
+    """Patch CosmosClient so no network calls are made."""
+    mock_container = MagicMock()
+    mock_database = MagicMock()
+    mock_database.create_container_if_not_exists = AsyncMock(
+        return_value=mock_container
+    )
+    mock_client = MagicMock()
+    mock_client.get_database_client.return_value = mock_database
+    mock_client.close = AsyncMock()
+
+    with patch(
+        "context.cosmos_client_pool.CosmosClient", return_value=mock_client
+    ) as client_cls:
+        yield client_cls, mock_client, mock_database, mock_container
+
+
+@pytest.mark.asyncio
+async def test_container_handle_is_shared(mock_cosmos_client):
+    """Container handles are resolved once and reused by every caller."""
+    client_cls, _, mock_database, mock_container = mock_cosmos_client
+    pool = CosmosClientPool(credential_provider=MagicMock(), max_connections=10)
+
+    first = await pool.get_container("https://mock-endpoint", "db", "memory")
+    second = await pool.get_container("https://mock-endpoint", "db", "memory")
+
+    assert first is mock_container
+    assert second is mock_container
+    client_cls.assert_called_once()
+    mock_database.create_container_if_not_exists.assert_awaited_once()
+    assert pool.stats()["containers"] == 1
+
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_close_releases_clients(mock_cosmos_client):
+    """Closing the pool closes every client and forgets cached handles."""
+    _, mock_client, _, _ = mock_cosmos_client
+    pool = CosmosClientPool(credential_provider=MagicMock())
+
+    await pool.get_container("https://mock-endpoint", "db", "memory")
+    await pool.close()
+
+    mock_client.close.assert_awaited_once()
+    assert pool.stats()["clients"] == 0
+    assert pool.stats()["containers"] == 0
+
+
+@pytest.mark.asyncio
+async def test_clients_of_a_stale_loop_are_closed(mock_cosmos_client):
+    """Clients created on another event loop are closed before being replaced."""
+    client_cls, mock_client, _, _ = mock_cosmos_client
+    pool = CosmosClientPool(credential_provider=MagicMock())
+
+    await pool.get_container("https://mock-endpoint", "db", "memory")
+    stale_session = pool._sessions["https://mock-endpoint"]
+    # Pretend the handles were created by an earlier, stopped loop
+    stale_loop = asyncio.new_event_loop()
+    pool._loop = stale_loop
+    try:
+        await pool.get_container("https://mock-endpoint", "db", "memory")
+    finally:
+        stale_loop.close()
+
+    mock_client.close.assert_awaited_once()
+    assert stale_session.closed
+    assert client_cls.call_count == 2
+    assert pool.stats()["clients"] == 1
+
+    await pool.close()
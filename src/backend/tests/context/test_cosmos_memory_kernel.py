@@ -0,0 +1,520 @@
+import os
+import sys
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+from semantic_kernel.contents import AuthorRole, ChatMessageContent
+from semantic_kernel.memory.memory_record import MemoryRecord
+
+# Add the backend directory to the path so we can import our modules
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+# Mock environment variables before importing modules that load AppConfig
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://mock-openai-endpoint")
+os.environ.setdefault("AZURE_AI_SUBSCRIPTION_ID", "mock-subscription-id")
+os.environ.setdefault("AZURE_AI_RESOURCE_GROUP", "mock-resource-group")
+os.environ.setdefault("AZURE_AI_PROJECT_NAME", "mock-project-name")
+os.environ.setdefault("AZURE_AI_AGENT_PROJECT_CONNECTION_STRING", "mock-connection")
+
+from context.cosmos_memory_kernel import (  # noqa: E402
+    BatchWriteError,
+    CosmosMemoryContext,
+    FlushError,
+)
+from context.event_bus import session_events  # noqa: E402
+from context.message_buffer import message_buffers  # noqa: E402
+from context.plan_cache import plan_cache  # noqa: E402
+from models.messages_kernel import AgentType, Plan, Step, StepStatus  # noqa: E402
+
+
+@pytest.fixture
+def mock_container():
+    """A mock Cosmos DB container."""
+    container = MagicMock()
+    container.execute_item_batch = AsyncMock()
+    container.create_item = AsyncMock()
+    container.upsert_item = AsyncMock()
+    container.read_item = AsyncMock()
+    return container
+
+
+@pytest.fixture
+def memory_context(mock_container):
+    """A CosmosMemoryContext wired to the mock container."""
+    context = CosmosMemoryContext(
+        session_id="test_session", user_id="test_user", write_behind=False
+    )
+    context._container = mock_container
+    plan_cache.clear()
+    message_buffers.clear()
+    return context
+
+
+def make_plan_and_steps(count=2):
+    plan = Plan(session_id="test_session", user_id="test_user", initial_goal="goal")
+    steps = [
+        Step(
+            plan_id=plan.id,
+            session_id="test_session",
+            user_id="test_user",
+            action=f"action {i}",
+            agent=AgentType.HR,
+        )
+        for i in range(count)
+    ]
+    return plan, steps
+
+
+@pytest.mark.asyncio
+async def test_add_plan_with_steps_uses_single_batch(memory_context, mock_container):
+    """The plan and its steps are committed in one transactional batch."""
+    plan, steps = make_plan_and_steps()
+
+    await memory_context.add_plan_with_steps(plan, steps)
+
+    mock_container.execute_item_batch.assert_awaited_once()
+    kwargs = mock_container.execute_item_batch.await_args.kwargs
+    assert kwargs["partition_key"] == "test_session"
+    ids = [operation[1][0]["id"] for operation in kwargs["batch_operations"]]
+    assert set(ids) >= {plan.id, steps[0].id, steps[1].id}
+    creates = {
+        operation[1][0]["id"]
+        for operation in kwargs["batch_operations"]
+        if operation[0] == "create"
+    }
+    assert creates == {plan.id, steps[0].id, steps[1].id}
+    mock_container.create_item.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_add_plan_with_steps_writes_plan_index(memory_context, mock_container):
+    """The session's plan index is written in the same batch as the plan."""
+    plan, steps = make_plan_and_steps()
+
+    await memory_context.add_plan_with_steps(plan, steps)
+
+    operations = mock_container.execute_item_batch.await_args.kwargs["batch_operations"]
+    operation, (index,) = operations[-1]
+    assert operation == "upsert"
+    assert index["id"] == "plan_index:test_session"
+    assert index["plan_id"] == plan.id
+    assert index["plan"]["initial_goal"] == "goal"
+
+
+@pytest.mark.asyncio
+async def test_large_plan_writes_plan_and_index_in_the_first_batch(
+    memory_context, mock_container
+):
+    """Steps beyond one batch follow the batch holding the plan and its index."""
+    plan, steps = make_plan_and_steps(150)
+
+    await memory_context.add_plan_with_steps(plan, steps)
+
+    batches = [
+        [operation[1][0]["id"] for operation in call.kwargs["batch_operations"]]
+        for call in mock_container.execute_item_batch.await_args_list
+    ]
+    assert [len(batch) for batch in batches] == [100, 52]
+    assert batches[0][-2:] == [plan.id, "plan_index:test_session"]
+    assert batches[0][:-2] + batches[1] == [step.id for step in steps]
+
+
+@pytest.mark.asyncio
+async def test_get_plan_by_session_uses_point_read(memory_context, mock_container):
+    """A plan is fetched with a single point read of the plan index."""
+    plan, _ = make_plan_and_steps()
+    mock_container.read_item.return_value = memory_context._plan_index_document(
+        memory_context._serialize_item(plan)
+    )
+    mock_container.query_items = MagicMock()
+
+    result = await memory_context.get_plan_by_session("test_session")
+
+    assert result.id == plan.id
+    mock_container.read_item.assert_awaited_once_with(
+        item="plan_index:test_session", partition_key="test_session"
+    )
+    mock_container.query_items.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_repeated_plan_reads_are_cached(memory_context, mock_container):
+    """Repeated plan and step reads do not go back to Cosmos DB."""
+    plan, steps = make_plan_and_steps()
+    mock_container.read_item.return_value = memory_context._plan_index_document(
+        memory_context._serialize_item(plan)
+    )
+    memory_context.query_items = AsyncMock(return_value=steps)
+
+    for _ in range(3):
+        assert (await memory_context.get_plan_by_session("test_session")).id == plan.id
+        assert len(await memory_context.get_steps_by_plan(plan.id)) == 2
+
+    mock_container.read_item.assert_awaited_once()
+    memory_context.query_items.assert_awaited_once()
+
+    await memory_context.update_step(steps[0])
+    await memory_context.add_item(steps[1])
+    await memory_context.get_steps_by_plan(plan.id)
+    assert memory_context.query_items.await_count == 2
+
+
+class FakePager:
+    """Stands in for the AsyncItemPaged page iterator."""
+
+    def __init__(self, pages, continuation_token):
+        self._pages = pages
+        self.continuation_token = continuation_token
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for page in self._pages:
+            yield async_iter(page)
+
+
+async def async_iter(items):
+    for item in items:
+        yield item
+
+
+@pytest.mark.asyncio
+async def test_iter_items_streams_and_respects_max_items(memory_context, mock_container):
+    """Results are yielded lazily and the iteration stops at max_items."""
+    documents = [{"id": str(i), "_ts": i} for i in range(5)]
+    mock_container.query_items = MagicMock(return_value=async_iter(documents))
+
+    items = [
+        item
+        async for item in memory_context.iter_items(
+            "SELECT * FROM c", [], page_size=2, max_items=3
+        )
+    ]
+
+    assert [item["id"] for item in items] == ["0", "1", "2"]
+    assert mock_container.query_items.call_args.kwargs["max_item_count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_query_page_returns_continuation_token(memory_context, mock_container):
+    """A page request resumes from the given token and returns the next one."""
+    paged = MagicMock()
+    paged.by_page.return_value = FakePager([[{"id": "a", "_ts": 1}]], "next-token")
+    mock_container.query_items = MagicMock(return_value=paged)
+
+    items, token = await memory_context.query_page(
+        "SELECT * FROM c", [], page_size=1, continuation="previous-token"
+    )
+
+    assert items == [{"id": "a", "_ts": 1}]
+    assert token == "next-token"
+    paged.by_page.assert_called_once_with("previous-token")
+
+
+def test_project_rewrites_select_star():
+    """Projection turns SELECT * into the requested columns plus _ts."""
+    query = CosmosMemoryContext._project(
+        "SELECT * FROM c WHERE c.plan_id=@plan_id", ["id", "status"]
+    )
+    assert query == "SELECT c.id, c.status, c._ts FROM c WHERE c.plan_id=@plan_id"
+
+    with pytest.raises(ValueError):
+        CosmosMemoryContext._project("SELECT * FROM c", ["status; DROP"])
+
+
+@pytest.mark.asyncio
+async def test_step_summaries_fetch_only_summary_fields(memory_context, mock_container):
+    """Step summaries are read with a projection instead of full documents."""
+    document = {"id": "s1", "plan_id": "p1", "session_id": "test_session"}
+    mock_container.query_items = MagicMock(
+        return_value=async_iter([{**document, "status": "completed", "_ts": 1}])
+    )
+
+    summaries = await memory_context.get_step_summaries_by_plan("p1")
+
+    assert summaries[0].status == StepStatus.completed
+    query = mock_container.query_items.call_args.kwargs["query"]
+    assert query.startswith("SELECT c.id, c.plan_id, c.session_id, c.status, c._ts")
+
+
+@pytest.mark.asyncio
+async def test_step_status_counts_use_partition_group_by(memory_context, mock_container):
+    """Plans of one session are counted with a single GROUP BY query."""
+    plan, _ = make_plan_and_steps()
+    mock_container.query_items = MagicMock(
+        return_value=async_iter(
+            [
+                {"plan_id": plan.id, "status": "completed", "count": 2},
+                {"plan_id": plan.id, "status": "planned", "count": 1},
+            ]
+        )
+    )
+
+    counts = await memory_context.get_step_status_counts([plan])
+
+    assert counts == {plan.id: {StepStatus.completed: 2, StepStatus.planned: 1}}
+    kwargs = mock_container.query_items.call_args.kwargs
+    assert "GROUP BY" in kwargs["query"]
+    assert kwargs["partition_key"] == "test_session"
+
+
+@pytest.mark.asyncio
+async def test_step_status_counts_across_sessions(memory_context, mock_container):
+    """Plans from several sessions are counted from one projected query."""
+    first, _ = make_plan_and_steps()
+    second = Plan(session_id="other", user_id="test_user", initial_goal="goal")
+    mock_container.query_items = MagicMock(
+        return_value=async_iter(
+            {**document, "session_id": "test_session"}
+            for document in [
+                {"id": "a", "plan_id": first.id, "status": "completed", "_ts": 1},
+                {"id": "b", "plan_id": first.id, "status": "completed", "_ts": 1},
+                {"id": "c", "plan_id": second.id, "status": "failed", "_ts": 1},
+            ]
+        )
+    )
+
+    counts = await memory_context.get_step_status_counts([first, second])
+
+    assert counts == {
+        first.id: {StepStatus.completed: 2},
+        second.id: {StepStatus.failed: 1},
+    }
+    mock_container.query_items.assert_called_once()
+    assert "GROUP BY" not in mock_container.query_items.call_args.kwargs["query"]
+
+
+@pytest.mark.asyncio
+async def test_nearest_matches_search_beyond_recent_records(
+    memory_context, mock_container
+):
+    """Every embedded record is searched, not only the 100 most recent."""
+    documents = [
+        {"id": f"r{i}", "key": f"r{i}", "text": f"t{i}", "embedding": [1.0, i / 1000]}
+        for i in range(150)
+    ]
+    documents.append({"id": "best", "key": "best", "text": "x", "embedding": [0.0, 1.0]})
+    mock_container.query_items = MagicMock(return_value=async_iter(documents))
+    memory_context.session_id = "nearest_session"
+
+    matches = await memory_context.get_nearest_matches(
+        "docs", np.array([0.0, 1.0]), limit=2
+    )
+
+    assert [record.id for record, _ in matches] == ["best", "r149"]
+    assert matches[0][1] == pytest.approx(1.0)
+
+
+@pytest.mark.asyncio
+async def test_migrate_embeddings_rewrites_legacy_arrays(memory_context, mock_container):
+    """Only records not yet in the target encoding are rewritten, per partition."""
+    documents = [
+        {"id": "a", "session_id": "s1", "embedding": [1.0, 2.0], "_ts": 1},
+        {"id": "b", "session_id": "s2", "embedding": [3.0, 4.0], "_ts": 1},
+        {
+            "id": "c",
+            "session_id": "s1",
+            "embedding": {"encoding": "float32", "dims": 0, "data": ""},
+        },
+    ]
+    mock_container.query_items = MagicMock(return_value=async_iter(documents))
+
+    migrated = await memory_context.migrate_embeddings("float32")
+
+    assert migrated == 2
+    calls = mock_container.execute_item_batch.await_args_list
+    assert sorted(call.kwargs["partition_key"] for call in calls) == ["s1", "s2"]
+    _, (document,) = calls[0].kwargs["batch_operations"][0]
+    assert document["embedding"]["encoding"] == "float32"
+    assert "_ts" not in document
+
+
+@pytest.mark.asyncio
+async def test_upsert_batch_writes_chunks_of_100(memory_context, mock_container):
+    """Hundreds of records are written in a handful of transactional batches."""
+    records = [
+        MemoryRecord(
+            is_reference=False,
+            external_source_name="",
+            id=f"m{i}",
+            text=f"text {i}",
+            description="",
+            additional_metadata="",
+            embedding=np.array([1.0, float(i)]),
+            key=f"m{i}",
+        )
+        for i in range(250)
+    ]
+
+    ids = await memory_context.upsert_batch("docs", records)
+
+    assert ids == [f"m{i}" for i in range(250)]
+    calls = mock_container.execute_item_batch.await_args_list
+    assert [len(call.kwargs["batch_operations"]) for call in calls] == [100, 100, 50]
+    assert all(call.kwargs["partition_key"] == "test_session" for call in calls)
+    mock_container.upsert_item.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_upsert_batch_reports_records_of_failed_chunks(
+    memory_context, mock_container
+):
+    """When one chunk fails, the error tells which records were written."""
+    records = [
+        MemoryRecord(
+            is_reference=False,
+            external_source_name="",
+            id=f"m{i}",
+            text=f"text {i}",
+            description="",
+            additional_metadata="",
+            embedding=np.array([1.0, float(i)]),
+            key=f"m{i}",
+        )
+        for i in range(250)
+    ]
+
+    async def execute_item_batch(batch_operations, partition_key):
+        if batch_operations[0][1][0]["id"] == "m100":
+            raise RuntimeError("Request rate is large")
+
+    mock_container.execute_item_batch = AsyncMock(side_effect=execute_item_batch)
+
+    with pytest.raises(BatchWriteError) as error:
+        await memory_context.upsert_batch("docs", records)
+
+    assert error.value.failed_ids == [f"m{i}" for i in range(100, 200)]
+    assert error.value.written_ids == [
+        f"m{i}" for i in [*range(100), *range(200, 250)]
+    ]
+    assert isinstance(error.value.__cause__, RuntimeError)
+    assert mock_container.execute_item_batch.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_get_batch_uses_one_query_and_keeps_key_order(
+    memory_context, mock_container
+):
+    """All keys are fetched with a single query; missing keys are skipped."""
+    documents = [
+        {"id": "2", "key": "b", "text": "second"},
+        {"id": "1", "key": "a", "text": "first"},
+    ]
+    mock_container.query_items = MagicMock(return_value=async_iter(documents))
+
+    records = await memory_context.get_batch("docs", ["a", "missing", "b"])
+
+    assert [record.text for record in records] == ["first", "second"]
+    mock_container.query_items.assert_called_once()
+    kwargs = mock_container.query_items.call_args.kwargs
+    assert "ARRAY_CONTAINS(@keys, c.key)" in kwargs["query"]
+    assert {"name": "@keys", "value": ["a", "missing", "b"]} in kwargs["parameters"]
+
+
+@pytest.mark.asyncio
+async def test_remove_batch_deletes_with_batches(memory_context, mock_container):
+    """Removed records are deleted in one batch after a single id lookup."""
+    documents = [{"id": f"m{i}", "session_id": "test_session"} for i in range(3)]
+    mock_container.query_items = MagicMock(return_value=async_iter(documents))
+
+    await memory_context.remove_batch("docs", ["m0", "m1", "m2"])
+
+    mock_container.query_items.assert_called_once()
+    mock_container.execute_item_batch.assert_awaited_once_with(
+        batch_operations=[("delete", ("m0",)), ("delete", ("m1",)), ("delete", ("m2",))],
+        partition_key="test_session",
+    )
+
+
+@pytest.mark.asyncio
+async def test_messages_are_loaded_once_per_session(memory_context, mock_container):
+    """Recent messages are read once and then reused by later contexts."""
+    documents = [
+        {"content": {"role": "assistant", "content": "second"}},
+        {"content": {"role": "user", "content": "first"}},
+    ]
+    mock_container.query_items = MagicMock(return_value=async_iter(documents))
+
+    messages = await memory_context.get_messages()
+    assert [m.content for m in messages] == ["first", "second"]
+
+    next_request = CosmosMemoryContext(
+        session_id="test_session", user_id="test_user", write_behind=False
+    )
+    next_request._container = mock_container
+    await next_request.add_message(
+        ChatMessageContent(role=AuthorRole.USER, content="third")
+    )
+
+    history = next_request.get_chat_history()
+    assert [m.content for m in history.messages] == ["first", "second", "third"]
+    assert len(await next_request.get_messages()) == 3
+    mock_container.query_items.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_step_writes_are_published_to_session_events(
+    memory_context, mock_container
+):
+    """Plan and step writes are pushed to the session's event subscribers."""
+    plan, steps = make_plan_and_steps(count=1)
+    subscription = session_events.subscribe("test_user", "test_session")
+    try:
+        await memory_context.add_plan_with_steps(plan, steps)
+        steps[0].status = StepStatus.action_requested
+        await memory_context.update_step(steps[0])
+
+        events = [await subscription.next(timeout=1) for _ in range(3)]
+    finally:
+        session_events.unsubscribe(subscription)
+
+    assert [event["type"] for event in events] == ["step", "plan", "step"]
+    assert events[2]["data"]["status"] == "action_requested"
+
+
+@pytest.mark.asyncio
+async def test_flush_flushes_every_buffer_and_aggregates_errors(mock_container):
+    """A failing buffer does not stop the others of the session from flushing."""
+    failing, working = (
+        CosmosMemoryContext("s-flush", "test_user", write_behind=True) for _ in range(2)
+    )
+    failing_container = MagicMock()
+    failing_container.execute_item_batch = AsyncMock(side_effect=RuntimeError("boom"))
+    failing._container = failing_container
+    working._container = mock_container
+    for context in (failing, working):
+        await context._buffer_write("create", {"id": "m", "session_id": "s-flush"})
+
+    with pytest.raises(FlushError) as raised:
+        await failing.flush()
+
+    assert [str(e) for e in raised.value.errors] == ["boom"]
+    mock_container.execute_item_batch.assert_awaited_once()
+    assert not working._write_buffer.has_pending()
+    assert failing._write_buffer.has_pending()
+
+    failing_container.execute_item_batch.side_effect = None
+    await working.flush()
+    assert not failing._write_buffer.has_pending()
+    for context in (failing, working):
+        await context.close()
+
+
+def test_initial_messages_do_not_replace_a_shared_buffer(memory_context):
+    """A new context of a live session keeps the messages already buffered."""
+    memory_context._messages.seed(
+        [ChatMessageContent(role=AuthorRole.USER, content="a")]
+    )
+
+    other = CosmosMemoryContext(
+        session_id="test_session",
+        user_id="test_user",
+        initial_messages=[ChatMessageContent(role=AuthorRole.USER, content="stale")],
+        write_behind=False,
+    )
+
+    assert [m.content for m in other._messages.messages()] == ["a"]
@@ -0,0 +1,49 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add the backend directory to the path so we can import our modules
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+from context.embedding_codec import (  # noqa: E402
+    decode_embedding,
+    encode_embedding,
+    is_encoded_as,
+)
+
+
+@pytest.mark.parametrize("encoding", ["json", "float32"])
+def test_lossless_round_trip(encoding):
+    """JSON and float32 encodings decode to the same float32 vector."""
+    vector = np.array([0.25, -1.5, 3.0, 1e-3], dtype=np.float32)
+
+    decoded = decode_embedding(encode_embedding(vector, encoding))
+
+    assert decoded.dtype == np.float32
+    assert decoded.flags["C_CONTIGUOUS"]
+    assert np.array_equal(decoded, vector)
+
+
+def test_int8_round_trip_is_close_and_compact():
+    """int8 quantization keeps vectors within one quantization step."""
+    vector = np.random.default_rng(0).normal(size=1536).astype(np.float32)
+
+    encoded = encode_embedding(vector, "int8")
+    decoded = decode_embedding(encoded)
+
+    assert is_encoded_as(encoded, "int8")
+    assert np.max(np.abs(decoded - vector)) <= encoded["scale"]
+    assert len(encoded["data"]) < len(str(vector.tolist())) / 8
+
+
+def test_legacy_arrays_and_missing_values_decode():
+    """Plain JSON arrays written before encodings existed still decode."""
+    assert np.array_equal(decode_embedding([1, 2]), np.array([1, 2], np.float32))
+    assert decode_embedding(None) is None
+    assert decode_embedding([]) is None
+    with pytest.raises(ValueError):
+        encode_embedding(np.ones(2), "float16")
@@ -0,0 +1,77 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Add the backend directory to the path so we can import our modules
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+# Mock environment variables before importing modules that load AppConfig
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://mock-openai-endpoint")
+os.environ.setdefault("AZURE_AI_SUBSCRIPTION_ID", "mock-subscription-id")
+os.environ.setdefault("AZURE_AI_RESOURCE_GROUP", "mock-resource-group")
+os.environ.setdefault("AZURE_AI_PROJECT_NAME", "mock-project-name")
+os.environ.setdefault("AZURE_AI_AGENT_PROJECT_CONNECTION_STRING", "mock-connection")
+
+from context.event_bus import (  # noqa: E402
+    RESYNC_EVENT,
+    SessionEventBus,
+    format_sse,
+)
+from models.messages_kernel import AgentType, Step, StepStatus  # noqa: E402
+
+
+def make_step(user_id="user", session_id="s1"):
+    return Step(
+        plan_id="p1",
+        session_id=session_id,
+        user_id=user_id,
+        action="do it",
+        agent=AgentType.HR,
+        status=StepStatus.completed,
+    )
+
+
+@pytest.mark.asyncio
+async def test_events_reach_only_the_sessions_subscribers():
+    """Events are scoped to the user and session they were published for."""
+    bus = SessionEventBus()
+    mine = bus.subscribe("user", "s1")
+    other_user = bus.subscribe("intruder", "s1")
+
+    assert bus.publish_item(make_step()) == 1
+    assert bus.publish_item(make_step(session_id="s2")) == 0
+
+    event = await mine.next(timeout=1)
+    assert event["type"] == "step"
+    assert event["data"]["status"] == "completed"
+    assert event["data"]["agent"] == AgentType.HR.value
+    assert await other_user.next(timeout=0.01) is None
+
+    bus.unsubscribe(mine)
+    bus.unsubscribe(other_user)
+    assert bus.stats()["subscribers"] == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_gets_a_resync_event():
+    """A full queue is replaced by a resync event instead of blocking publishers."""
+    bus = SessionEventBus(max_events_per_subscriber=2)
+    subscription = bus.subscribe("user", "s1")
+
+    for i in range(3):
+        bus.publish("user", "s1", "step", {"n": i})
+
+    event = await subscription.next(timeout=1)
+    assert event["type"] == RESYNC_EVENT
+    assert await subscription.next(timeout=0.01) is None
+    assert bus.stats()["dropped"] == 2
+
+
+def test_format_sse():
+    assert format_sse({"type": "step", "data": {"id": "a"}}) == (
+        'event: step\ndata: {"id": "a"}\n\n'
+    )
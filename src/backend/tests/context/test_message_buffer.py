@@ -0,0 +1,67 @@
+import os
+import sys
+
+from semantic_kernel.contents import AuthorRole, ChatMessageContent
+
+# Add the backend directory to the path so we can import our modules
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+from context.message_buffer import (  # noqa: E402
+    MessageBufferRegistry,
+    SessionMessageBuffer,
+)
+
+
+def message(text):
+    return ChatMessageContent(role=AuthorRole.USER, content=text)
+
+
+def test_buffer_keeps_most_recent_messages():
+    """The ring buffer drops the oldest messages once it is full."""
+    buffer = SessionMessageBuffer(max_messages=3)
+    buffer.seed([message("a"), message("b")])
+    for text in ("c", "d", "e"):
+        buffer.append(message(text))
+
+    assert [m.content for m in buffer.messages()] == ["c", "d", "e"]
+    assert [m.content for m in buffer.chat_history().messages] == ["c", "d", "e"]
+
+
+def test_history_stays_bounded_without_reads():
+    """Appends trim the mirrored history even when it is never read."""
+    buffer = SessionMessageBuffer(max_messages=3)
+    for index in range(50):
+        buffer.append(message(str(index)))
+
+    assert len(buffer._history.messages) <= 2 * buffer.max_messages
+    assert [m.content for m in buffer.chat_history().messages] == ["47", "48", "49"]
+
+
+def test_chat_history_is_incremental_and_isolated():
+    """Histories reflect later appends, and callers cannot change the buffer."""
+    buffer = SessionMessageBuffer(max_messages=2)
+    first = buffer.chat_history()
+    first.add_message(message("caller"))
+
+    buffer.append(message("a"))
+    buffer.append(message("b"))
+    buffer.append(message("c"))
+
+    assert [m.content for m in buffer.chat_history().messages] == ["b", "c"]
+    assert len(buffer) == 2
+
+
+def test_registry_shares_buffers_per_session():
+    """Contexts of the same session reuse one buffer until it is invalidated."""
+    registry = MessageBufferRegistry(max_sessions=2)
+    buffer = registry.get_or_create("user", "s1")
+    buffer.seed([message("a")])
+
+    assert registry.get_or_create("user", "s1") is buffer
+    assert registry.get_or_create("other", "s1") is not buffer
+    assert registry.stats()["messages"] == 1
+
+    registry.invalidate_user("user")
+    assert not registry.get_or_create("user", "s1").seeded
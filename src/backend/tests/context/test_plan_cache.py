@@ -0,0 +1,63 @@
+import os
+import sys
+
+# Add the backend directory to the path so we can import our modules
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+# Mock environment variables before importing modules that load AppConfig
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://mock-openai-endpoint")
+os.environ.setdefault("AZURE_AI_SUBSCRIPTION_ID", "mock-subscription-id")
+os.environ.setdefault("AZURE_AI_RESOURCE_GROUP", "mock-resource-group")
+os.environ.setdefault("AZURE_AI_PROJECT_NAME", "mock-project-name")
+os.environ.setdefault("AZURE_AI_AGENT_PROJECT_CONNECTION_STRING", "mock-connection")
+
+from cache_utils import LRUTTLCache  # noqa: E402
+from context.plan_cache import PlanCache  # noqa: E402
+from models.messages_kernel import AgentType, Step, StepStatus  # noqa: E402
+
+
+def make_step(step_id="s1"):
+    return Step(
+        id=step_id,
+        plan_id="p1",
+        session_id="session",
+        user_id="user",
+        action="do it",
+        agent=AgentType.HR,
+    )
+
+
+def test_lru_ttl_cache_evicts_least_recently_used():
+    """The least recently used entry is evicted once the cache is full."""
+    evicted = []
+    cache = LRUTTLCache(max_entries=2, on_evict=lambda k, v: evicted.append(k))
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert evicted == ["b"]
+    assert cache.get("b") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_plan_cache_returns_copies_and_writes_through_updates():
+    """Cached steps are copies and step updates patch the cached list."""
+    cache = PlanCache(max_entries=16, ttl_seconds=60)
+    cache.set_steps("user", "session", "p1", [make_step("s1"), make_step("s2")])
+
+    steps = cache.get_steps("user", "session", "p1")
+    steps[0].status = StepStatus.completed
+    assert cache.get_steps("user", "session", "p1")[0].status == StepStatus.planned
+
+    cache.update_step("user", steps[0])
+    cached = cache.get_steps("user", "session", "p1")
+    assert [s.status for s in cached] == [StepStatus.completed, StepStatus.planned]
+    assert cache.get_step("user", "session", "s1").status == StepStatus.completed
+
+    cache.invalidate_session("user", "session")
+    assert cache.get_steps("user", "session", "p1") is None
@@ -0,0 +1,108 @@
+import asyncio
+import os
+import sys
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+# Add the backend directory to the path so we can import our modules
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+# Mock environment variables before importing modules that load AppConfig
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://mock-openai-endpoint")
+os.environ.setdefault("AZURE_AI_SUBSCRIPTION_ID", "mock-subscription-id")
+os.environ.setdefault("AZURE_AI_RESOURCE_GROUP", "mock-resource-group")
+os.environ.setdefault("AZURE_AI_PROJECT_NAME", "mock-project-name")
+os.environ.setdefault("AZURE_AI_AGENT_PROJECT_CONNECTION_STRING", "mock-connection")
+
+from context.cosmos_memory_kernel import CosmosMemoryContext  # noqa: E402
+from context.session_registry import SessionContextRegistry  # noqa: E402
+
+
+def test_session_pairs_are_reused():
+    """The same kernel and context are returned for every request of a session."""
+    factory = MagicMock(side_effect=lambda: object())
+    registry = SessionContextRegistry(kernel_factory=factory)
+
+    kernel, memory_store = registry.get("user", "s1")
+
+    assert registry.get("user", "s1") == (kernel, memory_store)
+    assert registry.get("user", "s2")[1] is not memory_store
+    assert factory.call_count == 2
+    assert memory_store.session_id == "s1" and memory_store.user_id == "user"
+    assert registry.stats()["live_sessions"] == 2
+
+
+@pytest.mark.asyncio
+async def test_evicted_contexts_are_closed():
+    """Sessions pushed out by newer ones, or left idle, get their writes flushed."""
+    container = MagicMock()
+    container.execute_item_batch = AsyncMock()
+
+    def create_context(session_id, user_id):
+        context = CosmosMemoryContext(session_id, user_id, write_behind=True)
+        context._container = container
+        return context
+
+    registry = SessionContextRegistry(
+        kernel_factory=object, max_sessions=1, idle_seconds=60
+    )
+    with patch("context.session_registry.CosmosMemoryContext", new=create_context):
+        _, first = registry.get("user", "s1")
+        await first._write_buffer.add("create", {"id": "m1", "session_id": "s1"})
+        _, second = registry.get("user", "s2")
+        await second._write_buffer.add("create", {"id": "m2", "session_id": "s2"})
+        with patch("cache_utils.time.monotonic", return_value=time.monotonic() + 120):
+            assert registry.expire() == 1
+        await registry.close()
+
+    flushed = [
+        call.kwargs["partition_key"]
+        for call in container.execute_item_batch.await_args_list
+    ]
+    assert sorted(flushed) == ["s1", "s2"]
+    for context in (first, second):
+        assert not context._write_buffer.has_pending()
+        assert context._container is None
+        assert context not in CosmosMemoryContext._buffered_contexts
+    assert registry.stats()["evictions"] == 2
+    assert registry.stats()["live_sessions"] == 0
+
+
+@pytest.mark.asyncio
+async def test_pinned_context_is_closed_after_release():
+    """Evicting a session whose context is in use closes it only when released."""
+    registry = SessionContextRegistry(
+        kernel_factory=object, max_sessions=1, idle_seconds=60
+    )
+    async with registry.pinned("user", "s1") as (_, memory_store):
+        memory_store.close = AsyncMock()
+        registry.get("user", "s2")
+        await asyncio.sleep(0)
+        memory_store.close.assert_not_awaited()
+        assert registry.stats()["pinned"] == 1
+
+    memory_store.close.assert_awaited_once()
+    assert registry.stats()["pinned"] == 0
+
+
+@pytest.mark.asyncio
+async def test_closed_context_written_again_is_flushed():
+    """A context still held after it was closed registers its new writes again."""
+    container = MagicMock()
+    container.execute_item_batch = AsyncMock()
+    context = CosmosMemoryContext("s1", "user", write_behind=True)
+    context._container = container
+    await context.close()
+    assert context not in CosmosMemoryContext._buffered_contexts
+
+    context._container = container
+    await context._buffer_write("create", {"id": "m1", "session_id": "s1"})
+    assert context in CosmosMemoryContext._buffered_contexts
+
+    await CosmosMemoryContext.close_all()
+    container.execute_item_batch.assert_awaited_once()
+    assert not context._write_buffer.has_pending()
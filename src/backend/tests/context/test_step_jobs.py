@@ -0,0 +1,177 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Add the backend directory to the path so we can import our modules
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+# Mock environment variables before importing modules that load AppConfig
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://mock-openai-endpoint")
+os.environ.setdefault("AZURE_AI_SUBSCRIPTION_ID", "mock-subscription-id")
+os.environ.setdefault("AZURE_AI_RESOURCE_GROUP", "mock-resource-group")
+os.environ.setdefault("AZURE_AI_PROJECT_NAME", "mock-project-name")
+os.environ.setdefault("AZURE_AI_AGENT_PROJECT_CONNECTION_STRING", "mock-connection")
+
+from context.step_jobs import (  # noqa: E402
+    JobStore,
+    SQLiteJobStore,
+    StepJob,
+    StepJobQueue,
+)
+from models.messages_kernel import HumanFeedback  # noqa: E402
+
+
+def feedback(step_id=None):
+    return HumanFeedback(
+        step_id=step_id, plan_id="p1", session_id="s1", approved=True
+    )
+
+
+async def wait_for_status(queue, job_id, *statuses, timeout=2.0):
+    async def poll():
+        while True:
+            job = await queue.get(job_id, "user")
+            if job.status in statuses:
+                return job
+            await asyncio.sleep(0.01)
+
+    return await asyncio.wait_for(poll(), timeout)
+
+
+@pytest.mark.asyncio
+async def test_job_runs_in_background_and_is_stored(tmp_path):
+    """A submitted job returns at once and its outcome is persisted."""
+    store = SQLiteJobStore(str(tmp_path / "jobs.sqlite3"))
+    queue = StepJobQueue(store, workers=2)
+    handled = []
+
+    async def handler(job):
+        await asyncio.sleep(0.05)
+        handled.append(job.feedback.step_id)
+
+    await queue.start(handler)
+    job = await queue.submit("user", feedback("step-1"))
+    assert job.status == "queued"
+
+    job = await wait_for_status(queue, job.id, "completed")
+    await queue.stop()
+
+    assert handled == ["step-1"]
+    assert job.attempts == 1
+    assert (await store.get(job.id)).status == "completed"
+    assert await queue.get(job.id, "someone-else") is None
+
+
+@pytest.mark.asyncio
+async def test_failed_job_is_retried_then_can_be_retried_manually():
+    """Failures are retried up to max_attempts, then the job can be queued again."""
+    queue = StepJobQueue(JobStore(), workers=1, max_attempts=2, retry_delay_seconds=0)
+    calls = 0
+
+    async def handler(job):
+        nonlocal calls
+        calls += 1
+        if calls <= 2:
+            raise RuntimeError(f"attempt {calls} failed")
+
+    await queue.start(handler)
+    job = await queue.submit("user", feedback())
+
+    job = await wait_for_status(queue, job.id, "failed")
+    assert job.attempts == 2
+    assert job.error == "attempt 2 failed"
+
+    await queue.retry(job.id, "user")
+    job = await wait_for_status(queue, job.id, "completed")
+    await queue.stop()
+
+    assert calls == 3
+    assert queue.stats()["retried"] == 1
+
+
+@pytest.mark.asyncio
+async def test_running_job_can_be_cancelled():
+    """Cancelling a running job stops its handler and the worker moves on."""
+    queue = StepJobQueue(JobStore(), workers=1)
+    started = asyncio.Event()
+    handled = []
+
+    async def handler(job):
+        if job.feedback.step_id == "slow":
+            started.set()
+            await asyncio.sleep(10)
+        handled.append(job.feedback.step_id)
+
+    await queue.start(handler)
+    slow = await queue.submit("user", feedback("slow"))
+    fast = await queue.submit("user", feedback("fast"))
+    await started.wait()
+
+    cancelled = await queue.cancel(slow.id, "user")
+    assert cancelled.status == "cancelled"
+
+    await wait_for_status(queue, fast.id, "completed")
+    await queue.stop()
+
+    assert handled == ["fast"]
+    assert (await queue.get(slow.id, "user")).status == "cancelled"
+
+
+@pytest.mark.asyncio
+async def test_unfinished_jobs_are_queued_again_on_start(tmp_path):
+    """Queued and interrupted jobs survive a restart; exhausted ones fail."""
+    path = str(tmp_path / "jobs.sqlite3")
+    store = SQLiteJobStore(path)
+    queued = StepJob(user_id="user", feedback=feedback("a"), max_attempts=3)
+    interrupted = StepJob(
+        user_id="user",
+        feedback=feedback("b"),
+        status="running",
+        attempts=1,
+        max_attempts=3,
+    )
+    exhausted = StepJob(
+        user_id="user",
+        feedback=feedback("c"),
+        status="running",
+        attempts=3,
+        max_attempts=3,
+    )
+    for job in (queued, interrupted, exhausted):
+        await store.save(job)
+
+    handled = []
+
+    async def handler(job):
+        handled.append(job.feedback.step_id)
+
+    # A new process opens the same file
+    queue = StepJobQueue(SQLiteJobStore(path), workers=1)
+    assert await queue.start(handler) == 2
+
+    interrupted = await wait_for_status(queue, interrupted.id, "completed")
+    exhausted = await queue.get(exhausted.id, "user")
+    await queue.stop()
+
+    assert handled == ["a", "b"]
+    # The interrupted run counted as an attempt
+    assert interrupted.attempts == 2
+    assert exhausted.status == "failed"
+    assert exhausted.error == "Interrupted by a restart"
+
+
+@pytest.mark.asyncio
+async def test_retry_requires_a_started_queue():
+    """Retrying before the workers run is refused instead of failing obscurely."""
+    store = JobStore()
+    job = StepJob(user_id="user", feedback=feedback("a"), status="failed")
+    await store.save(job)
+    queue = StepJobQueue(store)
+
+    with pytest.raises(RuntimeError, match="not been started"):
+        await queue.retry(job.id, "user")
+    assert (await store.get(job.id)).status == "failed"
@@ -0,0 +1,71 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add the backend directory to the path so we can import our modules
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+# Mock environment variables before importing modules that load AppConfig
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://mock-openai-endpoint")
+os.environ.setdefault("AZURE_AI_SUBSCRIPTION_ID", "mock-subscription-id")
+os.environ.setdefault("AZURE_AI_RESOURCE_GROUP", "mock-resource-group")
+os.environ.setdefault("AZURE_AI_PROJECT_NAME", "mock-project-name")
+os.environ.setdefault("AZURE_AI_AGENT_PROJECT_CONNECTION_STRING", "mock-connection")
+
+from context.vector_index import VectorIndex, VectorIndexRegistry  # noqa: E402
+
+
+def test_search_matches_brute_force_cosine():
+    """Top-k results equal a brute-force cosine similarity ranking."""
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(500, 16))
+    index = VectorIndex(initial_capacity=8)
+    for i, vector in enumerate(vectors):
+        index.upsert(str(i), vector)
+
+    query = rng.normal(size=16)
+    expected = vectors @ query / (np.linalg.norm(vectors, axis=1) * np.linalg.norm(query))
+    top = np.argsort(-expected)[:5]
+
+    results = index.search(query, limit=5, min_score=-1.0)
+
+    assert [item_id for item_id, _ in results] == [str(i) for i in top]
+    assert np.allclose([score for _, score in results], expected[top], atol=1e-5)
+
+
+def test_remove_and_replace_keep_index_consistent():
+    """Removed vectors disappear and replaced vectors use the new values."""
+    index = VectorIndex()
+    index.upsert("a", np.array([1.0, 0.0]))
+    index.upsert("b", np.array([0.0, 1.0]))
+    index.upsert("c", np.array([1.0, 1.0]))
+
+    index.remove("a")
+    index.upsert("b", np.array([2.0, 0.0]))
+
+    assert len(index) == 2
+    assert index.search(np.array([1.0, 0.0]), limit=1)[0][0] == "b"
+    assert np.allclose(index.get_vector("b"), [2.0, 0.0])
+    assert not index.upsert("zero", np.zeros(2))
+
+
+@pytest.mark.asyncio
+async def test_registry_builds_each_index_once():
+    """The loader runs only on the first lookup of a collection."""
+    registry = VectorIndexRegistry()
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        return [("a", np.array([1.0, 0.0]), "record-a")]
+
+    first = await registry.get_or_build(("user", "session", "docs"), loader)
+    second = await registry.get_or_build(("user", "session", "docs"), loader)
+
+    assert first is second
+    assert len(calls) == 1
+    assert first.get_payload("a") == "record-a"
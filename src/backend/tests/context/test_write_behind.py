@@ -0,0 +1,212 @@
+import asyncio
+import os
+import sys
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import pytest_asyncio
+from azure.cosmos.exceptions import CosmosBatchOperationError
+
+# Add the backend directory to the path so we can import our modules
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
+
+from context.write_behind import WriteBehindBuffer  # noqa: E402
+
+# Buffers created by the running test
+buffers = []
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def cancel_flush_timers():
+    """Cancel the background flush timers a test leaves behind."""
+    yield
+    timers = [buffer._timer for buffer in buffers if buffer._timer is not None]
+    buffers.clear()
+    for timer in timers:
+        timer.cancel()
+    await asyncio.gather(*timers, return_exceptions=True)
+
+
+def make_buffer(max_batch_size=100, flush_interval=60, max_attempts=3):
+    """Create a buffer backed by a mock container."""
+    container = MagicMock()
+    container.execute_item_batch = AsyncMock()
+
+    async def container_provider():
+        return container
+
+    buffer = WriteBehindBuffer(
+        container_provider=container_provider,
+        max_batch_size=max_batch_size,
+        flush_interval=flush_interval,
+        max_attempts=max_attempts,
+    )
+    buffers.append(buffer)
+    return buffer, container
+
+
+@pytest.mark.asyncio
+async def test_flush_groups_writes_by_partition():
+    """Each partition is written in its own transactional batch."""
+    buffer, container = make_buffer()
+
+    await buffer.add("create", {"id": "a", "session_id": "s1"})
+    await buffer.add("create", {"id": "b", "session_id": "s1"})
+    await buffer.add("upsert", {"id": "c", "session_id": "s2"})
+    await buffer.flush()
+
+    assert container.execute_item_batch.await_count == 2
+    calls = {
+        call.kwargs["partition_key"]: call.kwargs["batch_operations"]
+        for call in container.execute_item_batch.await_args_list
+    }
+    assert [op for op, _ in calls["s1"]] == ["create", "create"]
+    assert [op for op, _ in calls["s2"]] == ["upsert"]
+    assert not buffer.has_pending()
+
+
+@pytest.mark.asyncio
+async def test_pending_writes_are_readable_and_coalesced():
+    """An update of a buffered create stays a create with the latest body."""
+    buffer, container = make_buffer()
+
+    await buffer.add("create", {"id": "a", "session_id": "s1", "status": "planned"})
+    await buffer.add("upsert", {"id": "a", "session_id": "s1", "status": "completed"})
+
+    assert buffer.get_pending("a", "s1")["status"] == "completed"
+    assert len(buffer) == 1
+
+    await buffer.flush()
+    operations = container.execute_item_batch.await_args.kwargs["batch_operations"]
+    assert operations == [
+        ("create", ({"id": "a", "session_id": "s1", "status": "completed"},))
+    ]
+
+
+@pytest.mark.asyncio
+async def test_batch_size_triggers_flush():
+    """Reaching the batch size flushes without waiting for the timer."""
+    buffer, container = make_buffer(max_batch_size=2)
+
+    await buffer.add("create", {"id": "a", "session_id": "s1"})
+    container.execute_item_batch.assert_not_awaited()
+    await buffer.add("create", {"id": "b", "session_id": "s1"})
+
+    container.execute_item_batch.assert_awaited_once()
+    await buffer.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_kept_for_retry():
+    """A failed batch raises and its operations remain buffered."""
+    buffer, container = make_buffer()
+    container.execute_item_batch.side_effect = RuntimeError("boom")
+
+    await buffer.add("create", {"id": "a", "session_id": "s1"})
+    with pytest.raises(RuntimeError):
+        await buffer.flush()
+
+    assert buffer.get_pending("a", "s1") is not None
+
+    container.execute_item_batch.side_effect = None
+    await buffer.flush()
+    assert not buffer.has_pending()
+
+
+@pytest.mark.asyncio
+async def test_writes_stay_readable_while_being_flushed():
+    """A read during a flush still sees the writes that are not stored yet."""
+    buffer, container = make_buffer()
+    written = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_batch(**kwargs):
+        written.set()
+        await release.wait()
+
+    container.execute_item_batch.side_effect = slow_batch
+    await buffer.add("create", {"id": "a", "session_id": "s1", "status": "planned"})
+    flush = asyncio.create_task(buffer.flush())
+    await written.wait()
+
+    assert buffer.has_pending()
+    assert buffer.get_pending("a", "s1")["status"] == "planned"
+
+    # A newer write made during the flush takes precedence
+    await buffer.add("upsert", {"id": "a", "session_id": "s1", "status": "completed"})
+    assert buffer.get_pending("a", "s1")["status"] == "completed"
+
+    release.set()
+    await flush
+    assert buffer.get_pending("a", "s1")["status"] == "completed"
+    await buffer.flush()
+    assert buffer.get_pending("a", "s1") is None
+
+
+@pytest.mark.asyncio
+async def test_failing_write_is_dropped_after_max_attempts():
+    """A write that keeps failing stops being retried and blocking later flushes."""
+    buffer, container = make_buffer(max_attempts=2)
+    container.execute_item_batch.side_effect = RuntimeError("unavailable")
+
+    await buffer.add("create", {"id": "a", "session_id": "s1"})
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            await buffer.flush()
+
+    assert not buffer.has_pending()
+    assert buffer.dropped == 1
+
+    container.execute_item_batch.side_effect = None
+    await buffer.add("create", {"id": "b", "session_id": "s1"})
+    await buffer.flush()
+    operations = container.execute_item_batch.await_args.kwargs["batch_operations"]
+    assert [document["id"] for _, (document,) in operations] == ["b"]
+
+
+@pytest.mark.asyncio
+async def test_non_retryable_operation_is_dropped_and_the_rest_retried():
+    """A conflicting create is dropped at once; the rest of its batch is kept."""
+    buffer, container = make_buffer()
+    container.execute_item_batch.side_effect = [
+        CosmosBatchOperationError(
+            error_index=1,
+            headers={},
+            status_code=409,
+            message="Conflict",
+            operation_responses=[{"statusCode": 424}, {"statusCode": 409}],
+        ),
+        None,
+    ]
+
+    await buffer.add("create", {"id": "a", "session_id": "s1"})
+    await buffer.add("create", {"id": "b", "session_id": "s1"})
+    with pytest.raises(CosmosBatchOperationError):
+        await buffer.flush()
+
+    assert buffer.get_pending("a", "s1") is not None
+    assert buffer.get_pending("b", "s1") is None
+    assert buffer.dropped == 1
+
+    await buffer.flush()
+    operations = container.execute_item_batch.await_args.kwargs["batch_operations"]
+    assert [document["id"] for _, (document,) in operations] == ["a"]
+    assert not buffer.has_pending()
+
+
+@pytest.mark.asyncio
+async def test_failed_background_flush_is_retried():
+    """Writes kept after a failed flush are flushed again without a new write."""
+    buffer, container = make_buffer(flush_interval=0.01)
+    container.execute_item_batch.side_effect = [RuntimeError("boom"), None]
+
+    await buffer.add("create", {"id": "a", "session_id": "s1"})
+
+    async def flushed():
+        while buffer.has_pending():
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(flushed(), 1)
+    assert container.execute_item_batch.await_count == 2
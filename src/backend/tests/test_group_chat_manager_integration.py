@@ -74,6 +74,12 @@ class TestCleanupCosmosContext(CosmosMemoryContext):
         """Add a step and track it for cleanup."""
         await super().add_step(step)
         self.created_steps.add(step.id)
+
+    async def add_plan_with_steps(self, plan: Plan, steps: List[Step]) -> None:
+        """Add a plan with its steps and track them for cleanup."""
+        await super().add_plan_with_steps(plan, steps)
+        self.created_plans.add(plan.id)
+        self.created_steps.update(step.id for step in steps)
         
     async def cleanup_test_data(self) -> None:
         """Clean up all data created during testing."""
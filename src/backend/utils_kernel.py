@@ -12,7 +12,9 @@ import semantic_kernel as sk
 # Import AppConfig from app_config
 from app_config import config
 from azure.identity import DefaultAzureCredential
+from cache_utils import LRUTTLCache
 from context.cosmos_memory_kernel import CosmosMemoryContext
+from context.session_registry import session_contexts
 
 # Import agent factory and the new AppConfig
 from kernel_agents.agent_factory import AgentFactory
@@ -31,8 +33,11 @@ from semantic_kernel.functions import KernelFunction
 
 logging.basicConfig(level=logging.INFO)
 
-# Cache for agent instances by session
-agent_instances: Dict[str, Dict[str, Any]] = {}
+# Bounded cache for agent instances by session
+agent_instances = LRUTTLCache(
+    max_entries=config.AGENT_CACHE_MAX_SESSIONS,
+    ttl_seconds=config.AGENT_CACHE_TTL_SECONDS,
+)
 azure_agent_instances: Dict[str, Dict[str, AzureAIAgent]] = {}
 
 
@@ -40,7 +45,10 @@ async def initialize_runtime_and_context(
     session_id: Optional[str] = None, user_id: str = None
 ) -> Tuple[sk.Kernel, CosmosMemoryContext]:
     """
-    Initializes the Semantic Kernel runtime and context for a given session.
+    Returns the Semantic Kernel runtime and context for a given session.
+
+    Kernel and memory context are created on the first request of a session and
+    reused until the session is evicted from the session registry.
 
     Args:
         session_id: The session ID.
@@ -57,11 +65,8 @@ async def initialize_runtime_and_context(
     if session_id is None:
         session_id = str(uuid.uuid4())
 
-    # Create a kernel and memory store using the AppConfig instance
-    kernel = config.create_kernel()
-    memory_store = CosmosMemoryContext(session_id, user_id)
-
-    return kernel, memory_store
+    # Reuse the session's warm kernel and memory store, created once per session
+    return session_contexts.get(user_id, session_id)
 
 
 async def get_agents(session_id: str, user_id: str) -> Dict[str, Any]:
@@ -77,8 +82,9 @@ async def get_agents(session_id: str, user_id: str) -> Dict[str, Any]:
     """
     cache_key = f"{session_id}_{user_id}"
 
-    if cache_key in agent_instances:
-        return agent_instances[cache_key]
+    cached_agents = agent_instances.get(cache_key)
+    if cached_agents is not None:
+        return cached_agents
 
     try:
         # Create all agents for this session using the factory
@@ -107,7 +113,7 @@ async def get_agents(session_id: str, user_id: str) -> Dict[str, Any]:
         }
 
         # Cache the agents
-        agent_instances[cache_key] = agents
+        agent_instances.set(cache_key, agents)
 
         return agents
     except Exception as e:
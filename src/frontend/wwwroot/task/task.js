@@ -577,6 +577,9 @@
               stageCount++;
             });
 
+            // Replies still being generated follow the stored messages
+            liveReplies.forEach((reply, stepId) => showLiveReply(stepId));
+
             const mediaContents = document.querySelectorAll(".media-content");
             if (mediaContents.length > 0) {
               mediaContents[mediaContents.length - 1].scrollIntoView({
@@ -661,6 +664,215 @@
     );
   };
 
+  // Step jobs that finished before anyone waited for them, and pending waiters
+  const finishedStepJobs = new Map();
+  const stepJobWaiters = new Map();
+  let taskEventsConnected = false;
+  let taskEventsDisconnected = false;
+  let taskRefreshTimer = null;
+
+  // Text streamed so far of agent replies that are not stored yet, by step
+  const liveReplies = new Map();
+
+  // Shows a reply while the agent is still generating it; the stored message
+  // replaces it once the agent_message event arrives
+  const showLiveReply = (stepId) => {
+    const reply = liveReplies.get(stepId);
+    const elementId = "liveReply-" + stepId;
+    let messageItem = document.getElementById(elementId);
+    if (!messageItem) {
+      messageItem = document.createElement("div");
+      messageItem.id = elementId;
+      messageItem.classList.add("media");
+      taskMessages.appendChild(messageItem);
+    }
+    messageItem.innerHTML = `
+                                    <div class="media-left">
+                                        <figure
+                                            class="image is-agent is-avatar is-rounded is-32x32 m-1 has-status has-status-busy">
+                                            ${agentToIcon(reply.source)}
+                                        </figure>
+                                    </div>
+                                    <div class="media-content">
+                                        <div class="content">
+                                            <div class="is-size-7 has-text-weight-medium has-text-grey is-flex">
+                                                ${reply.source.replace(/_/g, " ")} • Responding…
+                                            </div>
+                                            <div class="notification is-light mt-1">
+                                                ${markdownConverter.makeHtml(reply.text)}
+                                            </div>
+                                        </div>
+                                    </div>
+                                    `;
+  };
+
+  const renderReplyChunk = (chunk) => {
+    const reply = liveReplies.get(chunk.step_id) || {
+      source: chunk.source,
+      text: "",
+    };
+    reply.text += chunk.content;
+    liveReplies.set(chunk.step_id, reply);
+    showLiveReply(chunk.step_id);
+  };
+
+  // Coalesces a burst of session events into one reload of the task view
+  const scheduleTaskRefresh = () => {
+    clearTimeout(taskRefreshTimer);
+    taskRefreshTimer = setTimeout(taskDetails, 300);
+  };
+
+  const handleTaskEvent = (type, data) => {
+    if (type === "ready") {
+      taskEventsConnected = true;
+      // Changes made while the stream was down were missed
+      if (taskEventsDisconnected) scheduleTaskRefresh();
+    } else if (type === "step_job") {
+      if (["queued", "running"].includes(data.status)) return;
+      const resolve = stepJobWaiters.get(data.id);
+      if (resolve) {
+        stepJobWaiters.delete(data.id);
+        resolve(data);
+      } else {
+        finishedStepJobs.set(data.id, data);
+      }
+    } else if (type === "agent_reply_chunk") {
+      renderReplyChunk(data);
+    } else if (["plan", "step", "agent_message", "resync"].includes(type)) {
+      if (type === "agent_message") liveReplies.delete(data.step_id);
+      scheduleTaskRefresh();
+    }
+  };
+
+  // Follows the session's Server-Sent Events. fetch is used rather than
+  // EventSource because the API needs the authentication headers.
+  const subscribeToTaskEvents = async (sessionId) => {
+    const headers = await window.headers;
+    const decoder = new TextDecoder();
+    let buffer = "";
+
+    try {
+      const response = await fetch(apiEndpoint + "/events/" + sessionId, {
+        method: "GET",
+        headers: headers,
+      });
+      if (!response.ok || !response.body) {
+        throw new Error(`Event stream returned ${response.status}`);
+      }
+
+      const reader = response.body.getReader();
+      while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        let boundary;
+        while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+          const message = buffer.slice(0, boundary);
+          buffer = buffer.slice(boundary + 2);
+
+          let type = "message";
+          let data = "";
+          message.split("\n").forEach((line) => {
+            if (line.startsWith("event: ")) type = line.slice(7);
+            else if (line.startsWith("data: ")) data += line.slice(6);
+          });
+          // Keep-alive comments carry no data
+          if (data) handleTaskEvent(type, JSON.parse(data));
+        }
+      }
+    } catch (error) {
+      console.error("Event stream error:", error);
+    }
+
+    taskEventsConnected = false;
+    taskEventsDisconnected = true;
+    setTimeout(() => subscribeToTaskEvents(sessionId), 3000);
+  };
+
+  // Resolves with the step job once it has finished running in the background.
+  // Its outcome normally arrives on the event stream; the job is also polled,
+  // rarely while the stream is connected, in case the event was missed.
+  const waitForStepJob = (headers, jobId) => {
+    if (finishedStepJobs.has(jobId)) {
+      const job = finishedStepJobs.get(jobId);
+      finishedStepJobs.delete(jobId);
+      return Promise.resolve(job);
+    }
+
+    return new Promise((resolve, reject) => {
+      stepJobWaiters.set(jobId, resolve);
+
+      const poll = () => {
+        if (!stepJobWaiters.has(jobId)) return;
+        fetch(apiEndpoint + "/step_jobs/" + jobId, { headers: headers })
+          .then((response) => response.json())
+          .then((job) => {
+            if (!stepJobWaiters.has(jobId)) return;
+            if (["queued", "running"].includes(job.status)) {
+              setTimeout(poll, taskEventsConnected ? 15000 : 2000);
+            } else {
+              stepJobWaiters.delete(jobId);
+              resolve(job);
+            }
+          })
+          .catch((error) => {
+            stepJobWaiters.delete(jobId);
+            reject(error);
+          });
+      };
+      setTimeout(poll, taskEventsConnected ? 15000 : 2000);
+    });
+  };
+
+  const escapeHtml = (text) => {
+    const element = document.createElement("span");
+    element.textContent = text;
+    return element.innerHTML;
+  };
+
+  // Reports how a background step job ended. Completed jobs call onCompleted;
+  // failed or cancelled ones show their error and can be retried with a click.
+  const settleStepJob = (headers, job, onCompleted) => {
+    if (job.status === "completed") {
+      onCompleted();
+    } else {
+      const reason = job.error ? `: ${escapeHtml(job.error)}` : "";
+      const notification = notyf.error({
+        message: `The background run ${job.status}${reason}. Click to retry.`,
+        duration: 0,
+        dismissible: true,
+      });
+      notification.on("click", () => {
+        notyf.dismiss(notification);
+        retryStepJob(headers, job.id, onCompleted);
+      });
+    }
+    taskDetails();
+  };
+
+  const retryStepJob = (headers, jobId, onCompleted) => {
+    fetch(apiEndpoint + "/step_jobs/" + jobId + "/retry", {
+      method: "POST",
+      headers: headers,
+    })
+      .then((response) =>
+        response.json().then((data) => {
+          if (!response.ok) throw new Error(data.detail || response.statusText);
+          return data;
+        })
+      )
+      .then((job) => {
+        notyf.open({ type: "info", message: "Retrying the background run." });
+        return waitForStepJob(headers, job.id);
+      })
+      .then((job) => settleStepJob(headers, job, onCompleted))
+      .catch((error) => {
+        console.error("Error:", error);
+        notyf.error(`Retry failed: ${escapeHtml(error.message)}`);
+      });
+  };
+
   const actionStage = (action, stage) => {
     if (isHumanFeedbackPending()) {
       notyf.error("You must first provide feedback to the planner.");
@@ -693,13 +905,14 @@
         }),
       })
         .then((response) => response.json())
-        .then((data) => {
-          action === "approved"
-            ? notyf.success(`Stage "${stageObj.action}" approved.`)
-            : notyf.error(`Stage "${stageObj.action}" rejected.`);
-
-          taskDetails();
-        })
+        .then((data) => waitForStepJob(headers, data.job_id))
+        .then((job) =>
+          settleStepJob(headers, job, () => {
+            action === "approved"
+              ? notyf.success(`Stage "${stageObj.action}" approved.`)
+              : notyf.error(`Stage "${stageObj.action}" rejected.`);
+          })
+        )
         .catch((error) => {
           console.error("Error:", error);
         });
@@ -733,12 +946,14 @@
         }),
       })
         .then((response) => response.json())
-        .then((data) => {
-          console.log("approveStages", data);
-          approve
-            ? notyf.success(`All stages approved.`)
-            : notyf.error(`All stages cancelled.`);
-          taskDetails();
+        .then((data) => waitForStepJob(headers, data.job_id))
+        .then((job) => {
+          console.log("approveStages", job);
+          settleStepJob(headers, job, () => {
+            approve
+              ? notyf.success(`All stages approved.`)
+              : notyf.error(`All stages cancelled.`);
+          });
         })
         .catch((error) => {
           console.error("Error:", error);
@@ -897,6 +1112,7 @@
   taskHeaderActions();
   taskDetailsActions();
   taskDetails();
+  if (taskStore) subscribeToTaskEvents(taskStore.id);
   taskMessage();
   handleTextAreaTyping();
 })();